@@ -1,6 +1,12 @@
 import os
 import sys
-import tempfile
+import functools
+import logging
+import bisect
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QTextEdit, QStatusBar, QLabel,
@@ -11,11 +17,16 @@ from PyQt6.QtGui import (
     QTextCursor, QTextTableFormat, QTextCharFormat, QTextBlockFormat,
     QTextLength, QTextTable, QBrush, QColor, QTextImageFormat,
     QPixmap, QTextFrameFormat, QPageSize, QTextTableCellFormat, QPageLayout,
-    QFontMetricsF
+    QPainter, QPalette, QFontMetrics, QAbstractTextDocumentLayout, QGuiApplication
+)
+from PyQt6.QtCore import (
+    Qt, QSizeF, QFileInfo, QRectF, QPointF, QUrl, QCoreApplication, QObject, QRunnable,
+    QThread, QThreadPool, QEventLoop, pyqtSignal
 )
-from PyQt6.QtCore import Qt, QSizeF, QFileInfo, QRectF
-from PyQt6.QtPrintSupport import QPrinter, QPrintDialog
 from PyQt6.QtCore import QMarginsF
+from PyQt6 import sip
+
+log = logging.getLogger(__name__)
 
 # ======= CONFIGURATION =======
 class InvoiceConfig:
@@ -42,6 +53,10 @@ class InvoiceConfig:
     SHOP_PHONE = "0324-4651561"
     SHOP_EMAIL = "TOOLTREKHARDWARE@GMAIL.COM"
     
+    # Prebuilt shop header lines, built once instead of per invoice
+    SHOP_LINE = f"SHOP: {SHOP_ADDRESS}"
+    CONTACT_LINE = f"PHONE: {SHOP_PHONE} | EMAIL: {SHOP_EMAIL}"
+    
     # FIXED FONT SIZES - Adjusted for better fitting
     LOGO_FONT_SIZE = 16
     SHOP_NAME_FONT_SIZE = 12  # Reduced from 14
@@ -73,6 +88,7 @@ class InvoiceConfig:
     TABLE_BORDER_WIDTH = 0.4
     TABLE_HEADER_BORDER_WIDTH = 0.8
     TABLE_ROW_BORDER_WIDTH = 0.2
+    TABLE_HEADERS = ("S.R#", "DESCRIPTION", "QTY", "PRICE", "TOTAL")
     BORDER_COLOR = QColor(0, 0, 0)
     
     # Colors
@@ -108,80 +124,232 @@ class InvoiceConfig:
             return QPageSize(QPageSize.PageSizeId.A5Landscape)
         else:
             return QPageSize(QPageSize.PageSizeId.A5)
+    
+    @classmethod
+    def get_page_geometry(cls):
+        """Get page size/usable area in points, computed once per config class"""
+        geometry = _page_geometry_cache.get(cls)
+        if geometry is None:
+            geometry = PageGeometry(cls)
+            _page_geometry_cache[cls] = geometry
+        return geometry
+    
+    @classmethod
+    def get_page_layout(cls):
+        """Get the printer QPageLayout (size, orientation, margins), built once"""
+        page_layout = _page_layout_cache.get(cls)
+        if page_layout is None:
+            if cls.ORIENTATION == 'landscape':
+                orientation = QPageLayout.Orientation.Landscape
+            else:
+                orientation = QPageLayout.Orientation.Portrait
+            page_layout = QPageLayout(cls.get_page_size(), orientation, cls.get_margins(),
+                                      QPageLayout.Unit.Millimeter)
+            _page_layout_cache[cls] = page_layout
+        return QPageLayout(page_layout)
+    
+    @classmethod
+    def get_terms_text(cls):
+        """Get the terms as one bulleted string, built once per terms list"""
+        terms = tuple(cls.TERMS_AND_CONDITIONS)
+        terms_text = _terms_text_cache.get(terms)
+        if terms_text is None:
+            terms_text = "".join(f"• {term}\n" for term in terms)
+            _terms_text_cache[terms] = terms_text
+        return terms_text
 
 
-class SimplePaginationCalculator:
-    """Calculates page breaks with continuous table support"""
+class PageGeometry:
+    """Page dimensions in points shared by the pagination calculator and builder"""
     
     def __init__(self, config):
-        self.config = config
         self.page_size = config.get_page_size()
         self.margins = config.get_margins()
         
         # Get page dimensions in points
-        page_size_points = self.page_size.size(QPageSize.Unit.Point)
-        self.page_width_pts = page_size_points.width()
-        self.page_height_pts = page_size_points.height()
+        self.page_size_pts = self.page_size.size(QPageSize.Unit.Point)
+        self.page_width_pts = self.page_size_pts.width()
+        self.page_height_pts = self.page_size_pts.height()
         
         # Calculate usable area (subtract margins) - MORE SPACE NOW
         self.usable_width_pts = self.page_width_pts - self.margins.left() - self.margins.right()
         self.usable_height_pts = self.page_height_pts - self.margins.top() - self.margins.bottom()
+
+
+_page_geometry_cache = {}
+_page_layout_cache = {}
+_terms_text_cache = {}
+
+
+# Thousands-separated amount without decimals, e.g. 15000 -> "15,000"
+AMOUNT_FORMAT = "{:,.0f}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_currency_cached(value, fmt):
+    """value rendered with fmt (AMOUNT_FORMAT, optionally symbol-prefixed), memoized
+    
+    Prices repeat across rows and bills, so most calls are cache hits.
+    The format string is part of the key, so different configs never collide.
+    """
+    if type(value) not in (int, float):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            value = 0
+    return fmt.format(value)
+
+
+# ======= LOGO RESOURCE =======
+LOGO_RESOURCE_URL = "logo://main"
+
+
+def _find_logo_path(logo_file):
+    """Find logo file in various locations"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    possible_paths = [
+        os.path.join(here, logo_file),
+        os.path.join(os.getcwd(), logo_file),
+        os.path.join(os.path.dirname(here), logo_file),
+        logo_file
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# Resolved once at import instead of stat-ing four paths per invoice
+InvoiceConfig.LOGO_PATH = _find_logo_path(InvoiceConfig.LOGO_FILE)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_logo_image(logo_path):
+    """Decode the logo PNG once and share the QImage across documents"""
+    image = QImage(logo_path)
+    return None if image.isNull() else image
+
+
+class SimplePaginationCalculator:
+    """Calculates page breaks with continuous table support"""
+    
+    # Heights that depend only on config (logo/shop, header, terms, sample row)
+    _static_heights = {}
+    # Heights that depend on bill metadata, bounded LRU keyed per section
+    _bill_heights = OrderedDict()
+    _bill_heights_lock = threading.Lock()  # Builders may run on worker threads
+    _BILL_HEIGHTS_MAX = 64
+    
+    def __init__(self, config):
+        self.config = config
+        geometry = config.get_page_geometry()
+        self.page_size = geometry.page_size
+        self.margins = geometry.margins
+        self.page_width_pts = geometry.page_width_pts
+        self.page_height_pts = geometry.page_height_pts
+        self.usable_width_pts = geometry.usable_width_pts
+        self.usable_height_pts = geometry.usable_height_pts
+        
+        self._measure_doc = None  # Reused across measure_section_heights calls
+        
+        log.debug("Page dimensions: %.1f x %.1f pts", self.page_width_pts, self.page_height_pts)
+        log.debug("Usable area: %.1f x %.1f pts", self.usable_width_pts, self.usable_height_pts)
+        log.debug("Margins: L=%.1f, R=%.1f, T=%.1f, B=%.1f",
+                  self.margins.left(), self.margins.right(), self.margins.top(), self.margins.bottom())
+    
+    def _get_measure_doc(self):
+        """Scratch document for measurements, created once per calculator
         
-        print(f"DEBUG: Page dimensions: {self.page_width_pts:.1f} x {self.page_height_pts:.1f} pts")
-        print(f"DEBUG: Usable area: {self.usable_width_pts:.1f} x {self.usable_height_pts:.1f} pts")
-        print(f"DEBUG: Margins: L={self.margins.left():.1f}, R={self.margins.right():.1f}, T={self.margins.top():.1f}, B={self.margins.bottom():.1f}")
+        Kept apart from the builder's document on purpose: laying out the
+        real document early makes every later insert trigger a relayout.
+        """
+        if self._measure_doc is None:
+            self._measure_doc = QTextDocument()
+            self._measure_doc.setUndoRedoEnabled(False)
+            
+            # Set same page size and text width as real document
+            geometry = self.config.get_page_geometry()
+            self._measure_doc.setPageSize(geometry.page_size_pts)
+            
+            # Set text width to match usable width
+            self._measure_doc.setTextWidth(geometry.usable_width_pts)
+        return self._measure_doc
+    
+    def dispose(self):
+        """Destroy the scratch document now, on the calling thread"""
+        if self._measure_doc is not None:
+            sip.delete(self._measure_doc)
+            self._measure_doc = None
     
     def measure_section_heights(self, builder, bill_data):
-        """Measure actual heights of fixed sections"""
+        """Measure actual heights of fixed sections (cached between invoices)"""
         measured_heights = {}
+        config_key = type(self.config)
         
-        # Create temporary document for measurement
-        temp_doc = QTextDocument()
+        customer = bill_data.get('customer', 'WALK-IN CUSTOMER')
+        bill_no = bill_data.get('bill_number', '00001')
+        bill_info_key = ('bill_info', config_key, customer, bill_no, len(bill_data.get('items', [])))
+        totals_key = ('totals', config_key, bill_data.get('subtotal', 0), bill_data.get('discount', 0),
+                      bill_data.get('return_amount', 0), bill_data.get('exchange_amount', 0),
+                      bill_data.get('DEFAULT_RETURN_FEE', 0), bill_data.get('grand_total'))
+        
+        def measure(add_section):
+            temp_doc = self._get_measure_doc()
+            temp_doc.clear()
+            cursor = QTextCursor(temp_doc)
+            # One layout pass per section, not one per insert
+            cursor.beginEditBlock()
+            add_section(cursor)
+            cursor.endEditBlock()
+            return temp_doc.documentLayout().documentSize().height()
+        
+        def static_height(name, add_section):
+            key = (config_key, name)
+            if key not in self._static_heights:
+                self._static_heights[key] = measure(add_section)
+            return self._static_heights[key]
+        
+        def bill_height(key, add_section):
+            cache = self._bill_heights
+            with self._bill_heights_lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            height = measure(add_section)
+            with self._bill_heights_lock:
+                cache[key] = height
+                if len(cache) > self._BILL_HEIGHTS_MAX:
+                    cache.popitem(last=False)
+            return height
+        
+        def add_logo_shop(cursor):
+            builder.add_logo(cursor=cursor)
+            builder.add_shop_info(cursor=cursor)
         
-        # Set same page size and text width as real document
-        page_size = self.page_size.size(QPageSize.Unit.Point)
-        temp_doc.setPageSize(page_size)
+        # 1. Measure logo + shop info
+        measured_heights['logo_shop'] = static_height('logo_shop', add_logo_shop)
         
-        # Set text width to match usable width
-        usable_width = self.page_width_pts - self.config.MARGIN_LEFT - self.config.MARGIN_RIGHT
-        temp_doc.setTextWidth(usable_width)
+        # Measure bill info
+        measured_heights['bill_info'] = bill_height(
+            bill_info_key, lambda cursor: builder.add_bill_info(bill_data, cursor=cursor))
         
-        # 1. Measure logo + shop info
-        temp_cursor = QTextCursor(temp_doc)
-        builder.add_logo(cursor=temp_cursor)
-        builder.add_shop_info(cursor=temp_cursor)
-        measured_heights['logo_shop'] = temp_doc.documentLayout().documentSize().height()
-        
-        # Reset and measure bill info
-        temp_doc.clear()
-        temp_cursor = QTextCursor(temp_doc)
-        builder.add_bill_info(bill_data, cursor=temp_cursor)
-        measured_heights['bill_info'] = temp_doc.documentLayout().documentSize().height()
-        
-        # Reset and measure table header
-        temp_doc.clear()
-        temp_cursor = QTextCursor(temp_doc)
+        # Measure table header
         # builder.add_table_header(cursor=temp_cursor)
-        measured_heights['table_header'] = temp_doc.documentLayout().documentSize().height()
-        
-        # Reset and measure totals
-        temp_doc.clear()
-        temp_cursor = QTextCursor(temp_doc)
-        builder.add_totals_section(bill_data, cursor=temp_cursor)
-        measured_heights['totals'] = temp_doc.documentLayout().documentSize().height()
-        
-        # Reset and measure terms
-        temp_doc.clear()
-        temp_cursor = QTextCursor(temp_doc)
-        builder.add_terms_and_conditions(cursor=temp_cursor)
-        measured_heights['terms'] = temp_doc.documentLayout().documentSize().height()
-        
-        # Reset and measure one item row for reference
-        temp_doc.clear()
-        temp_cursor = QTextCursor(temp_doc)
+        measured_heights['table_header'] = static_height('table_header', lambda cursor: None)
+        
+        # Measure totals
+        measured_heights['totals'] = bill_height(
+            totals_key, lambda cursor: builder.add_totals_section(bill_data, cursor=cursor))
+        
+        # Measure terms
+        measured_heights['terms'] = static_height(
+            'terms', lambda cursor: builder.add_terms_and_conditions(cursor=cursor))
+        
+        # Measure one item row for reference
         sample_item = {'description': 'Sample Item for Measurement', 'qty': 1, 'price': 100, 'total': 100}
-        builder.add_item_row(sample_item, 1, cursor=temp_cursor)
-        measured_heights['item_row'] = temp_doc.documentLayout().documentSize().height()
+        measured_heights['item_row'] = static_height(
+            'item_row', lambda cursor: builder.add_item_row(sample_item, 1, cursor=cursor))
         
         return measured_heights
     
@@ -211,26 +379,34 @@ class SimplePaginationCalculator:
             measured_heights['terms']
         )
         
-        print(f"DEBUG: First page space for items: {first_page_space:.1f} pts")
-        print(f"DEBUG: Middle page space: {middle_page_space:.1f} pts")
-        print(f"DEBUG: Last page space: {last_page_space:.1f} pts")
+        log.debug("First page space for items: %.1f pts", first_page_space)
+        log.debug("Middle page space: %.1f pts", middle_page_space)
+        log.debug("Last page space: %.1f pts", last_page_space)
+        
+        # Item heights are a pure function of the description, so estimate
+        # them once and keep prefix sums: cum_heights[k] = sum(heights[:k])
+        cum_heights = [0]
+        cum_heights.extend(itertools.accumulate(self.estimate_item_height(item) for item in items))
+        total_height = cum_heights[-1]
         
         # Simple algorithm: distribute items based on available space
-        remaining_items = items.copy()
+        # Index cursor over items - no copy, no O(n) pop(0) shifting
+        i = 0
+        n = len(items)
         page_number = 0
         
-        while remaining_items:
+        while i < n:
             if page_number == 0:
                 # First page
                 available_space = first_page_space
                 page_type = 'first'
-            elif len(remaining_items) == 1:
+            elif n - i == 1:
                 # Last item
                 available_space = last_page_space
                 page_type = 'last'
             else:
                 # Check if remaining items can fit on last page
-                remaining_height = sum(self.estimate_item_height(item) for item in remaining_items)
+                remaining_height = total_height - cum_heights[i]
                 
                 if remaining_height <= last_page_space:
                     available_space = last_page_space
@@ -239,21 +415,18 @@ class SimplePaginationCalculator:
                     available_space = middle_page_space
                     page_type = 'middle'
             
-            # Add items to this page
-            page_items = []
-            current_height = 0
-            
-            while remaining_items and current_height + self.estimate_item_height(remaining_items[0]) <= available_space:
-                item = remaining_items.pop(0)
-                page_items.append(item)
-                current_height += self.estimate_item_height(item)
+            # Add items to this page: the longest run whose height fits
+            end_idx = bisect.bisect_right(cum_heights, cum_heights[i] + available_space) - 1
+            end_idx = max(end_idx, i)
+            page_items = items[i:end_idx]  # One exact-size slice per page, no per-item appends
+            i = end_idx
             
             # If this is the only page, mark it as first_last
-            if page_number == 0 and not remaining_items:
+            if page_number == 0 and i == n:
                 page_type = 'first_last'
             
             # If this is the last page with remaining items
-            elif not remaining_items and page_type != 'first_last':
+            elif i == n and page_type != 'first_last':
                 page_type = 'last'
             
             pages.append({
@@ -263,15 +436,11 @@ class SimplePaginationCalculator:
             
             page_number += 1
         
-        # Debug output
-        for i, page in enumerate(pages):
-            print(f"Page {i+1}: type={page['page_type']}, items={len(page['items'])}")
-        
         return pages
     
     def estimate_item_height(self, item):
         """Estimate height of an item row"""
-        description = item.get('description', item.get('name', ''))
+        description = item['description'] if 'description' in item else item.get('name', '')
         
         if not description:
             return 25  # Minimum row height
@@ -289,44 +458,129 @@ class SimplePaginationCalculator:
 class ProfessionalInvoiceBuilder:
     """Builds invoice with clean pagination and continuous tables"""
     
+    ROW_CHUNK_SIZE = 32  # Rows appended at once when the item table runs out
+    
     def __init__(self, config=None):
         self.config = config or InvoiceConfig()
         self.doc = QTextDocument()
+        self.doc.setUndoRedoEnabled(False)  # Generated, never edited
         self.cursor = QTextCursor(self.doc)
         self.calculator = SimplePaginationCalculator(self.config)
         self.current_serial = 0  # Track serial number across pages
         self.item_table = None  # For continuous table
         self.item_table_row = 0  # Current row in continuous table
         
+        # Currency format strings, read from config once
+        self._amount_fmt = AMOUNT_FORMAT
+        self._currency_fmt = f"{self.config.CURRENCY_SYMBOL} {AMOUNT_FORMAT}"
+        
+        # Formats are immutable once built and Qt copies them on insert,
+        # so one instance per distinct setting is shared across cells
+        self._char_fmt_cache = {}
+        self._block_fmt_cache = {}
+        self._data_format = self._create_char_format(self.config.TABLE_DATA_FONT_SIZE)
+        self._align_center_fmt = self._create_block_format(Qt.AlignmentFlag.AlignCenter)
+        self._align_left_fmt = self._create_block_format(Qt.AlignmentFlag.AlignLeft)
+        self._align_right_fmt = self._create_block_format(Qt.AlignmentFlag.AlignRight)
+        # Block format per items column: S.R#, DESCRIPTION, QTY, PRICE, TOTAL
+        self._item_col_fmts = (
+            self._align_center_fmt, self._align_left_fmt,
+            self._align_right_fmt, self._align_right_fmt, self._align_right_fmt
+        )
+        
+        # Items table header formats (kerning off for S.R# and TOTAL)
+        self._header_fmt = self._create_char_format(self.config.TABLE_HEADER_FONT_SIZE, bold=True)
+        self._header_fmt_nokern = QTextCharFormat(self._header_fmt)
+        self._header_fmt_nokern.setFontKerning(False)
+        
+        # Bill info (NAME, BILL #, DATE) table format, identical for every invoice
+        self._bill_info_fmt = QTextTableFormat()
+        self._bill_info_fmt.setBorder(0)
+        self._bill_info_fmt.setCellSpacing(1)  # Reduced from 2
+        self._bill_info_fmt.setCellPadding(1)   # Reduced from 2
+        
+        # Optimized widths for more space
+        self._bill_info_fmt.setColumnWidthConstraints([
+            QTextLength(QTextLength.Type.PercentageLength, 12),  # Reduced from 15
+            QTextLength(QTextLength.Type.PercentageLength, 40),  # Increased from 35 (for customer name)
+            QTextLength(QTextLength.Type.PercentageLength, 22),  # Reduced from 25
+            QTextLength(QTextLength.Type.PercentageLength, 26),  # Increased from 25
+        ])
+        self._bill_label_fmt = self._create_char_format(self.config.BILL_INFO_LABEL_FONT_SIZE, bold=True)
+        self._bill_value_fmt = self._create_char_format(self.config.BILL_INFO_VALUE_FONT_SIZE)
+        
+        # Totals and terms section formats
+        self._totals_label_fmt = self._create_char_format(self.config.TOTALS_LABEL_FONT_SIZE, bold=True)
+        self._totals_value_fmt = self._create_char_format(self.config.TOTALS_VALUE_FONT_SIZE)
+        self._grand_total_fmt = self._create_char_format(self.config.GRAND_TOTAL_FONT_SIZE, bold=True)
+        self._terms_title_fmt = self._create_char_format(self.config.TERMS_TITLE_FONT_SIZE, bold=True)
+        self._terms_text_fmt = self._create_char_format(self.config.TERMS_TEXT_FONT_SIZE)
+        
         # Setup document
         self.setup_document()
     
+    def dispose(self):
+        """Destroy the builder's documents now, on the calling thread
+        
+        A document's layout runs timers owned by the thread that built it.
+        Left to Python's GC, a document built on a worker thread could be
+        freed on the GUI thread instead.
+        """
+        self.calculator.dispose()
+        self.cursor = None
+        self.item_table = None
+        sip.delete(self.doc)
+    
     def setup_document(self):
         """Setup document with proper page size and margins"""
-        page_size = self.config.get_page_size().size(QPageSize.Unit.Point)
-        self.doc.setPageSize(page_size)
+        geometry = self.config.get_page_geometry()
+        self.doc.setPageSize(geometry.page_size_pts)
         
         # Root frame: Set margins
         frame_format = QTextFrameFormat()
         frame_format.setMargin(0)
         self.doc.rootFrame().setFrameFormat(frame_format)
         
-        # Calculate usable width CORRECTLY
-        usable_width = (
-            page_size.width()
-            - self.config.MARGIN_LEFT
-            - self.config.MARGIN_RIGHT
-        )
+        # Usable width (page width minus left/right margins) is precomputed
+        usable_width = geometry.usable_width_pts
         
-        print(f"DEBUG: Page width: {page_size.width()} points")
-        print(f"DEBUG: Left margin: {self.config.MARGIN_LEFT}, Right margin: {self.config.MARGIN_RIGHT}")
-        print(f"DEBUG: Calculated usable width: {usable_width} points")
+        log.debug("Page width: %s points", geometry.page_width_pts)
+        log.debug("Left margin: %s, Right margin: %s", self.config.MARGIN_LEFT, self.config.MARGIN_RIGHT)
+        log.debug("Calculated usable width: %s points", usable_width)
         
         # Use 100% of usable width
         self.doc.setTextWidth(usable_width)
+        # textWidth() is fixed from here on; keep it instead of asking Qt per row
+        self._usable_width = self.doc.textWidth()
         
         # Verify text width was set
-        print(f"DEBUG: Actual document text width: {self.doc.textWidth()} points")
+        log.debug("Actual document text width: %s points", self._usable_width)
+        
+        # Items table column widths depend only on text width + config, so
+        # compute them once per document rather than per table
+        # Reduce width slightly to account for cell padding and borders
+        table_width = self._usable_width * 0.98  # Use 98% of usable width
+        self._col_constraints = self._column_constraints(table_width)
+        # Single-row tables (add_item_row) use 96%
+        self._row_col_constraints = self._column_constraints(self._usable_width * 0.96)
+        
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Table widths - Total usable: %.1f", table_width)
+            log.debug("Column widths: S.R#=%.1f, DESC=%.1f, QTY=%.1f, PRICE=%.1f, TOTAL=%.1f",
+                      *(length.rawValue() for length in self._col_constraints))
+    
+    def _column_constraints(self, table_width):
+        """Fixed QTextLength per items column for a table of table_width"""
+        return [
+            QTextLength(QTextLength.Type.FixedLength, table_width * (width / 100))
+            for width in (
+                self.config.COL_SNO_WIDTH,     # S.R#
+                self.config.COL_DESC_WIDTH,    # DESCRIPTION
+                self.config.COL_QTY_WIDTH,     # QTY
+                self.config.COL_PRICE_WIDTH,   # PRICE
+                self.config.COL_TOTAL_WIDTH,   # TOTAL
+            )
+        ]
     
     # Also update the add_horizontal_line method to use more width:
     def add_horizontal_line(self, cursor=None, thickness=1.0, margin_top=10, margin_bottom=10, line_width=None):
@@ -337,7 +591,7 @@ class ProfessionalInvoiceBuilder:
         # Calculate optimal line width based on usable width
         if line_width is None:
             # Use approximately 90% of usable width
-            line_width = int(self.doc.textWidth() * 0.9 / 4.5)
+            line_width = int(self._usable_width * 0.9 / 4.5)
         
         # Create a block format for spacing
         block_format = QTextBlockFormat()
@@ -348,13 +602,16 @@ class ProfessionalInvoiceBuilder:
         
         # Insert a simple line of characters
         cursor.insertText("_" * line_width)
-        
-        # Move cursor to end
-        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # cursor already at insertion point after insertText
     
     # ======= HELPER METHODS =======
     def _create_block_format(self, alignment, top_margin=0, bottom_margin=0, left_margin=0, right_margin=0):
-        """Helper to create block format"""
+        """Helper to create block format (shared per distinct setting)"""
+        key = (alignment, top_margin, bottom_margin, left_margin, right_margin)
+        block_format = self._block_fmt_cache.get(key)
+        if block_format is not None:
+            return block_format
+        
         block_format = QTextBlockFormat()
         block_format.setAlignment(alignment)
         block_format.setTopMargin(top_margin)
@@ -363,10 +620,16 @@ class ProfessionalInvoiceBuilder:
             block_format.setLeftMargin(left_margin)
         if right_margin > 0:
             block_format.setRightMargin(right_margin)
+        self._block_fmt_cache[key] = block_format
         return block_format
     
     def _create_char_format(self, font_size, bold=False, italic=False, color=None):
-        """Helper to create character format"""
+        """Helper to create character format (shared per distinct setting)"""
+        key = (font_size, bold, italic, color.rgba() if color else None)
+        char_format = self._char_fmt_cache.get(key)
+        if char_format is not None:
+            return char_format
+        
         char_format = QTextCharFormat()
         font = QFont("Arial", font_size)
         if bold:
@@ -376,62 +639,62 @@ class ProfessionalInvoiceBuilder:
         char_format.setFont(font)
         if color:
             char_format.setForeground(QBrush(color))
+        self._char_fmt_cache[key] = char_format
         return char_format
     
     def format_currency(self, value, include_symbol=True):
         """Format currency value without decimals"""
+        fmt = self._currency_fmt if include_symbol else self._amount_fmt
         try:
-            amount = float(value)
-            if include_symbol:
-                return f"{self.config.CURRENCY_SYMBOL} {amount:,.0f}"
-            else:
-                return f"{amount:,.0f}"
-        except (ValueError, TypeError):
-            if include_symbol:
-                return f"{self.config.CURRENCY_SYMBOL} 0"
-            else:
-                return "0"
+            return _format_currency_cached(value, fmt)
+        except TypeError:
+            # Unhashable value: cannot be cached (nor converted), shows as 0
+            return fmt.format(0)
 
     
     # ======= SECTION BUILDERS =======
     def find_logo(self):
-        """Find logo file in various locations"""
-        possible_paths = [
-            os.path.join(os.path.dirname(os.path.abspath(__file__)), self.config.LOGO_FILE),
-            os.path.join(os.getcwd(), self.config.LOGO_FILE),
-            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), self.config.LOGO_FILE),
-            self.config.LOGO_FILE
-        ]
+        """Return the logo path resolved at import time (None if not found)"""
+        return self.config.LOGO_PATH
+    
+    def _register_logo(self, doc):
+        """Register the decoded logo as an image resource on doc, return its URL"""
+        logo_path = self.find_logo()
+        if not logo_path:
+            return None
         
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        return None
+        url = QUrl(LOGO_RESOURCE_URL)
+        if doc.resource(QTextDocument.ResourceType.ImageResource.value, url) is None:
+            image = _load_logo_image(logo_path)
+            if image is None:
+                return None
+            doc.addResource(QTextDocument.ResourceType.ImageResource.value, url, image)
+        return LOGO_RESOURCE_URL
     
     def add_logo(self, cursor=None):
         """Add logo to the document"""
         if cursor is None:
             cursor = self.cursor
         
-        logo_path = self.find_logo()
-        
-        if logo_path and os.path.exists(logo_path):
-            try:
-                image_format = QTextImageFormat()
-                image_format.setWidth(self.config.LOGO_WIDTH)
-                image_format.setHeight(self.config.LOGO_HEIGHT)
-                image_format.setName(logo_path)
-                
-                block_format = self._create_block_format(
-                    Qt.AlignmentFlag.AlignCenter,
-                    top_margin=5,
-                    bottom_margin=10
-                )
-                cursor.insertBlock(block_format)
-                cursor.insertImage(image_format)
-            except Exception as e:
-                print(f"Warning: Could not load logo: {e}")
-                self.add_text_logo(cursor)
+        try:
+            logo_url = self._register_logo(cursor.document())
+        except Exception as e:
+            log.warning("Could not load logo: %s", e)
+            logo_url = None
+        
+        if logo_url:
+            image_format = QTextImageFormat()
+            image_format.setWidth(self.config.LOGO_WIDTH)
+            image_format.setHeight(self.config.LOGO_HEIGHT)
+            image_format.setName(logo_url)
+            
+            block_format = self._create_block_format(
+                Qt.AlignmentFlag.AlignCenter,
+                top_margin=5,
+                bottom_margin=10
+            )
+            cursor.insertBlock(block_format)
+            cursor.insertImage(image_format)
         else:
             self.add_text_logo(cursor)
     
@@ -464,7 +727,7 @@ class ProfessionalInvoiceBuilder:
             bottom_margin=5  # Reduced from 8
         )
         cursor.insertBlock(block_format)
-        cursor.insertText(f"SHOP: {self.config.SHOP_ADDRESS}", address_format)
+        cursor.insertText(self.config.SHOP_LINE, address_format)
         
         # Contact information - FIXED: Use non-breaking spaces and smaller font
         contact_format = self._create_char_format(self.config.CONTACT_FONT_SIZE)
@@ -477,8 +740,7 @@ class ProfessionalInvoiceBuilder:
         cursor.insertBlock(block_format)
         
         # Use non-breaking spaces between phone and email
-        contact_text = f"PHONE: {self.config.SHOP_PHONE} | EMAIL: {self.config.SHOP_EMAIL}"
-        cursor.insertText(contact_text, contact_format)
+        cursor.insertText(self.config.CONTACT_LINE, contact_format)
         
         # Add separator line after shop info
         self.add_horizontal_line(cursor, thickness=0.8, margin_top=5, margin_bottom=5, line_width=66)
@@ -492,24 +754,11 @@ class ProfessionalInvoiceBuilder:
         bill_no = bill_data.get('bill_number', '00001')
         date_str = bill_data.get('date', datetime.now().strftime(self.config.DATE_FORMAT))
         
-        # Create a table for bill info
-        table_format = QTextTableFormat()
-        table_format.setBorder(0)
-        table_format.setCellSpacing(1)  # Reduced from 2
-        table_format.setCellPadding(1)   # Reduced from 2
-        
-        # Optimized widths for more space
-        table_format.setColumnWidthConstraints([
-            QTextLength(QTextLength.Type.PercentageLength, 12),  # Reduced from 15
-            QTextLength(QTextLength.Type.PercentageLength, 40),  # Increased from 35 (for customer name)
-            QTextLength(QTextLength.Type.PercentageLength, 22),  # Reduced from 25
-            QTextLength(QTextLength.Type.PercentageLength, 26),  # Increased from 25
-        ])
+        # Table and char formats are prebuilt in __init__
+        label_format = self._bill_label_fmt
+        value_format = self._bill_value_fmt
         
-        label_format = self._create_char_format(self.config.BILL_INFO_LABEL_FONT_SIZE, bold=True)
-        value_format = self._create_char_format(self.config.BILL_INFO_VALUE_FONT_SIZE)
-        
-        table = cursor.insertTable(2, 4, table_format)
+        table = cursor.insertTable(2, 4, self._bill_info_fmt)
         
         # Row 1: NAME and BILL #
         cell = table.cellAt(0, 0).firstCursorPosition()
@@ -540,13 +789,18 @@ class ProfessionalInvoiceBuilder:
         cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
         cell.insertText(date_str, value_format)
         
+        # insertTable left the cursor in the first cell; continue after the table
         cursor.movePosition(QTextCursor.MoveOperation.End)
         
         # Add separator line between bill info and invoice table
         self.add_horizontal_line(cursor, thickness=0.6, margin_top=8, margin_bottom=8, line_width=79)  # Reduced margins
     
-    def start_items_table(self, cursor=None):
-        """Start a continuous table for items - FIXED to prevent header wrapping"""
+    def start_items_table(self, cursor=None, num_rows=0):
+        """Start a continuous table for items - FIXED to prevent header wrapping
+        
+        num_rows item rows are allocated up front (plus the header row) so
+        filling the table does not reflow it once per appended row.
+        """
         if cursor is None:
             cursor = self.cursor
         
@@ -559,41 +813,20 @@ class ProfessionalInvoiceBuilder:
         table_format.setBorderStyle(QTextFrameFormat.BorderStyle.BorderStyle_Solid)
         table_format.setBorderBrush(QBrush(self.config.BORDER_COLOR))
         
-        # FIXED: Calculate correct usable width with some buffer for alignment
-        # Reduce width slightly to account for cell padding and borders
-        usable_width = self.doc.textWidth() * 0.98  # Use 98% of usable width
-        
-        # Calculate absolute widths based on actual usable width
-        col1_width = usable_width * (self.config.COL_SNO_WIDTH / 100)  # S.R#
-        col2_width = usable_width * (self.config.COL_DESC_WIDTH / 100)  # DESCRIPTION
-        col3_width = usable_width * (self.config.COL_QTY_WIDTH / 100)  # QTY
-        col4_width = usable_width * (self.config.COL_PRICE_WIDTH / 100)  # PRICE
-        col5_width = usable_width * (self.config.COL_TOTAL_WIDTH / 100)  # TOTAL
-        
-        # Debug: Print actual widths
-        print(f"DEBUG: Table widths - Total usable: {usable_width:.1f}")
-        print(f"DEBUG: Column widths: S.R#={col1_width:.1f}, DESC={col2_width:.1f}, QTY={col3_width:.1f}, PRICE={col4_width:.1f}, TOTAL={col5_width:.1f}")
-        
-        # Set column widths as fixed widths
-        table_format.setColumnWidthConstraints([
-            QTextLength(QTextLength.Type.FixedLength, col1_width),
-            QTextLength(QTextLength.Type.FixedLength, col2_width),
-            QTextLength(QTextLength.Type.FixedLength, col3_width),
-            QTextLength(QTextLength.Type.FixedLength, col4_width),
-            QTextLength(QTextLength.Type.FixedLength, col5_width),
-        ])
+        # Column widths are precomputed in setup_document
+        table_format.setColumnWidthConstraints(self._col_constraints)
         
         # Set table alignment to left (this is key!)
         table_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
         
-        # Create table with 1 row for now (header)
-        self.item_table = cursor.insertTable(1, 5, table_format)
+        # Create table with header row plus all known item rows
+        self.item_table = cursor.insertTable(num_rows + 1, 5, table_format)
         self.item_table_row = 0
         
         # Add table header with NO WRAPPING
-        header_format = self._create_char_format(self.config.TABLE_HEADER_FONT_SIZE, bold=True)
+        header_format = self._header_fmt
         # Use non-breaking spaces in headers
-        headers = ["S.R#", "DESCRIPTION", "QTY", "PRICE", "TOTAL"]
+        headers = self.config.TABLE_HEADERS
         
         for col in range(5):
             cell = self.item_table.cellAt(0, col).firstCursorPosition()
@@ -601,18 +834,14 @@ class ProfessionalInvoiceBuilder:
             if col == 0:  # S.R#
                 # Use non-breaking space after S.R to prevent wrapping
                 cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignCenter))
-                cell_format = QTextCharFormat(header_format)
-                cell_format.setFontKerning(False)  # Disable kerning to prevent wrapping
-                cell.insertText(headers[col], cell_format)
+                cell.insertText(headers[col], self._header_fmt_nokern)  # Kerning off to prevent wrapping
             elif col == 1:  # DESCRIPTION
                 cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignLeft))
                 cell.insertText(headers[col], header_format)
             else:  # QTY, PRICE, TOTAL
                 cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
                 if col == 4:  # TOTAL - ensure it doesn't wrap
-                    cell_format = QTextCharFormat(header_format)
-                    cell_format.setFontKerning(False)
-                    cell.insertText(headers[col], cell_format)
+                    cell.insertText(headers[col], self._header_fmt_nokern)
                 else:
                     cell.insertText(headers[col], header_format)
             
@@ -622,6 +851,7 @@ class ProfessionalInvoiceBuilder:
             cell_format_table.setBottomBorderBrush(QBrush(self.config.BORDER_COLOR))
             self.item_table.cellAt(0, col).setFormat(cell_format_table)
         
+        # insertTable left the cursor in the first cell; continue after the table
         cursor.movePosition(QTextCursor.MoveOperation.End)
     
     def add_item_row_to_table(self, item, serial_number):
@@ -629,70 +859,47 @@ class ProfessionalInvoiceBuilder:
         if self.item_table is None:
             return
         
-        # Append a new row to the table
-        self.item_table.appendRows(1)
+        # Rows are preallocated by start_items_table; grow in chunks if we run out
         self.item_table_row += 1
         current_row = self.item_table_row  # 0-based, but header is row 0
+        if current_row >= self.item_table.rows():
+            self.item_table.appendRows(self.ROW_CHUNK_SIZE)
         
-        # Data format
-        data_format = self._create_char_format(self.config.TABLE_DATA_FONT_SIZE)
-        
-        # S.R#
-        cell = self.item_table.cellAt(current_row, 0).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignCenter))
-        cell.insertText(str(serial_number), data_format)
-        
-        # DESCRIPTION
-        description = item.get('description', item.get('name', ''))
-        cell = self.item_table.cellAt(current_row, 1).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignLeft))
-
-        # SMART width-based word wrapping
-        font = QFont("Arial", self.config.TABLE_DATA_FONT_SIZE)
-        metrics = QFontMetricsF(font)
-
-        # Actual description column width (same logic as header)
-        desc_col_width = self.doc.textWidth() * (self.config.COL_DESC_WIDTH / 100)
-
-        words = description.split()
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if metrics.horizontalAdvance(test_line) <= desc_col_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
-
-        for i, line in enumerate(lines):
-            if i > 0:
-                cell.insertText("\n")
-            cell.insertText(line, data_format)
-
-        
-        # QTY
+        self._fill_item_row(current_row, item, serial_number)
+    
+    def _fill_item_row(self, current_row, item, serial_number):
+        """Write one item into an already allocated row of the items table"""
         quantity = item.get('qty', 1)
-        cell = self.item_table.cellAt(current_row, 2).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
-        cell.insertText(str(quantity), data_format)
-        
-        # PRICE
         price = item.get('price', 0)
-        cell = self.item_table.cellAt(current_row, 3).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
-        cell.insertText(self.format_currency(price, include_symbol=False), data_format)
+        total = item['total'] if 'total' in item else quantity * price
+        format_currency = self.format_currency
+        
+        texts = (
+            str(serial_number),
+            # Qt wraps the description inside the fixed-width column; the
+            # document's default wrap mode also breaks words too long for it
+            " ".join((item['description'] if 'description' in item else item.get('name', '')).split()),
+            str(quantity),
+            format_currency(price, include_symbol=False),
+            format_currency(total, include_symbol=False),
+        )
         
-        # TOTAL
-        total = item.get('total', quantity * price)
-        cell = self.item_table.cellAt(current_row, 4).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
-        cell.insertText(self.format_currency(total, include_symbol=False), data_format)
+        # Every cell is a fresh block, so each needs its column's (prebuilt,
+        # shared) block format once; formats are built once per builder
+        data_format = self._data_format
+        cell_at = self.item_table.cellAt
+        for col, (block_format, text) in enumerate(zip(self._item_col_fmts, texts)):
+            cell = cell_at(current_row, col).firstCursorPosition()
+            cell.setBlockFormat(block_format)
+            cell.insertText(text, data_format)
+    
+    def trim_items_table(self):
+        """Drop any preallocated item rows that were never filled"""
+        if self.item_table is None:
+            return
+        unused = self.item_table.rows() - (self.item_table_row + 1)
+        if unused > 0:
+            self.item_table.removeRows(self.item_table_row + 1, unused)
     
     def add_item_row(self, item, serial_number, cursor=None):
         """Add a single item row (fallback method for measurement)"""
@@ -707,17 +914,8 @@ class ProfessionalInvoiceBuilder:
         table_format.setBorderStyle(QTextFrameFormat.BorderStyle.BorderStyle_Solid)
         table_format.setBorderBrush(QBrush(self.config.BORDER_COLOR))
         
-        # FIXED: Use actual usable width with some buffer
-        usable_width = self.doc.textWidth() * 0.96  # Use 98% of usable width
-        
-        # Set column widths (SAME AS HEADER)
-        table_format.setColumnWidthConstraints([
-            QTextLength(QTextLength.Type.FixedLength, usable_width * (self.config.COL_SNO_WIDTH / 100)),
-            QTextLength(QTextLength.Type.FixedLength, usable_width * (self.config.COL_DESC_WIDTH / 100)),
-            QTextLength(QTextLength.Type.FixedLength, usable_width * (self.config.COL_QTY_WIDTH / 100)),
-            QTextLength(QTextLength.Type.FixedLength, usable_width * (self.config.COL_PRICE_WIDTH / 100)),
-            QTextLength(QTextLength.Type.FixedLength, usable_width * (self.config.COL_TOTAL_WIDTH / 100)),
-        ])
+        # Set column widths (SAME AS HEADER), computed once in setup_document
+        table_format.setColumnWidthConstraints(self._row_col_constraints)
         
         # Set table alignment to left
         table_format.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -727,63 +925,40 @@ class ProfessionalInvoiceBuilder:
         table = cursor.insertTable(1, 5, table_format)
         
         # Data format
-        data_format = self._create_char_format(self.config.TABLE_DATA_FONT_SIZE)
+        data_format = self._data_format
         
         # S.R#
         cell = table.cellAt(0, 0).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignCenter))
+        cell.setBlockFormat(self._item_col_fmts[0])
         cell.insertText(str(serial_number), data_format)
         
         # DESCRIPTION
-        description = item.get('description', item.get('name', ''))
+        description = item['description'] if 'description' in item else item.get('name', '')
         cell = table.cellAt(0, 1).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignLeft))
+        cell.setBlockFormat(self._item_col_fmts[1])
         
-        # Handle long descriptions with word wrap
-        if len(description) > 50:
-            # Split long description
-            words = description.split()
-            lines = []
-            current_line = []
-            current_length = 0
-            
-            for word in words:
-                if current_length + len(word) + 1 <= 50:
-                    current_line.append(word)
-                    current_length += len(word) + 1
-                else:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                    current_length = len(word)
-            
-            if current_line:
-                lines.append(' '.join(current_line))
-            
-            for i, line in enumerate(lines):
-                if i > 0:
-                    cell.insertText("\n")
-                cell.insertText(line, data_format)
-        else:
-            cell.insertText(description, data_format)
+        # Long descriptions are wrapped by Qt inside the column
+        cell.insertText(" ".join(description.split()), data_format)
         
         # QTY
         quantity = item.get('qty', 1)
         cell = table.cellAt(0, 2).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
+        cell.setBlockFormat(self._item_col_fmts[2])
         cell.insertText(str(quantity), data_format)
         
         # PRICE
         price = item.get('price', 0)
         cell = table.cellAt(0, 3).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
+        cell.setBlockFormat(self._item_col_fmts[3])
         cell.insertText(self.format_currency(price, include_symbol=False), data_format)
         
         # TOTAL
-        total = item.get('total', quantity * price)
+        total = item['total'] if 'total' in item else quantity * price
         cell = table.cellAt(0, 4).firstCursorPosition()
-        cell.setBlockFormat(self._create_block_format(Qt.AlignmentFlag.AlignRight))
+        cell.setBlockFormat(self._item_col_fmts[4])
         cell.insertText(self.format_currency(total, include_symbol=False), data_format)
         
+        # insertTable left the cursor in the first cell; continue after the table
         cursor.movePosition(QTextCursor.MoveOperation.End)
     
     def add_item_rows_batch(self, items, cursor=None):
@@ -791,9 +966,21 @@ class ProfessionalInvoiceBuilder:
         if cursor is None:
             cursor = self.cursor
         
-        for item in items:
+        if self.item_table is None:
+            # No table yet: create it with room for the whole batch
+            self.start_items_table(cursor, num_rows=len(items))
+        else:
+            # Make room for the whole batch with a single appendRows
+            missing = self.item_table_row + len(items) + 1 - self.item_table.rows()
+            if missing > 0:
+                self.item_table.appendRows(missing)
+        
+        # Rows are known to exist, so fill them by index
+        first_row = self.item_table_row + 1
+        for row, item in enumerate(items, first_row):
             self.current_serial += 1
-            self.add_item_row_to_table(item, self.current_serial)
+            self._fill_item_row(row, item, self.current_serial)
+        self.item_table_row += len(items)
     
     def add_totals_section(self, bill_data, cursor=None):
         """Add totals section with dynamic support for return/exchange - ONLY ON LAST PAGE"""
@@ -807,7 +994,7 @@ class ProfessionalInvoiceBuilder:
         return_fee = bill_data.get('DEFAULT_RETURN_FEE', 0)         # From settings
         grand_total = bill_data.get('grand_total', subtotal)
 
-        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # Callers hand over a cursor already at the end of the document
         block_format = self._create_block_format(Qt.AlignmentFlag.AlignRight, top_margin=20)
         cursor.insertBlock(block_format)
 
@@ -852,10 +1039,10 @@ class ProfessionalInvoiceBuilder:
         table = cursor.insertTable(len(rows_to_display), 2, table_format)
 
         # Format definitions
-        label_format = self._create_char_format(self.config.TOTALS_LABEL_FONT_SIZE, bold=True)
-        value_format = self._create_char_format(self.config.TOTALS_VALUE_FONT_SIZE)
-        grand_format = self._create_char_format(self.config.GRAND_TOTAL_FONT_SIZE, bold=True)
-        return_format = self._create_char_format(self.config.TOTALS_VALUE_FONT_SIZE)
+        label_format = self._totals_label_fmt
+        value_format = self._totals_value_fmt
+        grand_format = self._grand_total_fmt
+        return_format = self._totals_value_fmt
 
         for row_index, (label, value, style, add_top_margin) in enumerate(rows_to_display):
             # Label Cell
@@ -884,6 +1071,7 @@ class ProfessionalInvoiceBuilder:
             else:  # 'value' style
                 cell.insertText(self.format_currency(value), value_format)
 
+        # insertTable left the cursor in the first cell; continue after the table
         cursor.movePosition(QTextCursor.MoveOperation.End)
         # Add separator line
         self.add_horizontal_line(cursor, line_width=79)
@@ -895,8 +1083,7 @@ class ProfessionalInvoiceBuilder:
         if cursor is None:
             cursor = self.cursor
 
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-
+        # Callers hand over a cursor already at the end of the document
         # Add spacing before terms
         block_format = self._create_block_format(
             Qt.AlignmentFlag.AlignLeft,
@@ -905,14 +1092,14 @@ class ProfessionalInvoiceBuilder:
         cursor.insertBlock(block_format)
 
         # Title
-        title_format = self._create_char_format(self.config.TERMS_TITLE_FONT_SIZE, bold=True)
+        title_format = self._terms_title_fmt
         cursor.insertText("TERMS & CONDITIONS\n", title_format)
 
         # Terms list
-        terms_format = self._create_char_format(self.config.TERMS_TEXT_FONT_SIZE)
+        terms_format = self._terms_text_fmt
 
-        # Start with the base terms from config
-        terms_to_display = self.config.TERMS_AND_CONDITIONS.copy()
+        # Base terms from config, joined into bullets once per config
+        terms_text = self.config.get_terms_text()
 
         # --- DYNAMICALLY ADD RETURN FEE NOTICE ---
         # Check if a return fee is set in this invoice's data
@@ -921,13 +1108,13 @@ class ProfessionalInvoiceBuilder:
             fee_amount = bill_data['return_fee']
             
             if fee_type == 'Per Page':
-                terms_to_display.append(f"RETURN FEE: A FEE OF Rs {fee_amount:,.0f} PER PAGE WILL BE CHARGED FOR RETURNS ON INVOICES EXCEEDING ONE PAGE.")
+                terms_text += f"• RETURN FEE: A FEE OF Rs {fee_amount:,.0f} PER PAGE WILL BE CHARGED FOR RETURNS ON INVOICES EXCEEDING ONE PAGE.\n"
             else:
-                terms_to_display.append(f"RETURN FEE: A FEE OF Rs {fee_amount:,.0f} WILL BE CHARGED FOR RETURNING THE ENTIRE INVOICE.")
+                terms_text += f"• RETURN FEE: A FEE OF Rs {fee_amount:,.0f} WILL BE CHARGED FOR RETURNING THE ENTIRE INVOICE.\n"
         # -----------------------------------------
 
-        for term in terms_to_display:
-            cursor.insertText(f"• {term}\n", terms_format)
+        # All bullets go in with a single insert rather than one per term
+        cursor.insertText(terms_text, terms_format)
 
         # Thank you message
         block_format = self._create_block_format(
@@ -968,7 +1155,7 @@ class ProfessionalInvoiceBuilder:
         # Extract items
         all_items = bill_data.get('items', [])
         
-        print(f"DEBUG: Total items: {len(all_items)}")
+        log.debug("Total items: %d", len(all_items))
         
         # Measure section heights
         measured_heights = self.calculator.measure_section_heights(self, bill_data)
@@ -976,18 +1163,34 @@ class ProfessionalInvoiceBuilder:
         # Calculate pages
         pages = self.calculator.calculate_pages(all_items, measured_heights)
         
-        print(f"DEBUG: Calculated {len(pages)} pages")
+        log.debug("Calculated %d pages", len(pages))
+        
+        # Render all pages inside one edit block with signals and undo off:
+        # Qt then lays the document out once at the end instead of after
+        # every insert (very expensive once the document has a layout)
+        signals_were_blocked = self.doc.blockSignals(True)
+        self.cursor.beginEditBlock()
+        try:
+            self._render_pages(bill_data, all_items, pages)
+        finally:
+            self.cursor.endEditBlock()
+            self.doc.blockSignals(signals_were_blocked)
+        
+        # Single layout pass for the finished document
+        self.doc.documentLayout().documentSize()
         
-        # Render each page
+        return self.doc
+    
+    def _render_pages(self, bill_data, all_items, pages):
+        """Insert the content of every calculated page into the document"""
         for page_index, page in enumerate(pages):
             page_type = page['page_type']
             page_items = page['items']
             
-            # Add page break (except for first page)
-            if page_index > 0:
-                self.cursor.insertText("\f")  # Form feed for page break
+            # No explicit page break: items are one continuous table (header
+            # row repeated by Qt) and the printer paginates it
             
-            print(f"DEBUG: Rendering page {page_index+1}, type={page_type}, items={len(page_items)}")
+            log.debug("Rendering page %d, type=%s, items=%d", page_index + 1, page_type, len(page_items))
             
             # ========== FIRST PAGE CONTENT ==========
             if page_type in ('first', 'first_last'):
@@ -995,25 +1198,241 @@ class ProfessionalInvoiceBuilder:
                 self.add_shop_info()
                 self.add_bill_info(bill_data)
                 # Start continuous table for items
-                self.start_items_table()  # TABLE HEADER ONLY ON FIRST PAGE
+                self.start_items_table(num_rows=len(all_items))  # TABLE HEADER ONLY ON FIRST PAGE
             
             # ========== ITEM ROWS ==========
             if page_items:
-                # For middle/last pages without header, just add items to existing table
-                if self.item_table is None and page_index > 0:
-                    # If we're on a middle page without a table, create one without header
-                    # But actually, items should continue in the same table across pages
-                    pass
+                # Middle/last pages continue the table started on the first page
                 self.add_item_rows_batch(page_items)
             
             # ========== LAST PAGE SECTIONS ==========
             if page_type in ('last', 'first_last'):
+                self.trim_items_table()
                 # Add separator line before totals
                 self.add_horizontal_line(self.cursor, thickness=0.8, margin_top=15, margin_bottom=10, line_width=76)
                 self.add_totals_section(bill_data)
                 self.add_terms_and_conditions(bill_data)
-        
-        return self.doc
+
+
+# ======= BATCH BUILDING =======
+def _build_invoice_doc(bill_data, config):
+    """Build one invoice document on a worker thread"""
+    built = ProfessionalInvoiceBuilder(config).build_document(bill_data)
+    # The built document is laid out with this thread's font engines, which
+    # go away with the thread; hand back a clone that has no layout yet
+    doc = built.clone()
+    # Hand the document back to the GUI thread, which does the printing
+    app = QCoreApplication.instance()
+    if app is not None:
+        doc.moveToThread(app.thread())
+    return doc
+
+
+def build_invoice_docs(bill_data_list, config=None, max_workers=None):
+    """Build invoice documents for several bills in parallel
+    
+    Each worker uses its own builder and QTextDocument (not parented to any
+    widget), so nothing mutable is shared between threads. Documents are
+    returned in the same order as bill_data_list; render them with
+    QPrinter from the GUI thread.
+    """
+    config = config or InvoiceConfig()
+    bill_data_list = list(bill_data_list)
+    if not bill_data_list:
+        return []
+    
+    for bill_data in bill_data_list:
+        if not bill_data or 'items' not in bill_data:
+            raise ValueError("Bill data must contain 'items' list")
+    
+    max_workers = max_workers or min(len(bill_data_list), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda bill_data: _build_invoice_doc(bill_data, config), bill_data_list))
+
+
+# ======= PDF WORKER =======
+def _make_printer(config, kind, mode=None):
+    """Create a QPrinter set up for config ('pdf' or 'device')
+    
+    mode is a QPrinter.PrinterMode; None means HighResolution.
+    """
+    # QtPrintSupport is only loaded once something is actually printed
+    from PyQt6.QtPrintSupport import QPrinter
+    printer = QPrinter(mode if mode is not None else QPrinter.PrinterMode.HighResolution)
+    printer.setPageLayout(config.get_page_layout())
+    if kind == 'pdf':
+        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
+        printer.setPageOrder(QPrinter.PageOrder.FirstPageFirst)
+    return printer
+
+
+def _default_pdf_filename(bill_data):
+    """Temp file path for an invoice PDF"""
+    import tempfile
+    temp_dir = tempfile.gettempdir()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    bill_no = bill_data.get('bill_number', '00001').replace('/', '_')
+    return os.path.join(temp_dir, f"TOOLTREK_Invoice_{bill_no}_{timestamp}.pdf")
+
+
+def _screen_dpi():
+    """Source DPI Qt lays documents out for (its qt_defaultDpi)
+    
+    Reads the primary QScreen, so call it on the GUI thread only;
+    InvoiceGenerator.source_dpi reads it once and hands it on.
+    """
+    app = QCoreApplication.instance()
+    if app is not None and app.testAttribute(Qt.ApplicationAttribute.AA_Use96Dpi):
+        return 96, 96
+    screen = QGuiApplication.primaryScreen() if isinstance(app, QGuiApplication) else None
+    if screen is None:
+        return 100, 100
+    return round(screen.logicalDotsPerInchX()), round(screen.logicalDotsPerInchY())
+
+
+def _draw_document_pages(doc, painter, printer, source_dpi):
+    """Paint doc page by page on an active painter, like QTextDocument.print
+    
+    Mirrors what print() does for a document without a fixed page height
+    (which is what the builder produces): lay a clone out on the printer
+    with 2cm margins and number the pages. The caller owns the painter, so
+    several documents can go into one print job; the caller also starts
+    the page before the first one. source_dpi is _screen_dpi(), read on
+    the GUI thread, so this can run on a worker thread.
+    """
+    doc = doc.clone()
+    try:
+        return _draw_cloned_pages(doc, painter, printer, source_dpi)
+    finally:
+        # Free the clone on this thread, which owns its layout timers
+        sip.delete(doc)
+
+
+def _draw_cloned_pages(doc, painter, printer, source_dpi):
+    """_draw_document_pages on a clone it may reformat"""
+    layout = doc.documentLayout()
+    layout.setPaintDevice(printer)
+    
+    # 2 cm margins in source DPI; the layout scales them to the device
+    source_dpi_x, source_dpi_y = source_dpi
+    horizontal_margin = int((2 / 2.54) * source_dpi_x)
+    vertical_margin = int((2 / 2.54) * source_dpi_y)
+    frame_format = doc.rootFrame().frameFormat()
+    frame_format.setLeftMargin(horizontal_margin)
+    frame_format.setRightMargin(horizontal_margin)
+    frame_format.setTopMargin(vertical_margin)
+    frame_format.setBottomMargin(vertical_margin)
+    doc.rootFrame().setFrameFormat(frame_format)
+    
+    # Page number position is in device coordinates
+    body = QRectF(0, 0, printer.width(), printer.height())
+    doc.setPageSize(body.size())
+    font = QFont(doc.defaultFont())
+    page_number_pos = QPointF(
+        body.width() - horizontal_margin * printer.logicalDpiX() / source_dpi_x,
+        body.height() - vertical_margin * printer.logicalDpiY() / source_dpi_y
+        + QFontMetrics(font, printer).ascent() + 5 * printer.logicalDpiY() / 72.0
+    )
+    
+    context = QAbstractTextDocumentLayout.PaintContext()
+    context.palette.setColor(QPalette.ColorRole.Text, QColor(Qt.GlobalColor.black))
+    
+    page_count = doc.pageCount()
+    for page_index in range(page_count):
+        if page_index > 0:
+            printer.newPage()
+        
+        painter.save()
+        painter.translate(body.left(), body.top() - page_index * body.height())
+        view = QRectF(0, page_index * body.height(), body.width(), body.height())
+        painter.setClipRect(view)
+        context.clip = view
+        layout.draw(painter, context)
+        
+        painter.setClipping(False)
+        painter.setFont(font)
+        page_string = str(page_index + 1)
+        painter.drawText(
+            round(page_number_pos.x() - painter.fontMetrics().horizontalAdvance(page_string)),
+            round(page_number_pos.y() + view.top()),
+            page_string
+        )
+        painter.restore()
+    
+    return page_count
+
+
+def _write_pdf(docs, printer, filename, source_dpi):
+    """Paint docs into filename on one painter, each starting on a new page
+    
+    Single invoices and batches both go through here, so they are
+    paginated and drawn by the same _draw_document_pages.
+    """
+    printer.setOutputFileName(filename)
+    painter = QPainter()
+    if not painter.begin(printer):
+        raise Exception("Could not open PDF file for writing")
+    try:
+        for index, doc in enumerate(docs):
+            if index > 0:
+                printer.newPage()
+            _draw_document_pages(doc, painter, printer, source_dpi)
+    finally:
+        painter.end()
+    
+    if not (os.path.exists(filename) and os.path.getsize(filename) > 0):
+        raise Exception("PDF file was not created or is empty")
+    return filename
+
+
+class PdfWorkerSignals(QObject):
+    """Signals of a PdfWorker (QRunnable cannot emit signals itself)"""
+    finished = pyqtSignal(str)  # PDF file name
+    error = pyqtSignal(str)
+
+
+class PdfWorker(QRunnable):
+    """Build an invoice and print it to PDF on a QThreadPool thread
+    
+    The QTextDocument is created inside run(), so it belongs to the worker
+    thread. So is the QPrinter, unless the caller lends its configured
+    one (and leaves it alone until the worker is done).
+    """
+    
+    def __init__(self, bill_data, filename, config, source_dpi, mode=None, printer=None):
+        super().__init__()
+        self.bill_data = bill_data
+        self.filename = filename
+        self.config = config
+        self.source_dpi = source_dpi  # Read on the GUI thread (see _screen_dpi)
+        self.mode = mode
+        self.printer = printer
+        self.signals = PdfWorkerSignals()
+    
+    def run(self):
+        error = None
+        try:
+            filename = self._write_pdf()
+        except Exception as e:
+            log.exception("Error generating PDF in worker")
+            error = str(e)
+        # Emitted last: the GUI thread may go on (or exit) as soon as it hears
+        if error is None:
+            self.signals.finished.emit(filename)
+        else:
+            self.signals.error.emit(error)
+    
+    def _write_pdf(self):
+        """Build and print the invoice; its documents and printer are gone on return"""
+        builder = ProfessionalInvoiceBuilder(self.config)
+        try:
+            doc = builder.build_document(self.bill_data)
+            printer = self.printer or _make_printer(self.config, 'pdf', self.mode)
+            return _write_pdf([doc], printer, self.filename, self.source_dpi)
+        finally:
+            # The documents belong to this thread; destroy them here rather
+            # than leave them to Python's GC on whichever thread runs it
+            builder.dispose()
 
 
 # ======= INVOICE GENERATOR =======
@@ -1022,6 +1441,36 @@ class InvoiceGenerator:
     
     def __init__(self, config=None):
         self.config = config or InvoiceConfig()
+        self._printers = {}  # Configured QPrinters, built on first use
+        self._printers_config = self.config
+        self._source_dpi = None  # _screen_dpi(), read once on the GUI thread
+    
+    def _get_printer(self, kind, mode=None):
+        """Return the cached 'pdf' or 'device' QPrinter for self.config and mode"""
+        if self._printers_config is not self.config:
+            # Config replaced since the printers were configured
+            self._printers = {}
+            self._printers_config = self.config
+        
+        printer = self._printers.get((kind, mode))
+        if printer is None:
+            printer = _make_printer(self.config, kind, mode)
+            self._printers[(kind, mode)] = printer
+        return printer
+    
+    def source_dpi(self):
+        """DPI documents are laid out for; first call must be on the GUI thread"""
+        if self._source_dpi is None:
+            self._source_dpi = _screen_dpi()
+        return self._source_dpi
+    
+    @property
+    def _pdf_printer(self):
+        return self._get_printer('pdf')
+    
+    @property
+    def _device_printer(self):
+        return self._get_printer('device')
     
     def generate_invoice_document(self, bill_data):
         """Generate QTextDocument for the invoice"""
@@ -1036,78 +1485,134 @@ class InvoiceGenerator:
             return builder.build_document(bill_data)
             
         except Exception as e:
-            print(f"Error generating invoice document: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error generating invoice document: %s", e)
             raise
     
-    def generate_invoice_pdf(self, bill_data, filename=None):
-        """Generate PDF file from invoice"""
+    @staticmethod
+    def document_key(bill_data):
+        """Key telling whether a built document still matches bill_data"""
+        return (bill_data.get('bill_number'), len(bill_data.get('items', [])), bill_data.get('grand_total'))
+    
+    def generate_invoice_pdf_async(self, bill_data, filename=None, mode=None,
+                                   on_finished=None, on_error=None, printer=None):
+        """Start PDF generation on the global QThreadPool
+        
+        on_finished(file_name) / on_error(message) are connected before the
+        worker starts, so a worker that ends at once cannot be missed.
+        printer is lent to the worker (see PdfWorker); by default it makes
+        its own. Returns the worker's PdfWorkerSignals.
+        """
+        if not bill_data:
+            raise ValueError("No bill data provided")
+        if 'items' not in bill_data:
+            raise ValueError("Bill data must contain 'items' list")
+        
+        worker = PdfWorker(bill_data, filename or _default_pdf_filename(bill_data),
+                           self.config, self.source_dpi(), mode, printer)
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+        if on_error is not None:
+            worker.signals.error.connect(on_error)
+        QThreadPool.globalInstance().start(worker)
+        return worker.signals
+    
+    def _generate_pdf_in_background(self, bill_data, filename, mode=None):
+        """Run a PdfWorker and wait for it in a local event loop
+        
+        The loop keeps painting but holds back keyboard and mouse input until
+        the PDF is done, so shortcuts and buttons (Save PDF, Print, Save
+        Sale...) cannot start another action while this call is waiting.
+        """
+        result = {}
+        loop = QEventLoop()
+        self.generate_invoice_pdf_async(
+            bill_data, filename, mode,
+            on_finished=lambda name: (result.update(filename=name), loop.quit()),
+            on_error=lambda message: (result.update(error=message), loop.quit()),
+            # This call waits for the worker, so it can lend the cached printer
+            printer=self._get_printer('pdf', mode)
+        )
+        loop.exec(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+        
+        if 'error' in result:
+            raise Exception(result['error'])
+        return result['filename']
+    
+    def generate_invoice_pdf(self, bill_data, filename=None, doc=None, mode=None):
+        """Generate PDF file from invoice (doc: already built document to reuse)
+        
+        Without a prebuilt doc, and when called from the GUI thread, the
+        invoice is built and printed by a PdfWorker while the event loop
+        keeps running, so windows stay responsive.
+        
+        mode is the QPrinter.PrinterMode (default HighResolution); pass
+        ScreenResolution for quick drafts where print quality does not matter.
+        """
         try:
             if not bill_data:
                 raise ValueError("No bill data provided")
             
-            doc = self.generate_invoice_document(bill_data)
-            
             # Generate filename if not provided
             if not filename:
-                temp_dir = tempfile.gettempdir()
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                bill_no = bill_data.get('bill_number', '00001').replace('/', '_')
-                filename = os.path.join(temp_dir, f"TOOLTREK_Invoice_{bill_no}_{timestamp}.pdf")
+                filename = _default_pdf_filename(bill_data)
             
-            # Setup printer for PDF
-            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-            printer.setPageSize(self.config.get_page_size())
+            app = QCoreApplication.instance()
+            if doc is None and app is not None and QThread.currentThread() is app.thread():
+                return self._generate_pdf_in_background(bill_data, filename, mode)
             
-            page_layout = printer.pageLayout()
-            if self.config.ORIENTATION == 'landscape':
-                page_layout.setOrientation(QPageLayout.Orientation.Landscape)
+            if doc is None:
+                doc = self.generate_invoice_document(bill_data)
             else:
-                page_layout.setOrientation(QPageLayout.Orientation.Portrait)
-            
-            printer.setPageLayout(page_layout)
-            printer.setPageMargins(self.config.get_margins())
-            printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-            printer.setOutputFileName(filename)
-            printer.setPageOrder(QPrinter.PageOrder.FirstPageFirst)
-            
-            # Print to PDF
-            doc.print(printer)
+                doc = self._printable(doc)
             
-            if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                return filename
-            else:
-                raise Exception("PDF file was not created or is empty")
+            # Printer for PDF is configured once, only the file changes
+            return _write_pdf([doc], self._get_printer('pdf', mode), filename, self.source_dpi())
                 
         except Exception as e:
-            print(f"Error generating PDF: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error generating PDF: %s", e)
             return None
     
-    def print_invoice(self, bill_data, parent=None):
-        """Print invoice directly to printer"""
+    def print_invoice(self, bill_data, parent=None, doc=None, mode=None):
+        """Print invoice directly to printer (doc: already built document to reuse)"""
         try:
             if not bill_data:
                 if parent:
                     QMessageBox.critical(parent, "Print Error", "No bill data to print")
                 return False
             
-            doc = self.generate_invoice_document(bill_data)
+            if doc is None:
+                doc = self.generate_invoice_document(bill_data)
             
-            printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-            printer.setPageSize(self.config.get_page_size())
+            return self.print_document(doc, parent, mode)
             
-            page_layout = printer.pageLayout()
-            if self.config.ORIENTATION == 'landscape':
-                page_layout.setOrientation(QPageLayout.Orientation.Landscape)
-            else:
-                page_layout.setOrientation(QPageLayout.Orientation.Portrait)
+        except Exception as e:
+            error_msg = f"Print error: {str(e)}"
+            log.exception(error_msg)
+            
+            if parent:
+                QMessageBox.critical(parent, "Print Error", error_msg)
             
-            printer.setPageLayout(page_layout)
-            printer.setPageMargins(self.config.get_margins())
+            return False
+    
+    def _printable(self, doc):
+        """Return doc laid out at the invoice text width
+        
+        A QTextBrowser showing the document (the preview) resizes it to the
+        widget, so such a document is cloned and put back to print width.
+        """
+        usable_width = self.config.get_page_geometry().usable_width_pts
+        if doc.textWidth() != usable_width:
+            doc = doc.clone()
+            doc.setTextWidth(usable_width)
+        return doc
+    
+    def print_document(self, doc, parent=None, mode=None):
+        """Print an already built invoice document via the print dialog"""
+        try:
+            doc = self._printable(doc)
+            printer = self._get_printer('device', mode)
             
+            from PyQt6.QtPrintSupport import QPrintDialog
             dialog = QPrintDialog(printer, parent)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 doc.print(printer)
@@ -1117,7 +1622,41 @@ class InvoiceGenerator:
             
         except Exception as e:
             error_msg = f"Print error: {str(e)}"
-            print(error_msg)
+            log.exception(error_msg)
+            
+            if parent:
+                QMessageBox.critical(parent, "Print Error", error_msg)
+            
+            return False
+    
+    def print_invoices(self, bill_data_list, parent=None):
+        """Print several invoices with one print dialog
+        
+        Documents are built in parallel by build_invoice_docs, then sent
+        to the printer one after another.
+        """
+        try:
+            if not bill_data_list:
+                if parent:
+                    QMessageBox.critical(parent, "Print Error", "No bill data to print")
+                return False
+            
+            docs = build_invoice_docs(bill_data_list, self.config)
+            
+            printer = self._device_printer
+            
+            from PyQt6.QtPrintSupport import QPrintDialog
+            dialog = QPrintDialog(printer, parent)
+            if dialog.exec() == QDialog.DialogCode.Accepted:
+                for doc in docs:
+                    doc.print(printer)
+                return True
+            
+            return False
+            
+        except Exception as e:
+            error_msg = f"Print error: {str(e)}"
+            log.exception(error_msg)
             
             if parent:
                 QMessageBox.critical(parent, "Print Error", error_msg)
@@ -1125,6 +1664,30 @@ class InvoiceGenerator:
             return False
 
 
+    def generate_invoice_pdf_batch(self, bill_data_list, filename=None):
+        """Write several invoices into a single PDF file
+        
+        Documents are built in parallel by build_invoice_docs, then painted
+        through one QPainter, so the PDF writer and its fonts are set up
+        once for the whole batch. Each invoice starts on a new page.
+        """
+        try:
+            bill_data_list = list(bill_data_list or [])
+            if not bill_data_list:
+                raise ValueError("No bill data provided")
+            
+            docs = build_invoice_docs(bill_data_list, self.config)
+            
+            if not filename:
+                filename = _default_pdf_filename(bill_data_list[0])
+            
+            return _write_pdf(docs, self._pdf_printer, filename, self.source_dpi())
+            
+        except Exception as e:
+            log.exception("Error generating batch PDF: %s", e)
+            return None
+
+
 # ======= COMPATIBILITY FUNCTIONS =======
 class InvoiceFactory:
     """Factory class for creating invoice generators"""
@@ -1142,16 +1705,23 @@ class InvoiceFactory:
 def prepare_bill_data_from_sale(sale_items, customer="", bill_number=""):
     """Prepare bill data from sale items"""
     items = []
+    subtotal = 0
     for item in sale_items:
+        name = item.get('display_name') or item.get('name') or ''
+        quantity = item.get('quantity', 1)
+        price = item.get('price', 0)
+        total = item['total_price'] if 'total_price' in item else price * quantity
+        subtotal += total
         items.append({
-            'name': item.get('display_name', '') or item.get('name', ''),
-            'description': item.get('display_name', '') or item.get('name', ''),
-            'qty': item.get('quantity', 1),
-            'price': item.get('price', 0),
-            'total': item.get('total_price', item.get('price', 0) * item.get('quantity', 1))
+            'name': name,
+            'description': name,
+            'qty': quantity,
+            'price': price,
+            'total': total
         })
     
-    subtotal = sum(it['total'] for it in items)
+    # One timestamp so date and time agree across midnight
+    now = datetime.now()
     
     return {
         'bill_number': bill_number or "00001",
@@ -1162,8 +1732,8 @@ def prepare_bill_data_from_sale(sale_items, customer="", bill_number=""):
         'discount_type': 'Amount',
         'tax_rate': 0,
         'grand_total': subtotal,
-        'date': datetime.now().strftime(InvoiceConfig.DATE_FORMAT),
-        'time': datetime.now().strftime("%I:%M %p")
+        'date': now.strftime(InvoiceConfig.DATE_FORMAT),
+        'time': now.strftime("%I:%M %p")
     }
 
 
@@ -1171,12 +1741,15 @@ def prepare_bill_data_from_sale(sale_items, customer="", bill_number=""):
 class InvoicePreviewDialog(QDialog):
     """Dialog for previewing invoices before printing"""
     
-    def __init__(self, bill_data, parent=None):
+    def __init__(self, bill_data, parent=None, generator=None):
         super().__init__(parent)
         self.setWindowTitle("Invoice Preview - F9 to Print | Esc to Close")
         self.setGeometry(100, 50, 620, 820)
         self.bill_data = bill_data
-        self.generator = InvoiceGenerator()
+        # The caller's generator, when given, keeps its configured printers
+        self.generator = generator or InvoiceGenerator()
+        self._doc = None  # Built once for preview, reused for printing
+        self._doc_key = None
         self.setup_ui()
         self.load_preview()
         self.setup_shortcuts()
@@ -1213,6 +1786,8 @@ class InvoicePreviewDialog(QDialog):
         """Load invoice preview"""
         try:
             doc = self.generator.generate_invoice_document(self.bill_data)
+            self._doc = doc
+            self._doc_key = InvoiceGenerator.document_key(self.bill_data)
             self.preview.setDocument(doc)
             
             # Update status info
@@ -1223,7 +1798,7 @@ class InvoicePreviewDialog(QDialog):
         except Exception as e:
             error_msg = f"Error loading preview: {str(e)}"
             self.preview.setPlainText(error_msg)
-            print(error_msg)
+            log.exception(error_msg)
     
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
@@ -1248,7 +1823,11 @@ class InvoicePreviewDialog(QDialog):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                success = self.generator.print_invoice(self.bill_data, self)
+                # Reuse the previewed document unless the bill changed since
+                doc = None
+                if self._doc is not None and self._doc_key == InvoiceGenerator.document_key(self.bill_data):
+                    doc = self._doc
+                success = self.generator.print_invoice(self.bill_data, self, doc=doc)
                 
                 if success:
                     QMessageBox.information(
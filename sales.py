@@ -1,23 +1,35 @@
 # sales.py
 import sys
 import os
+import atexit
+import functools
 import sqlite3
 import json
+import time
+import logging
+import multiprocessing
+import operator
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QComboBox, QPushButton, QTableWidget, QTableWidgetItem,
+    QLineEdit, QComboBox, QPushButton, QTableView,
     QDialog, QFormLayout, QDialogButtonBox, QLabel, QMessageBox,
     QStatusBar, QSpinBox, QDoubleSpinBox, QToolBar, QMenu, QMenuBar,
     QFileDialog, QGroupBox, QGridLayout, QFrame, QHeaderView, QInputDialog,
-    QListWidget, QListWidgetItem, QAbstractItemView,
+    QListWidget, QListWidgetItem, QAbstractItemView, QStyledItemDelegate, QAbstractItemDelegate,
     QCheckBox, QTextEdit
 )
 from PyQt6.QtGui import (
     QColor, QAction, QIcon, QKeySequence, QFont, QPalette, 
     QBrush, QPainter, QPageSize, QShortcut, QTextDocument, QPixmap
 )
-from PyQt6.QtCore import Qt, QTimer, QDate, pyqtSignal, QSettings, QTextStream, QByteArray, QSizeF
+from PyQt6.QtCore import Qt, QEvent, QTimer, QDate, pyqtSignal, pyqtSlot, QSettings, QTextStream, QByteArray, QSizeF
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool
 from PyQt6.QtPrintSupport import QPrintDialog, QPrinter, QPrintPreviewDialog
 from PyQt6.QtGui import QPageLayout
 from PyQt6.QtCore import QMarginsF
@@ -25,6 +37,9 @@ from PyQt6.QtGui import QPageLayout
 # from invoice_printer import InvoiceGenerator, prepare_bill_data_from_sale, InvoiceFactory
 from invoice_printer import InvoiceGenerator, prepare_bill_data_from_sale, InvoiceFactory
 import traceback
+
+log = logging.getLogger(__name__)
+
 # ========== IMPORT PRINT.PY MODULE ==========
 try:
     # Try to import the invoice printer module
@@ -59,6 +74,23 @@ except ImportError as e:
     })
     PRINT_MODULE_AVAILABLE = False
 
+# ========== SETTINGS JSON ==========
+# orjson (optional) parses and writes the settings file in C; the json
+# fallback has the same bytes-in/bytes-out interface and writes the same
+# layout (2-space indent, UTF-8), so the file does not depend on which is installed
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    _loads = json.loads
+
 
 # Global exception handler
 def handle_exception(exc_type, exc_value, exc_traceback):
@@ -81,9 +113,97 @@ def handle_exception(exc_type, exc_value, exc_traceback):
 sys.excepthook = handle_exception
 
 # ========== ENHANCED INTEGRATED PRINTING SYSTEM ==========
+def _requires_items_and_module(action, error_title, error_text, failed):
+    """Shared checks for the invoice actions of EnhancedIntegratedPrintingSystem
+    
+    The wrapped function is called as fn(sale_window, bill_data, ...) only when
+    the print module is loaded and the sale has items; otherwise, or if it
+    raises, the user is told and `failed` is returned. Returns a staticmethod.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(sale_window, *args, **kwargs):
+            if not PRINT_MODULE_AVAILABLE:
+                QMessageBox.critical(sale_window, "Module Error", 
+                                   "Print module not available. Make sure print.py is in the same directory.")
+                return failed
+            
+            if not sale_window.sale_items:
+                QMessageBox.warning(sale_window, "No Items", f"No items to {action}!")
+                return failed
+            
+            try:
+                bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
+                if not bill_data:
+                    return failed
+                return fn(sale_window, bill_data, *args, **kwargs)
+            except Exception as e:
+                QMessageBox.critical(sale_window, error_title, f"{error_text}: {str(e)}")
+                return failed
+        return staticmethod(wrapper)
+    return decorator
+
+def _exclusive_invoice_action(method):
+    """Ignore an EnhancedSalesWindow invoice action while another one runs
+    
+    PDF export waits for its worker in a local event loop, so without this a
+    shortcut could start a second save/print before the first returns.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.invoice_action_running:
+            self.status_label.setText("Please wait for the current invoice action to finish")
+            return None
+        self.invoice_action_running = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.invoice_action_running = False
+    return wrapper
+
+# GUI application of a save_pdf_batch worker process; set by
+# _init_pdf_worker there, never in the main process
+_pdf_worker_app = None
+
+def _init_pdf_worker():
+    """Pool initializer: the application fonts and printing need in a worker"""
+    global _pdf_worker_app
+    _pdf_worker_app = QApplication([])
+
+def _generate_one_pdf(bill_data, out_dir):
+    """Render one invoice PDF into out_dir (in a save_pdf_batch worker, or in-process)"""
+    # One generator per process, so its PDF printer is configured once
+    generator = EnhancedIntegratedPrintingSystem.generator()
+    filename = os.path.join(out_dir, f"invoice_{bill_data['bill_number']}.pdf")
+    # Build the document first: without doc= a GUI-thread caller would have
+    # it rendered by a PdfWorker behind a nested event loop
+    doc = generator.generate_invoice_document(bill_data)
+    return generator.generate_invoice_pdf(bill_data, filename, doc=doc)
+
 class EnhancedIntegratedPrintingSystem:
     """Class to integrate professional printing with sales system"""
     
+    # Folder for auto-named PDFs, created on first save
+    _invoice_dir = None
+    # Shared InvoiceGenerator, created on first use (keeps its QPrinters)
+    _generator = None
+    
+    @staticmethod
+    def invoice_dir():
+        """Return the invoices folder, creating it the first time"""
+        if EnhancedIntegratedPrintingSystem._invoice_dir is None:
+            temp_dir = os.path.join(os.getcwd(), "invoices")
+            os.makedirs(temp_dir, exist_ok=True)
+            EnhancedIntegratedPrintingSystem._invoice_dir = temp_dir
+        return EnhancedIntegratedPrintingSystem._invoice_dir
+    
+    @staticmethod
+    def generator():
+        """Return the shared InvoiceGenerator, creating it the first time"""
+        if EnhancedIntegratedPrintingSystem._generator is None:
+            EnhancedIntegratedPrintingSystem._generator = invoice_printer.InvoiceGenerator()
+        return EnhancedIntegratedPrintingSystem._generator
+    
 # In sales.py, in the EnhancedIntegratedPrintingSystem class:
 
     @staticmethod
@@ -92,8 +212,14 @@ class EnhancedIntegratedPrintingSystem:
         if not sale_window.sale_items:
             return None
         
+        # Invoice rows: the four fields of each SaleItem fetched in one call
+        items = [
+            {'description': description, 'qty': qty, 'price': price, 'total': total}
+            for description, qty, price, total in map(_bill_row_fields, sale_window.sale_items)
+        ]
+        subtotal = sum(item['total'] for item in items)
+        
         # Calculate totals
-        subtotal = sum(item['total_price'] for item in sale_window.sale_items)
         discount = sale_window.discount_input.value()
         discount_type = sale_window.discount_type.currentText()
         tax_rate = sale_window.tax_spinbox.value()
@@ -109,15 +235,6 @@ class EnhancedIntegratedPrintingSystem:
         # Get current datetime
         now = datetime.now()
         
-        items = []
-        for item in sale_window.sale_items:
-            items.append({
-                'description': item['display_name'],
-                'qty': item['quantity'],
-                'price': item['price'],
-                'total': item['total_price']
-            })
-        
         # ========== FIX: GET RETURN FEE FROM UI ==========
         # Get return fee from UI
         return_fee_amount = sale_window.return_fee_input.value()
@@ -149,186 +266,132 @@ class EnhancedIntegratedPrintingSystem:
             # =======================================
         }
     
-    @staticmethod
-    def print_invoice(sale_window):
-        """Print invoice using professional generator"""
-        if not PRINT_MODULE_AVAILABLE:
-            QMessageBox.critical(sale_window, "Module Error", 
-                               "Print module not available. Make sure print.py is in the same directory.")
-            return False
-        
-        if not sale_window.sale_items:
-            QMessageBox.warning(sale_window, "No Items", "No items to print!")
-            return False
-        
-        try:
-            # Prepare bill data
-            bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
-            
-            if not bill_data:
-                return False
-            
-            # Create professional invoice generator
-            generator = ProfessionalInvoiceGenerator()
-            
-            # Print directly
-            success = generator.print_invoice(bill_data, sale_window)
-            
-            if success:
-                sale_window.status_label.setText(f"Invoice #{bill_data['bill_number']} printed successfully!")
-                return True
-            else:
-                sale_window.status_label.setText("Printing cancelled")
-                return False
-                
-        except Exception as e:
-            QMessageBox.critical(sale_window, "Print Error", f"Could not print invoice: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
-    @staticmethod
-    def preview_invoice(sale_window):
-        """Preview invoice using professional generator"""
-        if not PRINT_MODULE_AVAILABLE:
-            QMessageBox.critical(sale_window, "Module Error", 
-                               "Print module not available. Make sure print.py is in the same directory.")
-            return False
-        
-        if not sale_window.sale_items:
-            QMessageBox.warning(sale_window, "No Items", "No items to preview!")
-            return False
+    @_requires_items_and_module("print", "Print Error", "Could not print invoice", failed=False)
+    def print_invoice(sale_window, bill_data):
+        """Print invoice using print.py library"""
+        # Print directly using print_invoice method
+        success = EnhancedIntegratedPrintingSystem.generator().print_invoice(bill_data, sale_window)
         
-        try:
-            # Prepare bill data
-            bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
-            
-            if not bill_data:
-                return False
-            
-            # Use ProfessionalInvoicePreviewDialog
-            dialog = ProfessionalInvoicePreviewDialog(bill_data, sale_window)
-            dialog.exec()
+        if success:
+            sale_window.status_label.setText(f"Invoice #{bill_data['bill_number']} printed successfully!")
             return True
-                
-        except Exception as e:
-            QMessageBox.critical(sale_window, "Preview Error", f"Could not preview invoice: {str(e)}")
+        else:
+            sale_window.status_label.setText("Printing cancelled")
             return False
     
-    @staticmethod
-    def print_invoice(sale_window):
-        """Print invoice using print.py library"""
-        if not PRINT_MODULE_AVAILABLE:
-            QMessageBox.critical(sale_window, "Module Error", 
-                               "Print module not available. Make sure print.py is in the same directory.")
-            return False
+    @_requires_items_and_module("preview", "Preview Error", "Could not preview invoice", failed=False)
+    def preview_invoice(sale_window, bill_data):
+        """Preview invoice using print.py library"""
+        # Use InvoicePreviewDialog from print.py
+        dialog = invoice_printer.InvoicePreviewDialog(
+            bill_data, sale_window, EnhancedIntegratedPrintingSystem.generator())
+        dialog.exec()
+        return True
+    
+    @_requires_items_and_module("save", "PDF Error", "Could not save PDF", failed=None)
+    def save_pdf_invoice(sale_window, bill_data, file_path=None):
+        """Save invoice as PDF using print.py library"""
+        generator = EnhancedIntegratedPrintingSystem.generator()
         
-        if not sale_window.sale_items:
-            QMessageBox.warning(sale_window, "No Items", "No items to print!")
-            return False
+        # Generate PDF
+        if file_path:
+            pdf_path = file_path
+        else:
+            # Generate default filename (nanosecond stamp: unique per save)
+            pdf_path = os.path.join(EnhancedIntegratedPrintingSystem.invoice_dir(),
+                                    f"invoice_{bill_data['bill_number']}_{time.time_ns()}.pdf")
         
-        try:
-            # Prepare bill data
-            bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
-            
-            if not bill_data:
-                return False
-            
-            # Create invoice generator using print.py
-            generator = invoice_printer.InvoiceGenerator()
-            
-            # Print directly using print_invoice method
-            success = generator.print_invoice(bill_data, sale_window)
-            
-            if success:
-                sale_window.status_label.setText(f"Invoice #{bill_data['bill_number']} printed successfully!")
-                return True
-            else:
-                sale_window.status_label.setText("Printing cancelled")
-                return False
-                
-        except Exception as e:
-            QMessageBox.critical(sale_window, "Print Error", f"Could not print invoice: {str(e)}")
-            return False
-    
+        pdf_path = generator.generate_invoice_pdf(bill_data, pdf_path)
+        
+        if pdf_path and os.path.exists(pdf_path):
+            sale_window.status_label.setText(f"PDF saved: {os.path.basename(pdf_path)}")
+            return pdf_path
+        else:
+            sale_window.status_label.setText("PDF generation failed")
+            return None
+
     @staticmethod
-    def preview_invoice(sale_window):
-        """Preview invoice using print.py library"""
-        if not PRINT_MODULE_AVAILABLE:
-            QMessageBox.critical(sale_window, "Module Error", 
-                               "Print module not available. Make sure print.py is in the same directory.")
-            return False
+    def save_pdf_batch(bill_data_list, out_dir=None):
+        """Save one PDF per invoice, rendering them in parallel processes
         
-        if not sale_window.sale_items:
-            QMessageBox.warning(sale_window, "No Items", "No items to preview!")
-            return False
+        bill_data_list holds prepared bill_data dicts (no database access in
+        the workers). Invoices a worker could not write are retried here,
+        one by one. Returns the list of PDF paths, None for failures.
+        """
+        if not PRINT_MODULE_AVAILABLE or not bill_data_list:
+            return []
         
-        try:
-            # Prepare bill data
-            bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
-            
-            if not bill_data:
-                return False
-            
-            # Use InvoicePreviewDialog from print.py
-            dialog = invoice_printer.InvoicePreviewDialog(bill_data, sale_window)
-            dialog.exec()
-            return True
-                
-        except Exception as e:
-            QMessageBox.critical(sale_window, "Preview Error", f"Could not preview invoice: {str(e)}")
-            return False
-    
-    @staticmethod
-    def save_pdf_invoice(sale_window, file_path=None):
-        """Save invoice as PDF using print.py library"""
-        if not PRINT_MODULE_AVAILABLE:
-            QMessageBox.critical(sale_window, "Module Error", 
-                               "Print module not available. Make sure print.py is in the same directory.")
-            return None
+        out_dir = out_dir or EnhancedIntegratedPrintingSystem.invoice_dir()
+        os.makedirs(out_dir, exist_ok=True)
         
-        if not sale_window.sale_items:
-            QMessageBox.warning(sale_window, "No Items", "No items to save!")
-            return None
+        paths = [None] * len(bill_data_list)
+        workers = min(os.cpu_count() or 1, len(bill_data_list))
+        if workers > 1:
+            try:
+                # spawn: forking a process that runs Qt is not safe
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_pdf_worker) as executor:
+                    futures = [executor.submit(_generate_one_pdf, bill_data, out_dir)
+                               for bill_data in bill_data_list]
+                    for index, future in enumerate(futures):
+                        try:
+                            paths[index] = future.result()
+                        except Exception as e:
+                            log.warning("PDF export of bill %s failed in a worker: %s",
+                                        bill_data_list[index]['bill_number'], e)
+            except Exception as e:
+                log.warning("Parallel PDF export failed, exporting one by one: %s", e)
         
-        try:
-            # Prepare bill data
-            bill_data = EnhancedIntegratedPrintingSystem.prepare_bill_data(sale_window)
-            
-            if not bill_data:
-                return None
-            
-            # Create invoice generator
-            generator = invoice_printer.InvoiceGenerator()
-            
-            # Generate PDF
-            if file_path:
-                pdf_path = file_path
-            else:
-                # Generate default filename
-                temp_dir = os.path.join(os.getcwd(), "invoices")
-                os.makedirs(temp_dir, exist_ok=True)
-                pdf_path = os.path.join(temp_dir, f"invoice_{bill_data['bill_number']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-            
-            pdf_path = generator.generate_invoice_pdf(bill_data, pdf_path)
-            
-            if pdf_path and os.path.exists(pdf_path):
-                sale_window.status_label.setText(f"PDF saved: {os.path.basename(pdf_path)}")
-                return pdf_path
-            else:
-                sale_window.status_label.setText("PDF generation failed")
-                return None
-                
-        except Exception as e:
-            QMessageBox.critical(sale_window, "PDF Error", f"Could not save PDF: {str(e)}")
-            return None
+        for index, bill_data in enumerate(bill_data_list):
+            if paths[index] is None:
+                try:
+                    paths[index] = _generate_one_pdf(bill_data, out_dir)
+                except Exception as e:
+                    log.warning("PDF export of bill %s failed: %s", bill_data['bill_number'], e)
+        return paths
 
 # ========== ENHANCED DATABASE MANAGER ==========
 class EnhancedDatabaseManager:
+    SETTINGS_FLUSH_DELAY_MS = 2000
+    
     def __init__(self):
         self.connections = {}
+        # db_name -> RLock held while using that connection. The item
+        # connections are shared with the catalog loader threads.
+        self.connection_locks = {}
+        # Lookup queries that fit each database's schema, detected on first use
+        self._item_query_cache = {}
+        # Single-statement lookup over the attached databases (see attach_lookup_databases)
+        self._unified_lookup_sql = None
+        self._unified_lookup_params = 0
+        self._unified_lookup_sources = ()
+        # Normalized item_id -> item dict, least recently used first
+        self._item_cache = OrderedDict()
+        # Search catalog built by get_all_items, and (database, ITEM_ID) -> its entry.
+        # catalog_lock guards these; catalog_loader is the background load in flight.
+        self.catalog_lock = threading.RLock()
+        self.catalog_loader = None
+        self._items_cache = None
+        self._items_by_key = {}
+        self._items_fts = None
+        self._items_versions = None
+        self._items_dirty = True
+        # Whether sales.grand_total is a generated column (set on connect)
+        self._grand_total_generated = False
         self.config_file = 'sales_config.json'
         self.settings = self.load_settings()
+        
+        # Settings writes are coalesced: save_settings marks them dirty and
+        # flush_settings writes the file shortly after (and on close/exit)
+        self._settings_dirty = False
+        self._save_timer = None
+        if QApplication.instance() is not None:
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.setInterval(self.SETTINGS_FLUSH_DELAY_MS)
+            self._save_timer.timeout.connect(self.flush_settings)
+        atexit.register(self.flush_settings)
         self.connect_databases()
     
     def load_settings(self):
@@ -350,8 +413,8 @@ class EnhancedDatabaseManager:
         
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    settings = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    settings = _loads(f.read())
                     # Merge with defaults
                     for key, value in default_settings.items():
                         if key not in settings:
@@ -364,10 +427,26 @@ class EnhancedDatabaseManager:
             return default_settings.copy()
     
     def save_settings(self):
-        """Save settings to file"""
+        """Schedule the settings to be written to file"""
+        self._settings_dirty = True
+        if self._save_timer is None:
+            # No event loop to run the timer: write through
+            return self.flush_settings()
+        self._save_timer.start()
+        return True
+    
+    def flush_settings(self):
+        """Write pending settings to file (temp file + rename, so never half-written)"""
+        if not self._settings_dirty:
+            return True
+        if self._save_timer is not None:
+            self._save_timer.stop()
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            temp_file = f"{self.config_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(_dumps(self.settings))
+            os.replace(temp_file, self.config_file)
+            self._settings_dirty = False
             return True
         except Exception as e:
             print(f"Error saving settings: {e}")
@@ -384,7 +463,10 @@ class EnhancedDatabaseManager:
         next_num = current + 1
         self.settings['next_bill_number'] = next_num
         self.settings['last_bill_number'] = current
-        self.save_settings()
+        # Written through, not coalesced: sales.bill_number is UNIQUE, so a
+        # counter lost in a crash would make every following save fail
+        self._settings_dirty = True
+        self.flush_settings()
         return current
     
     def format_bill_number(self, number):
@@ -396,6 +478,71 @@ class EnhancedDatabaseManager:
         formatted = f"{number:05d}"
         return f"{prefix}{formatted}{suffix}"
     
+    # Applied to every connection: WAL lets readers and the writer run side
+    # by side, and with synchronous=NORMAL a commit needs one fsync, not two
+    SQLITE_PRAGMAS = (
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+    
+    def apply_pragmas(self, conn):
+        """Apply the performance PRAGMAs to a new connection
+        
+        synchronous=NORMAL is only safe in WAL mode, so it is set only when
+        the switch to WAL took (it does not on some network shares, where the
+        file keeps its rollback journal and the default FULL sync).
+        """
+        try:
+            journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if journal_mode.lower() == 'wal':
+                conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            log.warning("Could not enable WAL: %s", e)
+        for pragma in self.SQLITE_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.Error as e:
+                log.warning("Could not apply '%s': %s", pragma, e)
+    
+    # Case-insensitive indexes for the item lookups: db -> (index, table, column)
+    LOOKUP_INDEXES = {
+        'inventory': [('idx_inv_itemid', 'Inventory', 'item_id')],
+        'bearings': [('idx_bearings_bearing_id_nocase', 'bearings', 'bearing_id')],
+        'seals': [('idx_seals_itemid_nocase', 'seals', 'item_id')],
+    }
+    
+    def ensure_lookup_indexes(self, db_name, conn):
+        """Create the NOCASE lookup indexes missing from conn, then ANALYZE
+        
+        Lookups compare with '= ? COLLATE NOCASE', which can only use an
+        index declared with the same collation.
+        """
+        created = False
+        for index_name, table, column in self.LOOKUP_INDEXES.get(db_name, []):
+            try:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,)
+                ).fetchone()
+                if exists:
+                    continue
+                columns = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    continue
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column} COLLATE NOCASE)")
+                created = True
+                log.info("Created index %s on %s(%s)", index_name, table, column)
+            except sqlite3.Error as e:
+                log.warning("Could not create index %s: %s", index_name, e)
+        
+        if created:
+            try:
+                # Give the planner statistics for the new indexes
+                conn.execute("ANALYZE")
+                conn.commit()
+            except sqlite3.Error as e:
+                log.warning("Could not analyze %s: %s", db_name, e)
+    
     def connect_databases(self):
         """Connect to all databases with error handling"""
         db_files = {
@@ -412,144 +559,267 @@ class EnhancedDatabaseManager:
                     self.create_sales_database(db_file)
                     conn = sqlite3.connect(db_file)
                     conn.row_factory = sqlite3.Row
+                    self.apply_pragmas(conn)
                     self.connections[db_name] = conn
+                    self.connection_locks[db_name] = threading.RLock()
                     self.initialize_sales_tables(conn)
+                    self._grand_total_generated = self.grand_total_is_generated(conn)
                     print(f"Connected to {db_file}")
                 else:
                     if os.path.exists(db_file):
-                        conn = sqlite3.connect(db_file)
+                        # _load_all_items reads it from a worker thread
+                        conn = sqlite3.connect(db_file, check_same_thread=False)
                         conn.row_factory = sqlite3.Row
+                        self.apply_pragmas(conn)
+                        self.ensure_lookup_indexes(db_name, conn)
                         self.connections[db_name] = conn
+                        self.connection_locks[db_name] = threading.RLock()
                         print(f"Connected to {db_file}")
                     else:
                         print(f"Warning: {db_file} not found")
             except Exception as e:
                 print(f"Error connecting to {db_file}: {e}")
+        
+        self.attach_lookup_databases(db_files)
+    
+    # ---- Sales schema ----
+    # grand_total as SQLite computes it for new databases (generated column)
+    GRAND_TOTAL_EXPR = "MAX(0, subtotal - COALESCE(discount, 0) + COALESCE(tax, 0))"
+    
+    # {grand_total_column} is filled in by create_sales_database.
+    # bill_number and sale_items.item_id compare case-insensitively (NOCASE),
+    # so '=' and LIKE 'prefix%' searches on them can use their indexes
+    CREATE_SALES_SQL = '''
+        CREATE TABLE IF NOT EXISTS sales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bill_number TEXT NOT NULL UNIQUE COLLATE NOCASE,
+            bill_number_numeric INTEGER NOT NULL,
+            customer TEXT NOT NULL,
+            customer_phone TEXT,
+            customer_address TEXT,
+            sale_date TEXT NOT NULL,
+            sale_time TEXT NOT NULL,
+            total_items INTEGER NOT NULL,
+            subtotal REAL NOT NULL,
+            discount REAL DEFAULT 0,
+            discount_type TEXT DEFAULT 'Amount',
+            tax REAL DEFAULT 0,
+            tax_rate REAL DEFAULT 0,
+            {grand_total_column},
+            payment_method TEXT DEFAULT 'Cash',
+            payment_status TEXT DEFAULT 'Paid',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    '''
+    
+    # sale_items table with foreign key constraint
+    CREATE_SALE_ITEMS_SQL = '''
+        CREATE TABLE IF NOT EXISTS sale_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sale_id INTEGER NOT NULL,
+            bill_number TEXT NOT NULL COLLATE NOCASE,
+            item_id TEXT NOT NULL COLLATE NOCASE,
+            display_name TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            unit_price REAL NOT NULL,
+            total_price REAL NOT NULL,
+            unit_cost REAL NOT NULL,
+            total_cost REAL NOT NULL,
+            profit REAL NOT NULL,
+            profit_percentage REAL NOT NULL,
+            inventory_type TEXT NOT NULL,
+            database_source TEXT NOT NULL,
+            FOREIGN KEY (sale_id) REFERENCES sales (id) ON DELETE CASCADE,
+            FOREIGN KEY (bill_number) REFERENCES sales (bill_number) ON DELETE CASCADE
+        )
+    '''
+    
+    SALES_INDEXES = (
+        'CREATE INDEX IF NOT EXISTS idx_sales_bill_number ON sales(bill_number)',
+        'CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)',
+        'CREATE INDEX IF NOT EXISTS idx_sales_customer ON sales(customer)',
+        'CREATE INDEX IF NOT EXISTS idx_sale_items_bill_number ON sale_items(bill_number)',
+        'CREATE INDEX IF NOT EXISTS idx_sale_items_item_id ON sale_items(item_id)',
+    )
+    
+    # Columns added after the first release: (name, type)
+    MISSING_SALES_COLUMNS = (
+        ('bill_number_numeric', 'INTEGER'),
+        ('customer_phone', 'TEXT'),
+        ('customer_address', 'TEXT'),
+        ('sale_time', 'TEXT'),
+        ('discount_type', 'TEXT'),
+        ('tax_rate', 'REAL'),
+        ('payment_method', 'TEXT'),
+        ('payment_status', 'TEXT'),
+        ('notes', 'TEXT'),
+        ('updated_at', 'TIMESTAMP'),
+        # NEW: Return fee columns
+        ('return_fee_amount', 'REAL'),
+        ('return_fee_type', 'TEXT'),
+    )
+    
+    MISSING_SALE_ITEMS_COLUMNS = (
+        ('unit_cost', 'REAL'),
+        ('total_cost', 'REAL'),
+        ('profit', 'REAL'),
+        ('profit_percentage', 'REAL'),
+    )
+    
+    # save_sale only runs fixed SQL text, so sqlite3's statement cache keeps
+    # each one prepared across sales: INSERT_SALE_SQL (or the computed-total
+    # variant), INSERT_SALE_ITEMS_SQL / INSERT_SALE_ITEM_SQL, and for stock
+    # STOCK_UPDATE_SQL / merged_stock_update_sql. Keep new statements fixed
+    # too (no text built from a row count).
+    SALE_COLUMNS = (
+        'bill_number', 'bill_number_numeric', 'customer', 'customer_phone', 'customer_address',
+        'sale_date', 'sale_time', 'total_items', 'subtotal', 'discount', 'discount_type',
+        'tax', 'tax_rate', 'grand_total', 'payment_method', 'payment_status', 'notes',
+        'return_fee_type', 'return_fee_amount',
+    )
+    INSERT_SALE_SQL = (f"INSERT INTO sales ({', '.join(SALE_COLUMNS)}) "
+                       f"VALUES ({', '.join('?' * len(SALE_COLUMNS))})")
+    
+    # Same insert for databases where grand_total is a generated column
+    SALE_COLUMNS_COMPUTED_TOTAL = tuple(col for col in SALE_COLUMNS if col != 'grand_total')
+    INSERT_SALE_COMPUTED_TOTAL_SQL = (f"INSERT INTO sales ({', '.join(SALE_COLUMNS_COMPUTED_TOTAL)}) "
+                                      f"VALUES ({', '.join('?' * len(SALE_COLUMNS_COMPUTED_TOTAL))})")
+    
+    SALE_ITEM_COLUMNS = (
+        'sale_id', 'bill_number', 'item_id', 'display_name', 'quantity',
+        'unit_price', 'total_price', 'unit_cost', 'total_cost',
+        'profit', 'profit_percentage', 'inventory_type', 'database_source',
+    )
+    # Rows per multi-row sale_items INSERT: stays under the 999 bound
+    # parameters older SQLite versions allow in one statement
+    SALE_ITEM_ROWS_PER_INSERT = 999 // len(SALE_ITEM_COLUMNS)
+    _SALE_ITEM_ROW = f"({', '.join('?' * len(SALE_ITEM_COLUMNS))})"
+    # One row (executemany) and a full SALE_ITEM_ROWS_PER_INSERT chunk: two
+    # fixed statements whatever the sale's length, so both stay prepared
+    INSERT_SALE_ITEM_SQL = f"INSERT INTO sale_items ({', '.join(SALE_ITEM_COLUMNS)}) VALUES {_SALE_ITEM_ROW}"
+    INSERT_SALE_ITEMS_SQL = INSERT_SALE_ITEM_SQL + f", {_SALE_ITEM_ROW}" * (SALE_ITEM_ROWS_PER_INSERT - 1)
     
     def create_sales_database(self, db_file):
         """Create sales database if it doesn't exist"""
         try:
             conn = sqlite3.connect(db_file)
-            cursor = conn.cursor()
-            
-            # Create sales table with enhanced schema
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sales (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    bill_number TEXT NOT NULL UNIQUE,
-                    bill_number_numeric INTEGER NOT NULL,
-                    customer TEXT NOT NULL,
-                    customer_phone TEXT,
-                    customer_address TEXT,
-                    sale_date TEXT NOT NULL,
-                    sale_time TEXT NOT NULL,
-                    total_items INTEGER NOT NULL,
-                    subtotal REAL NOT NULL,
-                    discount REAL DEFAULT 0,
-                    discount_type TEXT DEFAULT 'Amount',
-                    tax REAL DEFAULT 0,
-                    tax_rate REAL DEFAULT 0,
-                    grand_total REAL NOT NULL,
-                    payment_method TEXT DEFAULT 'Cash',
-                    payment_status TEXT DEFAULT 'Paid',
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            self.apply_pragmas(conn)
             
-            # Create sale_items table with foreign key constraint
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sale_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sale_id INTEGER NOT NULL,
-                    bill_number TEXT NOT NULL,
-                    item_id TEXT NOT NULL,
-                    display_name TEXT NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    unit_price REAL NOT NULL,
-                    total_price REAL NOT NULL,
-                    unit_cost REAL NOT NULL,
-                    total_cost REAL NOT NULL,
-                    profit REAL NOT NULL,
-                    profit_percentage REAL NOT NULL,
-                    inventory_type TEXT NOT NULL,
-                    database_source TEXT NOT NULL,
-                    FOREIGN KEY (sale_id) REFERENCES sales (id) ON DELETE CASCADE,
-                    FOREIGN KEY (bill_number) REFERENCES sales (bill_number) ON DELETE CASCADE
-                )
-            ''')
+            # Generated columns need SQLite 3.31+
+            if sqlite3.sqlite_version_info >= (3, 31, 0):
+                grand_total_column = f"grand_total REAL GENERATED ALWAYS AS ({self.GRAND_TOTAL_EXPR}) VIRTUAL"
+            else:
+                grand_total_column = "grand_total REAL NOT NULL"
             
-            # Create indexes for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_bill_number ON sales(bill_number)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(sale_date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sales_customer ON sales(customer)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_sale_items_bill_number ON sale_items(bill_number)')
+            # The whole schema is created in one transaction (one commit,
+            # one fsync); the with block commits it, or rolls back on error
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute(self.CREATE_SALES_SQL.format(grand_total_column=grand_total_column))
+                conn.execute(self.CREATE_SALE_ITEMS_SQL)
+                for index_sql in self.SALES_INDEXES:
+                    conn.execute(index_sql)
             
-            conn.commit()
             conn.close()
             print(f"Created/Verified sales database: {db_file}")
         except Exception as e:
             print(f"Error creating sales database: {e}")
     
+    # Bumped whenever initialize_sales_tables gains a migration step
+    SALES_SCHEMA_VERSION = 3
+    
     def initialize_sales_tables(self, conn):
-        """Initialize tables and add missing columns if needed"""
+        """Initialize tables and add missing columns if needed
+        
+        The migrated schema version is kept in PRAGMA user_version, so an
+        up-to-date database skips the column checks entirely.
+        """
         try:
             cursor = conn.cursor()
             
-            # Check and add missing columns to sales table
-            cursor.execute("PRAGMA table_info(sales)")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            missing_columns = [
-                ('bill_number_numeric', 'INTEGER'),
-                ('customer_phone', 'TEXT'),
-                ('customer_address', 'TEXT'),
-                ('sale_time', 'TEXT'),
-                ('discount_type', 'TEXT'),
-                ('tax_rate', 'REAL'),
-                ('payment_method', 'TEXT'),
-                ('payment_status', 'TEXT'),
-                ('notes', 'TEXT'),
-                ('updated_at', 'TIMESTAMP'),
-                # NEW: Return fee columns
-                ('return_fee_amount', 'REAL'),
-                ('return_fee_type', 'TEXT')
-            ]
-            
-            for col_name, col_type in missing_columns:
-                if col_name not in columns:
-                    cursor.execute(f"ALTER TABLE sales ADD COLUMN {col_name} {col_type}")
-                    print(f"Added column {col_name} to sales table")
-            
-            # Check and add missing columns to sale_items table
-            cursor.execute("PRAGMA table_info(sale_items)")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            missing_item_columns = [
-                ('unit_cost', 'REAL'),
-                ('total_cost', 'REAL'),
-                ('profit', 'REAL'),
-                ('profit_percentage', 'REAL')
-            ]
-            
-            for col_name, col_type in missing_item_columns:
-                if col_name not in columns:
-                    cursor.execute(f"ALTER TABLE sale_items ADD COLUMN {col_name} {col_type}")
-                    print(f"Added column {col_name} to sale_items table")
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SALES_SCHEMA_VERSION:
+                return
             
-            conn.commit()
+            # All ALTERs in one transaction: one schema rewrite, one fsync;
+            # the with block commits, or rolls back on error
+            with conn:
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                for table, missing_columns in (('sales', self.MISSING_SALES_COLUMNS),
+                                               ('sale_items', self.MISSING_SALE_ITEMS_COLUMNS)):
+                    cursor.execute(f"PRAGMA table_info({table})")
+                    columns = [col[1] for col in cursor.fetchall()]
+                    
+                    for col_name, col_type in missing_columns:
+                        if col_name not in columns:
+                            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}")
+                            print(f"Added column {col_name} to {table} table")
+                
+                cursor.execute(f"PRAGMA user_version = {self.SALES_SCHEMA_VERSION}")
         except Exception as e:
             print(f"Error initializing tables: {e}")
     
+    def grand_total_is_generated(self, conn):
+        """True if the sales table computes grand_total itself"""
+        try:
+            for col in conn.execute("PRAGMA table_xinfo(sales)"):
+                if col[1] == 'grand_total':
+                    return col[6] in (2, 3)  # hidden: 2 = virtual, 3 = stored
+        except sqlite3.Error as e:
+            log.warning("Could not inspect sales table: %s", e)
+        return False
+    
     def get_connection(self, db_name):
         return self.connections.get(db_name)
     
+    # Items found recently, so repeated scans skip the database
+    ITEM_CACHE_SIZE = 1024
+    
     def search_item_by_id(self, item_id):
-        """Search item across all databases"""
-        print(f"DEBUG: Searching for item ID: '{item_id}'")  # Debug line
-        item_id = str(item_id).strip().upper()
-        print(f"DEBUG: After processing: '{item_id}'")  # Debug line
+        """Search item across all databases, serving recent hits from memory"""
+        self.wait_for_catalog()
+        key = str(item_id).strip().upper()
+        item = self._item_cache.get(key)
+        if item is not None:
+            self._item_cache.move_to_end(key)
+        else:
+            item = self._search_item_by_id_raw(key)
+            if item is None:
+                # Misses are not cached: the item may be added meanwhile
+                return None
+            self._item_cache[key] = item
+            if len(self._item_cache) > self.ITEM_CACHE_SIZE:
+                self._item_cache.popitem(last=False)
+        # Callers may change the dict they get; keep the cached one intact
+        return dict(item)
+    
+    def forget_item(self, item_id):
+        """Drop item_id from the lookup cache (its stock changed)"""
+        self._item_cache.pop(str(item_id).strip().upper(), None)
+    
+    def clear_item_cache(self):
+        self._item_cache.clear()
+    
+    def _search_item_by_id_raw(self, item_id):
+        """Search an already normalized (stripped, upper-case) item_id in the databases"""
+        log.debug("Searching for item ID: '%s'", item_id)
+        
+        covered = ()
+        if self._unified_lookup_sql:
+            # One statement looks in inventory and every attached database
+            try:
+                with self.connection_locks['inventory']:
+                    row = self.connections['inventory'].execute(
+                        self._unified_lookup_sql, (item_id,) * self._unified_lookup_params).fetchone()
+                if row:
+                    log.debug("Found item in %s: %s", row['source'], row['item_id'])
+                    return self.item_from_lookup_row(row)
+                covered = self._unified_lookup_sources
+            except sqlite3.Error as e:
+                log.warning("Unified item lookup failed, searching each database: %s", e)
         
         databases = [
             ('inventory', self.search_inventory),
@@ -558,264 +828,421 @@ class EnhancedDatabaseManager:
         ]
         
         for db_name, search_func in databases:
-            if db_name in self.connections:
-                print(f"DEBUG: Searching in {db_name} database...")  # Debug line
+            if db_name in self.connections and db_name not in covered:
+                log.debug("Searching in %s database...", db_name)
                 item = search_func(item_id)
                 if item:
-                    print(f"DEBUG: Found item in {db_name}: {item['item_id']}")  # Debug line
+                    log.debug("Found item in %s: %s", db_name, item['item_id'])
                     return item
                 else:
-                    print(f"DEBUG: Not found in {db_name}")  # Debug line
+                    log.debug("Not found in %s", db_name)
         
-        print(f"DEBUG: Item not found in any database")  # Debug line
+        log.debug("Item not found in any database")
         return None
     
+    # Candidate lookup queries per database, in the order they are tried:
+    # (table, columns the query needs, query). {db} is the schema prefix
+    # ('' on the database's own connection, 'bearings.' when attached).
+    ITEM_QUERIES = {
+        'inventory': [
+            ('Inventory', ('item_id', 'item', 'quantity', 'price', 'cost'),
+             "SELECT item_id, item as display_name, quantity, price, cost FROM {db}Inventory WHERE item_id = ? COLLATE NOCASE"),
+            ('inventory', ('item_id', 'name', 'quantity', 'price', 'cost'),
+             "SELECT item_id, name as display_name, quantity, price, cost FROM {db}inventory WHERE item_id = ? COLLATE NOCASE"),
+            ('inventory', ('id', 'name', 'quantity', 'price', 'cost'),
+             "SELECT id as item_id, name as display_name, quantity, price, cost FROM {db}inventory WHERE id = ?"),
+            ('products', ('code', 'name', 'quantity', 'selling_price', 'cost_price'),
+             "SELECT code as item_id, name as display_name, quantity, selling_price as price, cost_price as cost FROM {db}products WHERE code = ? COLLATE NOCASE"),
+            ('items', ('sku', 'product_name', 'stock', 'price', 'cost'),
+             "SELECT sku as item_id, product_name as display_name, stock as quantity, price, cost FROM {db}items WHERE sku = ?"),
+        ],
+        'bearings': [
+            ('bearings', ('bearing_id', 'inner_diameter', 'outer_diameter', 'width', 'type', 'brand', 'quantity', 'price', 'cost'),
+             "SELECT bearing_id as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM {db}bearings WHERE bearing_id = ? COLLATE NOCASE"),
+            ('bearings', ('id', 'inner_diameter', 'outer_diameter', 'width', 'type', 'brand', 'quantity', 'price', 'cost'),
+             "SELECT id as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM {db}bearings WHERE id = ? COLLATE NOCASE"),
+            ('bearings', ('code', 'inner_diameter', 'outer_diameter', 'width', 'type', 'brand', 'quantity', 'price', 'cost'),
+             "SELECT code as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM {db}bearings WHERE code = ? COLLATE NOCASE"),
+        ],
+        'seals': [
+            ('seals', ('item_id', 'od', 'idd', 'b', 'qty', 'price', 'cost', 'category_id', 'quality_id'),
+             """SELECT s.item_id, s.od, s.idd, s.b, c.name as category, s.qty as quantity, s.price, s.cost, q.name as quality
+                FROM {db}seals s
+                LEFT JOIN {db}categories c ON s.category_id = c.id
+                LEFT JOIN {db}qualities q ON s.quality_id = q.id
+                WHERE s.item_id = ? COLLATE NOCASE"""),
+        ],
+    }
+    
+    # Columns each database's lookup maps onto in the unified lookup
+    UNIFIED_LOOKUP_COLUMNS = {
+        'inventory': "item_id, display_name, NULL AS size_a, NULL AS size_b, NULL AS size_c, NULL AS label, NULL AS kind, quantity, price, cost",
+        'bearings': "item_id, NULL AS display_name, inner_diameter AS size_a, outer_diameter AS size_b, width AS size_c, brand AS label, type AS kind, quantity, price, cost",
+        'seals': "item_id, NULL AS display_name, od AS size_a, idd AS size_b, b AS size_c, quality AS label, category AS kind, quantity, price, cost",
+    }
+    
+    INVENTORY_TYPES = {
+        'inventory': 'General Inventory',
+        'bearings': 'Bearings',
+        'seals': 'Seals',
+    }
+    
+    def get_item_queries(self, db_name, schema=''):
+        """Return the lookup queries whose table and columns exist in db_name
+        
+        The schema is probed once with PRAGMA table_info and the result is
+        cached, so scans never run queries that can only fail. schema is
+        the prefix put before the table names ('' or e.g. 'bearings.').
+        """
+        queries = self._item_query_cache.get((db_name, schema))
+        if queries is None:
+            conn = self.connections[db_name]
+            table_columns = {}
+            queries = []
+            with self.connection_locks[db_name]:
+                for table, needed, query in self.ITEM_QUERIES[db_name]:
+                    key = table.lower()  # SQLite table names are case-insensitive
+                    if key not in table_columns:
+                        table_columns[key] = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({table})")}
+                    if all(col in table_columns[key] for col in needed):
+                        queries.append(query.format(db=schema))
+            self._item_query_cache[(db_name, schema)] = queries
+            log.debug("%s lookup queries: %d", db_name, len(queries))
+        return queries
+    
+    def attach_lookup_databases(self, db_files):
+        """ATTACH the bearings and seals databases to the inventory connection
+        
+        and build the single UNION ALL statement search_item_by_id runs
+        instead of querying each database in turn.
+        """
+        self._unified_lookup_sql = None
+        self._unified_lookup_params = 0
+        self._unified_lookup_sources = ()
+        if 'inventory' not in self.connections:
+            return
+        
+        conn = self.connections['inventory']
+        schemas = [('inventory', 'main.')]
+        for db_name in ('bearings', 'seals'):
+            if db_name not in self.connections or not os.path.exists(db_files[db_name]):
+                continue
+            try:
+                conn.execute(f"ATTACH DATABASE ? AS {db_name}", (db_files[db_name],))
+                schemas.append((db_name, f"{db_name}."))
+            except sqlite3.Error as e:
+                log.warning("Could not attach %s: %s", db_files[db_name], e)
+        
+        # priority keeps the old search order: inventory first, then bearings, then seals
+        branches = []
+        for db_name, schema in schemas:
+            try:
+                queries = self.get_item_queries(db_name, schema)
+            except sqlite3.Error as e:
+                log.warning("Could not probe %s: %s", db_name, e)
+                continue
+            columns = self.UNIFIED_LOOKUP_COLUMNS[db_name]
+            for query in queries:
+                branches.append(
+                    f"SELECT {len(branches)} AS priority, '{db_name}' AS source, {columns} FROM ({query})"
+                )
+        
+        if branches:
+            self._unified_lookup_sql = " UNION ALL ".join(branches) + " ORDER BY priority LIMIT 1"
+            self._unified_lookup_params = len(branches)
+            self._unified_lookup_sources = tuple(db_name for db_name, _ in schemas)
+    
+    @staticmethod
+    def bearing_display_name(inner_d, outer_d, width, brand, bearing_type):
+        return (f"Bearing {inner_d}x{outer_d}x{width}"
+                + (f" {brand}" if brand else "")
+                + (f" ({bearing_type})" if bearing_type else ""))
+    
+    @staticmethod
+    def seal_display_name(od, idd, b, quality, category):
+        return (f"Oil Seal {od}x{idd}x{b}"
+                + (f" {quality}" if quality else "")
+                + (f" ({category})" if category else ""))
+    
+    def make_item(self, row, display_name, db_name):
+        """Build the item dict the sales window works with"""
+        return {
+            'item_id': str(row['item_id']),
+            'display_name': display_name,
+            'quantity': int(row['quantity']) if row['quantity'] else 0,
+            'price': float(row['price']) if row['price'] else 0.0,
+            'cost': float(row['cost']) if row['cost'] else 0.0,
+            'inventory_type': self.INVENTORY_TYPES[db_name],
+            'database': db_name
+        }
+    
+    def item_from_lookup_row(self, row):
+        """Build the item dict from a unified lookup row"""
+        source = row['source']
+        if source == 'bearings':
+            display_name = self.bearing_display_name(
+                row['size_a'], row['size_b'], row['size_c'], row['label'] or "", row['kind'] or "")
+        elif source == 'seals':
+            display_name = self.seal_display_name(
+                row['size_a'], row['size_b'], row['size_c'], row['label'] or "", row['kind'] or "")
+        else:
+            display_name = row['display_name']
+        return self.make_item(row, display_name, source)
+    
     def search_inventory(self, item_id):
-        """Search in inventory database with multiple query attempts"""
-        print(f"DEBUG: search_inventory called with: '{item_id}'")  # Debug line
+        """Search in inventory database using the queries that fit its schema"""
+        log.debug("search_inventory called with: '%s'", item_id)
         try:
-            conn = self.connections['inventory']
-            cursor = conn.cursor()
-            
-            # Try multiple query patterns to match different schemas
-            queries = [
-                "SELECT item_id, item as display_name, quantity, price, cost FROM Inventory WHERE item_id = ?",
-                "SELECT item_id, name as display_name, quantity, price, cost FROM inventory WHERE item_id = ?",
-                "SELECT id as item_id, name as display_name, quantity, price, cost FROM inventory WHERE id = ?",
-                "SELECT code as item_id, name as display_name, quantity, selling_price as price, cost_price as cost FROM products WHERE code = ?",
-                "SELECT sku as item_id, product_name as display_name, stock as quantity, price, cost FROM items WHERE sku = ?"
-            ]
-            
-            for i, query in enumerate(queries):
-                try:
-                    print(f"DEBUG: Trying query #{i+1}: {query}")  # Debug line
-                    cursor.execute(query, (item_id,))
-                    row = cursor.fetchone()
-                    if row:
-                        print(f"DEBUG: Found item with query #{i+1}")  # Debug line
-                        return {
-                            'item_id': str(row['item_id']),
-                            'display_name': row['display_name'],
-                            'quantity': int(row['quantity']) if row['quantity'] else 0,
-                            'price': float(row['price']) if row['price'] else 0.0,
-                            'cost': float(row['cost']) if row['cost'] else 0.0,
-                            'inventory_type': 'General Inventory',
-                            'database': 'inventory'
-                        }
-                    else:
-                        print(f"DEBUG: Query #{i+1} returned no results")  # Debug line
-                except Exception as e:
-                    print(f"DEBUG: Query #{i+1} failed: {e}")  # Debug line
-                    continue
-                    
-            # Also try case-insensitive search
-            print(f"DEBUG: Trying case-insensitive search...")  # Debug line
-            queries_case_insensitive = [
-                "SELECT item_id, item as display_name, quantity, price, cost FROM Inventory WHERE UPPER(item_id) = UPPER(?)",
-                "SELECT item_id, name as display_name, quantity, price, cost FROM inventory WHERE UPPER(item_id) = UPPER(?)",
-                "SELECT code as item_id, name as display_name, quantity, selling_price as price, cost_price as cost FROM products WHERE UPPER(code) = UPPER(?)"
-            ]
-            
-            for i, query in enumerate(queries_case_insensitive):
-                try:
-                    print(f"DEBUG: Trying case-insensitive query #{i+1}")  # Debug line
+            with self.connection_locks['inventory']:
+                cursor = self.connections['inventory'].cursor()
+                
+                # Matching is case-insensitive (COLLATE NOCASE), so one pass covers
+                # both the exact and the case-insensitive lookups
+                for i, query in enumerate(self.get_item_queries('inventory')):
                     cursor.execute(query, (item_id,))
                     row = cursor.fetchone()
                     if row:
-                        print(f"DEBUG: Found item with case-insensitive query #{i+1}")  # Debug line
-                        return {
-                            'item_id': str(row['item_id']),
-                            'display_name': row['display_name'],
-                            'quantity': int(row['quantity']) if row['quantity'] else 0,
-                            'price': float(row['price']) if row['price'] else 0.0,
-                            'cost': float(row['cost']) if row['cost'] else 0.0,
-                            'inventory_type': 'General Inventory',
-                            'database': 'inventory'
-                        }
-                except Exception as e:
-                    print(f"DEBUG: Case-insensitive query #{i+1} failed: {e}")  # Debug line
-                    continue
+                        log.debug("Found item with query #%d", i + 1)
+                        return self.make_item(row, row['display_name'], 'inventory')
         except Exception as e:
-            print(f"DEBUG: Error searching inventory: {e}")  # Debug line
+            log.warning("Error searching inventory: %s", e)
         
         return None
     
     def search_bearings(self, item_id):
         try:
-            conn = self.connections['bearings']
-            cursor = conn.cursor()
-            
-            queries = [
-                "SELECT bearing_id as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM bearings WHERE UPPER(bearing_id) = UPPER(?)",
-                "SELECT id as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM bearings WHERE UPPER(id) = UPPER(?)",
-                "SELECT code as item_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM bearings WHERE UPPER(code) = UPPER(?)"
-            ]
-            
-            for query in queries:
-                try:
+            with self.connection_locks['bearings']:
+                cursor = self.connections['bearings'].cursor()
+                
+                for query in self.get_item_queries('bearings'):
                     cursor.execute(query, (item_id,))
                     row = cursor.fetchone()
                     if row:
-                        inner_d = row['inner_diameter']
-                        outer_d = row['outer_diameter']
-                        width = row['width']
-                        brand = row['brand'] if row['brand'] else ""
-                        bearing_type = row['type'] if row['type'] else ""
-                        
-                        display_name = f"Bearing {inner_d}x{outer_d}x{width}"
-                        if brand:
-                            display_name += f" {brand}"
-                        if bearing_type:
-                            display_name += f" ({bearing_type})"
-                        
-                        return {
-                            'item_id': str(row['item_id']),
-                            'display_name': display_name,
-                            'quantity': int(row['quantity']) if row['quantity'] else 0,
-                            'price': float(row['price']) if row['price'] else 0.0,
-                            'cost': float(row['cost']) if row['cost'] else 0.0,
-                            'inventory_type': 'Bearings',
-                            'database': 'bearings'
-                        }
-                except:
-                    continue
+                        display_name = self.bearing_display_name(
+                            row['inner_diameter'], row['outer_diameter'], row['width'],
+                            row['brand'] or "", row['type'] or "")
+                        return self.make_item(row, display_name, 'bearings')
         except Exception as e:
-            print(f"Error searching bearings: {e}")
+            log.warning("Error searching bearings: %s", e)
         
         return None
 
     def search_seals(self, item_id):
         try:
-            conn = self.connections['seals']
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT s.item_id, s.od, s.idd, s.b, c.name as category, 
-                       s.qty as quantity, s.price, s.cost, q.name as quality
-                FROM seals s
-                LEFT JOIN categories c ON s.category_id = c.id
-                LEFT JOIN qualities q ON s.quality_id = q.id
-                WHERE UPPER(s.item_id) = UPPER(?)
-            """
-            
-            cursor.execute(query, (item_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                od = row['od']
-                idd = row['idd']
-                b = row['b']
-                quality = row['quality'] if row['quality'] else ""
-                category = row['category'] if row['category'] else ""
-                
-                display_name = f"Oil Seal {od}x{idd}x{b}"
-                if quality:
-                    display_name += f" {quality}"
-                if category:
-                    display_name += f" ({category})"
+            with self.connection_locks['seals']:
+                cursor = self.connections['seals'].cursor()
                 
-                return {
-                    'item_id': str(row['item_id']),
-                    'display_name': display_name,
-                    'quantity': int(row['quantity']) if row['quantity'] else 0,
-                    'price': float(row['price']) if row['price'] else 0.0,
-                    'cost': float(row['cost']) if row['cost'] else 0.0,
-                    'inventory_type': 'Seals',
-                    'database': 'seals'
-                }
+                for query in self.get_item_queries('seals'):
+                    cursor.execute(query, (item_id,))
+                    row = cursor.fetchone()
+                    if row:
+                        display_name = self.seal_display_name(
+                            row['od'], row['idd'], row['b'],
+                            row['quality'] or "", row['category'] or "")
+                        return self.make_item(row, display_name, 'seals')
         except Exception as e:
-            print(f"Error searching seals: {e}")
+            log.warning("Error searching seals: %s", e)
         
         return None
     
     def get_all_items(self):
-        """Get all items from all databases for search"""
-        all_items = []
+        """Get all items from all databases for search
         
-        if 'inventory' in self.connections:
-            try:
-                conn = self.connections['inventory']
-                cursor = conn.cursor()
-                cursor.execute("SELECT item_id, item as display_name, quantity, price, cost FROM Inventory")
-                for row in cursor.fetchall():
-                    all_items.append({
-                        'item_id': str(row['item_id']),
-                        'display_name': row['display_name'],
-                        'quantity': int(row['quantity']) if row['quantity'] else 0,
-                        'price': float(row['price']) if row['price'] else 0.0,
-                        'cost': float(row['cost']) if row['cost'] else 0.0,
-                        'inventory_type': 'General Inventory',
-                        'database': 'inventory'
-                    })
-            except Exception as e:
-                print(f"Error getting inventory items: {e}")
+        The list is built once and kept; stock sold through this manager is
+        applied to it in place, and it is rebuilt when another program
+        commits to one of the databases (PRAGMA data_version changes).
+        Callers must treat it as read-only.
+        """
+        with self.catalog_lock:
+            versions = self.catalog_versions()
+            if not self.items_cached(versions):
+                self._items_cache = self._load_all_items()
+                self._items_by_key = {(item.database, item.item_id.upper()): item
+                                      for item in self._items_cache}
+                self._items_fts = self.index_catalog(self._items_cache)
+                self._items_versions = versions
+                self._items_dirty = False
+            return self._items_cache
+    
+    def load_catalog(self):
+        """The CatalogLoader reading the catalog, started unless one is in flight"""
+        if not self.catalog_loading():
+            self.catalog_loader = CatalogLoader(self)
+            QThreadPool.globalInstance().start(self.catalog_loader)
+        return self.catalog_loader
+    
+    def catalog_loading(self):
+        return self.catalog_loader is not None and not self.catalog_loader.done.is_set()
+    
+    def wait_for_catalog(self):
+        """Block until a background catalog load has finished"""
+        if self.catalog_loading():
+            self.catalog_loader.done.wait()
+    
+    # Trigram tokenizer: MATCH finds substrings anywhere, like the dialog's search
+    CREATE_ITEMS_FTS_SQL = "CREATE VIRTUAL TABLE items_fts USING fts5(search, tokenize='trigram', content='')"
+    
+    def index_catalog(self, items):
+        """Load each item's search text into a new in-memory FTS5 table, rowid = position"""
+        try:
+            # Built on the search dialog's loader thread, queried on the GUI thread
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+            conn.execute(self.CREATE_ITEMS_FTS_SQL)
+            with conn:
+                conn.executemany("INSERT INTO items_fts (rowid, search) VALUES (?, ?)",
+                                 ((position, item.search) for position, item in enumerate(items)))
+            return conn
+        except sqlite3.Error as e:
+            # No FTS5 or trigram tokenizer (SQLite < 3.34): search scans the list
+            log.warning("Item search index unavailable: %s", e)
+            return None
+    
+    def match_items(self, items, keywords):
+        """Positions in items whose search text contains every keyword of 3+ characters
         
-        if 'bearings' in self.connections:
-            try:
-                conn = self.connections['bearings']
-                cursor = conn.cursor()
-                cursor.execute("SELECT bearing_id, inner_diameter, outer_diameter, width, type, brand, quantity, price, cost FROM bearings")
-                for row in cursor.fetchall():
-                    inner_d = row['inner_diameter']
-                    outer_d = row['outer_diameter']
-                    width = row['width']
-                    brand = row['brand'] if row['brand'] else ""
-                    bearing_type = row['type'] if row['type'] else ""
-                    
-                    display_name = f"Bearing {inner_d}x{outer_d}x{width}"
-                    if brand:
-                        display_name += f" {brand}"
-                    if bearing_type:
-                        display_name += f" ({bearing_type})"
-                    
-                    all_items.append({
-                        'item_id': str(row['bearing_id']),
-                        'display_name': display_name,
-                        'quantity': int(row['quantity']) if row['quantity'] else 0,
-                        'price': float(row['price']) if row['price'] else 0.0,
-                        'cost': float(row['cost']) if row['cost'] else 0.0,
-                        'inventory_type': 'Bearings',
-                        'database': 'bearings'
-                    })
-            except Exception as e:
-                print(f"Error getting bearing items: {e}")
+        Returns None (check every item) when items is not the cached catalog,
+        there is no index, or no keyword is long enough for a trigram lookup.
+        Shorter keywords are left to the caller.
+        """
+        terms = [keyword for keyword in keywords if len(keyword) >= 3]
+        query = " AND ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        try:
+            with self.catalog_lock:
+                if items is not self._items_cache or self._items_fts is None or not terms:
+                    return None
+                cursor = self._items_fts.execute(
+                    "SELECT rowid FROM items_fts WHERE items_fts MATCH ? ORDER BY rowid", (query,))
+                return [row[0] for row in cursor]
+        except sqlite3.Error as e:
+            log.warning("Error searching items: %s", e)
+            return None
+    
+    def items_cached(self, versions=None):
+        """Whether get_all_items can answer from memory"""
+        with self.catalog_lock:
+            if versions is None:
+                versions = self.catalog_versions()
+            return not self._items_dirty and versions == self._items_versions
+    
+    def catalog_versions(self):
+        """PRAGMA data_version of each item database, to notice outside writes"""
+        versions = {}
+        for db_name in self.INVENTORY_TYPES:
+            conn = self.connections.get(db_name)
+            if conn is not None:
+                try:
+                    with self.connection_locks[db_name]:
+                        versions[db_name] = conn.execute("PRAGMA data_version").fetchone()[0]
+                except sqlite3.Error:
+                    versions[db_name] = None
+        return versions
+    
+    def invalidate_items(self):
+        """Rebuild the search catalog on next get_all_items"""
+        with self.catalog_lock:
+            self._items_dirty = True
+    
+    # Catalog reads for get_all_items. Empty stock/price/cost come back as
+    # typed zeros, so the plain tuple rows unpack straight into item dicts.
+    CATALOG_QUERIES = {
+        'inventory': """SELECT item_id, item, CAST(COALESCE(quantity, 0) AS INTEGER),
+                               CAST(COALESCE(price, 0) AS REAL), CAST(COALESCE(cost, 0) AS REAL)
+                        FROM Inventory""",
+        'bearings': """SELECT bearing_id, inner_diameter, outer_diameter, width, brand, type,
+                              CAST(COALESCE(quantity, 0) AS INTEGER),
+                              CAST(COALESCE(price, 0) AS REAL), CAST(COALESCE(cost, 0) AS REAL)
+                       FROM bearings""",
+        'seals': """SELECT s.item_id, s.od, s.idd, s.b, q.name, c.name,
+                           CAST(COALESCE(s.qty, 0) AS INTEGER),
+                           CAST(COALESCE(s.price, 0) AS REAL), CAST(COALESCE(s.cost, 0) AS REAL)
+                    FROM seals s
+                    LEFT JOIN categories c ON s.category_id = c.id
+                    LEFT JOIN qualities q ON s.quality_id = q.id""",
+    }
+    
+    def _catalog_rows(self, db_name):
+        """Run db_name's catalog query and fetch it as plain tuples (not sqlite3.Row)
+        
+        The rows are fetched under the connection's lock, so a lookup from
+        the GUI thread never steps the connection at the same time.
+        """
+        with self.connection_locks[db_name]:
+            cursor = self.connections[db_name].cursor()
+            cursor.row_factory = None
+            return cursor.execute(self.CATALOG_QUERIES[db_name]).fetchall()
+    
+    def _load_inventory_items(self):
+        items = []
+        try:
+            for item_id, display_name, quantity, price, cost in self._catalog_rows('inventory'):
+                items.append(CatalogItem(
+                    item_id=str(item_id),
+                    display_name=display_name,
+                    quantity=quantity,
+                    price=price,
+                    cost=cost,
+                    inventory_type='General Inventory',
+                    database='inventory'
+                ))
+        except Exception as e:
+            print(f"Error getting inventory items: {e}")
+        return items
+    
+    def _load_bearing_items(self):
+        items = []
+        try:
+            for (item_id, inner_d, outer_d, width, brand, bearing_type,
+                 quantity, price, cost) in self._catalog_rows('bearings'):
+                items.append(CatalogItem(
+                    item_id=str(item_id),
+                    display_name=self.bearing_display_name(
+                        inner_d, outer_d, width, brand or "", bearing_type or ""),
+                    quantity=quantity,
+                    price=price,
+                    cost=cost,
+                    inventory_type='Bearings',
+                    database='bearings'
+                ))
+        except Exception as e:
+            print(f"Error getting bearing items: {e}")
+        return items
+    
+    def _load_seal_items(self):
+        items = []
+        try:
+            for item_id, od, idd, b, quality, category, quantity, price, cost in self._catalog_rows('seals'):
+                items.append(CatalogItem(
+                    item_id=str(item_id),
+                    display_name=self.seal_display_name(
+                        od, idd, b, quality or "", category or ""),
+                    quantity=quantity,
+                    price=price,
+                    cost=cost,
+                    inventory_type='Seals',
+                    database='seals'
+                ))
+        except Exception as e:
+            print(f"Error getting seal items: {e}")
+        return items
+    
+    def _load_all_items(self):
+        """Read every item from the inventory, bearings and seals databases
         
-        if 'seals' in self.connections:
-            try:
-                conn = self.connections['seals']
-                cursor = conn.cursor()
-                query = """
-                    SELECT s.item_id, s.od, s.idd, s.b, c.name as category, 
-                           s.qty as quantity, s.price, s.cost, q.name as quality
-                    FROM seals s
-                    LEFT JOIN categories c ON s.category_id = c.id
-                    LEFT JOIN qualities q ON s.quality_id = q.id
-                """
-                cursor.execute(query)
-                for row in cursor.fetchall():
-                    od = row['od']
-                    idd = row['idd']
-                    b = row['b']
-                    quality = row['quality'] if row['quality'] else ""
-                    category = row['category'] if row['category'] else ""
-                    
-                    display_name = f"Oil Seal {od}x{idd}x{b}"
-                    if quality:
-                        display_name += f" {quality}"
-                    if category:
-                        display_name += f" ({category})"
-                    
-                    all_items.append({
-                        'item_id': str(row['item_id']),
-                        'display_name': display_name,
-                        'quantity': int(row['quantity']) if row['quantity'] else 0,
-                        'price': float(row['price']) if row['price'] else 0.0,
-                        'cost': float(row['cost']) if row['cost'] else 0.0,
-                        'inventory_type': 'Seals',
-                        'database': 'seals'
-                    })
-            except Exception as e:
-                print(f"Error getting seal items: {e}")
+        The databases have separate connections, so their reads run in
+        worker threads (SQLite releases the GIL while it steps) while this
+        thread waits for all of them.
+        """
+        loaders = [loader for db_name, loader in (
+            ('inventory', self._load_inventory_items),
+            ('bearings', self._load_bearing_items),
+            ('seals', self._load_seal_items),
+        ) if db_name in self.connections]
+        if len(loaders) > 1:
+            with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+                futures = [pool.submit(loader) for loader in loaders]
+                all_items = [item for future in futures for item in future.result()]
+        else:
+            all_items = [item for loader in loaders for item in loader()]
         
         return all_items
     
@@ -830,8 +1257,8 @@ class EnhancedDatabaseManager:
             conn = self.connections['sales']
             cursor = conn.cursor()
             
-            # Start transaction
-            conn.execute("BEGIN TRANSACTION")
+            # Start transaction (IMMEDIATE takes the write lock up front)
+            conn.execute("BEGIN IMMEDIATE")
             
             try:
                 # Get current datetime
@@ -839,63 +1266,72 @@ class EnhancedDatabaseManager:
                 sale_date = now.strftime("%Y-%m-%d")
                 sale_time = now.strftime("%H:%M:%S")
                 
-                # Calculate totals
-                subtotal = sum(item['total_price'] for item in sale_items)
-                total_cost = sum(item['total_cost'] for item in sale_items)
+                # One pass over the items: totals, sale_items rows (sale_id is
+                # added once the header has one) and stock changes per database
+                subtotal = 0.0
+                total_cost = 0.0
+                item_rows = []
+                stock_changes = {}
+                for item in sale_items:
+                    item_total_cost = item.total_cost
+                    subtotal += item.total_price
+                    total_cost += item_total_cost
+                    item_rows.append((
+                        bill_number, item.item_id, item.display_name, item.quantity,
+                        item.price, item.total_price, item.cost, item_total_cost,
+                        item.profit, (item.profit / item_total_cost * 100) if item_total_cost > 0 else 0,
+                        item.inventory_type, item.database))
+                    stock_changes.setdefault(item.database, []).append((item.quantity, item.item_id))
                 
                 # Insert sale header
-                cursor.execute('''
-                    INSERT INTO sales (
-                        bill_number, bill_number_numeric, customer, customer_phone, customer_address,
-                        sale_date, sale_time, total_items, subtotal, discount, discount_type,
-                        tax, tax_rate, grand_total, payment_method, payment_status, notes,
-                        return_fee_type, return_fee_amount
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    bill_number, bill_number_numeric, customer, customer_phone, customer_address,
-                    sale_date, sale_time, len(sale_items), subtotal, discount, discount_type,
-                    tax, tax_rate, grand_total, payment_method, payment_status, notes,
-                    return_fee_type, return_fee_amount
-                ))
+                header = {
+                    'bill_number': bill_number, 'bill_number_numeric': bill_number_numeric,
+                    'customer': customer, 'customer_phone': customer_phone,
+                    'customer_address': customer_address, 'sale_date': sale_date,
+                    'sale_time': sale_time, 'total_items': len(sale_items), 'subtotal': subtotal,
+                    'discount': discount, 'discount_type': discount_type, 'tax': tax,
+                    'tax_rate': tax_rate, 'grand_total': grand_total,
+                    'payment_method': payment_method, 'payment_status': payment_status,
+                    'notes': notes, 'return_fee_type': return_fee_type,
+                    'return_fee_amount': return_fee_amount
+                }
+                if self._grand_total_generated:
+                    # SQLite derives grand_total from subtotal, discount and tax
+                    sql, columns = self.INSERT_SALE_COMPUTED_TOTAL_SQL, self.SALE_COLUMNS_COMPUTED_TOTAL
+                else:
+                    sql, columns = self.INSERT_SALE_SQL, self.SALE_COLUMNS
+                cursor.execute(sql, tuple(header[col] for col in columns))
+                # Verify insertion before any item or stock is written
+                if cursor.rowcount != 1:
+                    conn.rollback()
+                    return False, "Sale verification failed"
                 
                 sale_id = cursor.lastrowid
                 
-                # Insert sale items with profit calculations
-                for item in sale_items:
-                    profit = item['profit']
-                    profit_percentage = (profit / item['total_cost'] * 100) if item['total_cost'] > 0 else 0
-                    
-                    cursor.execute('''
-                        INSERT INTO sale_items (
-                            sale_id, bill_number, item_id, display_name, quantity,
-                            unit_price, total_price, unit_cost, total_cost,
-                            profit, profit_percentage, inventory_type, database_source
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        sale_id, bill_number, item['item_id'], item['display_name'], item['quantity'],
-                        item['price'], item['total_price'], item['cost'], item['total_cost'],
-                        profit, profit_percentage, item['inventory_type'], item['database']
-                    ))
+                # Insert sale items with profit calculations: one multi-row
+                # INSERT per full SALE_ITEM_ROWS_PER_INSERT chunk, then one
+                # executemany for the rest
+                step = self.SALE_ITEM_ROWS_PER_INSERT
+                full = len(item_rows) - len(item_rows) % step
+                for start in range(0, full, step):
+                    cursor.execute(self.INSERT_SALE_ITEMS_SQL,
+                                   [value for row in item_rows[start:start + step]
+                                    for value in (sale_id, *row)])
+                cursor.executemany(self.INSERT_SALE_ITEM_SQL,
+                                   ((sale_id, *row) for row in item_rows[full:]))
                 
-                # Update stock for each item
-                stock_updates = []
-                for item in sale_items:
-                    if not self.update_stock(item['database'], item['item_id'], item['quantity']):
-                        # Record failed updates but continue with transaction
-                        stock_updates.append(f"Failed to update stock for {item['item_id']}")
+                # Update stock: one executemany and one commit per database.
+                # Record failed updates but continue with transaction
+                stock_updates = [f"Failed to update stock for {item_id}"
+                                 for item_id in self.batch_update_stock(stock_changes)]
                 
                 # Commit transaction
                 conn.commit()
                 
-                # Verify insertion
-                cursor.execute("SELECT COUNT(*) FROM sales WHERE bill_number = ?", (bill_number,))
-                if cursor.fetchone()[0] == 1:
-                    if stock_updates:
-                        return True, f"Sale saved with warnings: {', '.join(stock_updates)}"
-                    else:
-                        return True, "Sale saved successfully"
+                if stock_updates:
+                    return True, f"Sale saved with warnings: {', '.join(stock_updates)}"
                 else:
-                    return False, "Sale verification failed"
+                    return True, "Sale saved successfully"
                     
             except sqlite3.IntegrityError as e:
                 # Rollback on integrity error (duplicate bill number)
@@ -910,58 +1346,198 @@ class EnhancedDatabaseManager:
             print(f"Error in save_sale: {e}")
             return False, f"Database error: {str(e)}"
     
+    # Stock decrement per database: (quantity_sold, item_id)
+    # One fixed statement per database, so sqlite3's statement cache
+    # reuses the prepared UPDATE for every single-item change
+    STOCK_UPDATE_SQL = {
+        'inventory': "UPDATE Inventory SET quantity = quantity - ? WHERE item_id = ?",
+        'bearings': "UPDATE bearings SET quantity = quantity - ? WHERE bearing_id = ?",
+        'seals': "UPDATE seals SET qty = qty - ? WHERE item_id = ?",
+    }
+    # (table, stock column, id column) for the merged multi-item UPDATE
+    STOCK_COLUMNS = {
+        'inventory': ('Inventory', 'quantity', 'item_id'),
+        'bearings': ('bearings', 'quantity', 'bearing_id'),
+        'seals': ('seals', 'qty', 'item_id'),
+    }
+    # Items per merged UPDATE: three bound parameters each, under the 999 limit
+    STOCK_ITEMS_PER_UPDATE = 999 // 3
+    
+    @classmethod
+    def merged_stock_update_sql(cls, database):
+        """UPDATE taking STOCK_ITEMS_PER_UPDATE items' stock down in one statement
+        
+        Always that many items, so the text (and the prepared statement)
+        is the same every time. Parameters: item_id, quantity_sold for
+        each item, then the item_ids again.
+        """
+        table, stock, key = cls.STOCK_COLUMNS[database]
+        count = cls.STOCK_ITEMS_PER_UPDATE
+        cases = " ".join(["WHEN ? THEN ?"] * count)
+        return (f"UPDATE {table} SET {stock} = {stock} - CASE {key} {cases} ELSE 0 END "
+                f"WHERE {key} IN ({', '.join('?' * count)})")
+    
     def update_stock(self, database, item_id, quantity_sold):
         """Update stock quantity with proper error handling"""
-        try:
-            if database not in self.connections:
-                return False
-            
-            conn = self.connections[database]
-            cursor = conn.cursor()
-            
-            if database == 'inventory':
-                cursor.execute("UPDATE Inventory SET quantity = quantity - ? WHERE item_id = ?", 
-                             (quantity_sold, item_id))
-            elif database == 'bearings':
-                cursor.execute("UPDATE bearings SET quantity = quantity - ? WHERE bearing_id = ?", 
-                             (quantity_sold, item_id))
-            elif database == 'seals':
-                cursor.execute("UPDATE seals SET qty = qty - ? WHERE item_id = ?", 
-                             (quantity_sold, item_id))
-            
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error updating stock for {item_id}: {e}")
-            return False
+        return not self.batch_update_stock({database: [(quantity_sold, item_id)]})
+    
+    def batch_update_stock(self, changes):
+        """Apply {database: [(quantity_sold, item_id), ...]} stock changes
+        
+        Each database's items are updated in one transaction (one commit):
+        one merged UPDATE per full STOCK_ITEMS_PER_UPDATE chunk, then one
+        executemany of STOCK_UPDATE_SQL for the rest.
+        Returns the item_ids that could not be updated.
+        """
+        self.wait_for_catalog()
+        failed = []
+        for database, pairs in changes.items():
+            sql = self.STOCK_UPDATE_SQL.get(database)
+            conn = self.connections.get(database)
+            if sql is None or conn is None:
+                failed.extend(item_id for _, item_id in pairs)
+                continue
+            # An item sold on several lines gets one WHEN with the total
+            totals = {}
+            for quantity_sold, item_id in pairs:
+                totals[item_id] = totals.get(item_id, 0) + quantity_sold
+            sold = list(totals.items())
+            try:
+                step = self.STOCK_ITEMS_PER_UPDATE
+                full = len(sold) - len(sold) % step
+                with self.connection_locks[database], conn:
+                    for start in range(0, full, step):
+                        chunk = sold[start:start + step]
+                        conn.execute(self.merged_stock_update_sql(database),
+                                     [value for pair in chunk for value in pair]
+                                     + [item_id for item_id, _ in chunk])
+                    conn.executemany(sql, ((quantity_sold, item_id)
+                                           for item_id, quantity_sold in sold[full:]))
+            except Exception as e:
+                log.warning("Error updating stock in %s: %s", database, e)
+                failed.extend(item_id for _, item_id in pairs)
+                continue
+            with self.catalog_lock:
+                for item_id, quantity_sold in sold:
+                    self.forget_item(item_id)
+                    item = self._items_by_key.get((database, str(item_id).upper()))
+                    if item is not None:
+                        item.quantity -= quantity_sold
+        return failed
     
     def close_all(self):
         """Close all database connections"""
+        self.flush_settings()
+        self.wait_for_catalog()
         for db_name, conn in self.connections.items():
             if conn:
                 try:
-                    conn.close()
+                    with self.connection_locks[db_name]:
+                        conn.close()
                     print(f"Closed connection to {db_name}")
                 except:
                     pass
 
 # ========== ITEM SEARCH DIALOG ==========
+class SearchItemsModel(QAbstractTableModel):
+    """Read-only table model over a list of CatalogItems"""
+    HEADERS = ("S.No.", "Item ID", "Item Name", "Price", "Stock")
+    
+    _CENTER = Qt.AlignmentFlag.AlignCenter
+    _LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+    _RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+    ALIGNMENTS = (_CENTER, _LEFT, _LEFT, _RIGHT, _CENTER)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+    
+    def set_rows(self, rows):
+        """Show rows (kept by reference, not copied)"""
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            item = self.rows[index.row()]
+            if column == 0:
+                return str(index.row() + 1)
+            if column == 1:
+                return item.item_id
+            if column == 2:
+                return item.display_name
+            if column == 3:
+                return f"Rs{item.price:.2f}"
+            return str(item.quantity)
+        if role == Qt.ItemDataRole.UserRole:
+            return self.rows[index.row()].item_id
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.ALIGNMENTS[column]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class CatalogLoaderSignals(QObject):
+    loaded = pyqtSignal(list)
+
+
+class CatalogLoader(QRunnable):
+    """Runs db_manager.get_all_items on a pool thread and emits the items
+    
+    Started through db_manager.load_catalog, so search dialogs opened while
+    it runs share it; done is set once the manager is free again.
+    """
+    
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager
+        self.signals = CatalogLoaderSignals()
+        self.done = threading.Event()
+    
+    def run(self):
+        try:
+            items = self.db_manager.get_all_items()
+        except Exception as e:
+            log.warning("Could not load the item catalog: %s", e)
+            items = []
+        self.items = items
+        self.done.set()
+        self.signals.loaded.emit(items)
+
+
 class ItemSearchDialog(QDialog):
     item_selected = pyqtSignal(str)
     
+    # Typing restarts this delay; the table is filtered once it passes
+    FILTER_DELAY_MS = 120
+    
     def __init__(self, db_manager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.items = []
+        self.items_loaded = False
         self.setWindowTitle("Search Items - Enter to Select | F1 to Close")
         self.setGeometry(200, 100, 1000, 600)
         
         self.setup_ui()
         self.load_items()
-
-        # Set initial selection to first row
-        if self.items_table.rowCount() > 0:
-            self.items_table.setCurrentCell(0, 0)
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -978,24 +1554,29 @@ class ItemSearchDialog(QDialog):
         self.stock_checkbox = QCheckBox()
         self.stock_checkbox.toggled.connect(self.filter_items)
         filter_layout.addWidget(self.stock_checkbox)
+        filter_layout.addStretch()
+        self.result_count_label = QLabel()
+        filter_layout.addWidget(self.result_count_label)
         
         # Enhanced search input
         search_layout = QHBoxLayout()
         search_label = QLabel("Search:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by ID, name, or any keywords...")
-        self.search_input.textChanged.connect(self.filter_items)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.filter_items)
+        self.search_input.textChanged.connect(self._filter_timer.start)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
         layout.insertLayout(1, filter_layout)
         
         # Convert to TABLE view instead of list
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(5)
-        self.items_table.setHorizontalHeaderLabels([
-            "S.No.", "Item ID", "Item Name", "Price", "Stock"
-        ])
+        self.items_model = SearchItemsModel(self)
+        self.items_table = QTableView()
+        self.items_table.setModel(self.items_model)
         
         # HIDE VERTICAL HEADER (row numbers) - LIKE BEARINGS.PY
         self.items_table.verticalHeader().setVisible(False)
@@ -1013,8 +1594,8 @@ class ItemSearchDialog(QDialog):
         self.items_table.setColumnWidth(4, 80)
         
         self.items_table.setAlternatingRowColors(True)
-        self.items_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.items_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.items_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.items_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.items_table.doubleClicked.connect(self.select_item)
         self.items_table.keyPressEvent = self.table_keyPressEvent
         
@@ -1028,46 +1609,60 @@ class ItemSearchDialog(QDialog):
         layout.addWidget(button_box)
         
     def load_items(self):
-        self.items = self.db_manager.get_all_items()
-        self.update_table()
+        """Show the catalog, reading it in the background unless it is cached"""
+        # Checking the cache would wait on a load already in flight
+        if not self.db_manager.catalog_loading() and self.db_manager.items_cached():
+            self.on_items_loaded(self.db_manager.get_all_items())
+            return
+        self.result_count_label.setText("Loading items...")
+        loader = self.db_manager.load_catalog()
+        loader.signals.loaded.connect(self.on_items_loaded)
+        # It may have finished before the connection was made
+        if loader.done.is_set():
+            self.on_items_loaded(loader.items)
+    
+    def on_items_loaded(self, items):
+        if self.items_loaded:
+            return
+        self.items_loaded = True
+        self.items = items
+        # Apply whatever was typed while the items were loading
+        self.filter_items()
+        # Set initial selection to first row
+        if self.row_count() > 0:
+            self.set_current_row(0)
         
     def update_table(self, items=None):
         """Update table with items - SIMILAR TO BEARINGS.PY APPROACH"""
         display_items = items if items is not None else self.items
-        self.items_table.setRowCount(len(display_items))
-        
-        for row, item in enumerate(display_items):
-            # S.No.
-            sno_item = QTableWidgetItem(str(row + 1))
-            sno_item.setFlags(sno_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            sno_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.items_table.setItem(row, 0, sno_item)
-            
-            # Item ID
-            id_item = QTableWidgetItem(item['item_id'])
-            id_item.setData(Qt.ItemDataRole.UserRole, item['item_id'])
-            id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.items_table.setItem(row, 1, id_item)
-            
-            # Item Name
-            name_item = QTableWidgetItem(item['display_name'])
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.items_table.setItem(row, 2, name_item)
-            
-            # Price
-            price_item = QTableWidgetItem(f"Rs{item['price']:.2f}")
-            price_item.setFlags(price_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-            self.items_table.setItem(row, 3, price_item)
-            
-            # Stock
-            stock_item = QTableWidgetItem(str(item['quantity']))
-            stock_item.setFlags(stock_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.items_table.setItem(row, 4, stock_item)
+        current = self.current_row()
+        # Every match is kept: the view only asks the model for rows it paints
+        self.items_model.set_rows(display_items)
+        self.result_count_label.setText(f"Showing {len(display_items)} of {len(self.items)} items")
+        # Keep a current row, as the table did before the model reset
+        if current >= 0 and display_items:
+            self.set_current_row(min(current, len(display_items) - 1))
+    
+    def row_count(self):
+        return self.items_model.rowCount()
+    
+    def current_row(self):
+        return self.items_table.currentIndex().row()
+    
+    def set_current_row(self, row):
+        self.items_table.selectRow(row)
+        
+    def flush_filter(self):
+        """Apply a search still waiting on the typing delay"""
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self.filter_items()
         
     def filter_items(self):
         """Enhanced search with multiple filters"""
+        if not self.items_loaded:
+            # Typed while loading: applied by on_items_loaded
+            return
         search_text = self.search_input.text().lower().strip()
         type_filter = self.type_filter.currentText()
         in_stock_only = self.stock_checkbox.isChecked()
@@ -1075,24 +1670,23 @@ class ItemSearchDialog(QDialog):
         # Split search into keywords
         keywords = search_text.split() if search_text else []
         
+        # The catalog's FTS index narrows the items down; the checks below still run
+        positions = self.db_manager.match_items(self.items, keywords)
+        items = self.items if positions is None else [self.items[i] for i in positions]
+        
         filtered = []
-        for item in self.items:
+        for item in items:
             # Type filter
-            if type_filter != "All" and item['inventory_type'] != type_filter:
+            if type_filter != "All" and item.inventory_type != type_filter:
                 continue
                 
             # Stock filter
-            if in_stock_only and item['quantity'] <= 0:
+            if in_stock_only and item.quantity <= 0:
                 continue
                 
             # Keyword search
             if keywords:
-                searchable_text = (
-                    f"{item['item_id']} "
-                    f"{item['display_name']} "
-                    f"{item['inventory_type']}"
-                ).lower()
-                
+                searchable_text = item.search
                 if not all(keyword in searchable_text for keyword in keywords):
                     continue
                     
@@ -1102,14 +1696,17 @@ class ItemSearchDialog(QDialog):
         
     def select_item(self):
         """Get selected item from table"""
-        selected_row = self.items_table.currentRow()
+        selected_row = self.current_row()
         if selected_row >= 0:
-            item_id = self.items_table.item(selected_row, 1).data(Qt.ItemDataRole.UserRole)
+            item_id = self.items_model.index(selected_row, 1).data(Qt.ItemDataRole.UserRole)
             self.item_selected.emit(item_id)
             self.accept()
         
     def keyPressEvent(self, event):
         """Handle keyboard navigation - SIMPLIFIED and FIXED"""
+        # Navigate and select in the table for the text typed so far
+        self.flush_filter()
+        
         # Handle Escape and F1 to close
         if event.key() == Qt.Key.Key_Escape or event.key() == Qt.Key.Key_F1:
             self.reject()
@@ -1121,7 +1718,7 @@ class ItemSearchDialog(QDialog):
                 # If typing in search, don't do anything - let user continue
                 event.ignore()
                 return
-            elif self.items_table.rowCount() > 0:
+            elif self.row_count() > 0:
                 self.select_item()
                 return
         
@@ -1129,11 +1726,11 @@ class ItemSearchDialog(QDialog):
         elif event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down, Qt.Key.Key_Left, Qt.Key.Key_Right):
             # If search has focus, move focus to table
             if self.search_input.hasFocus():
-                if self.items_table.rowCount() > 0:
+                if self.row_count() > 0:
                     self.items_table.setFocus()
                     # Select first row if none selected
-                    if self.items_table.currentRow() < 0:
-                        self.items_table.setCurrentCell(0, 0)
+                    if self.current_row() < 0:
+                        self.set_current_row(0)
                     # Now process the arrow key in the table
                     self.items_table.keyPressEvent(event)
             else:
@@ -1143,31 +1740,31 @@ class ItemSearchDialog(QDialog):
         
         # Handle PageUp/PageDown
         elif event.key() in (Qt.Key.Key_PageUp, Qt.Key.Key_PageDown):
-            if self.items_table.rowCount() > 0:
+            if self.row_count() > 0:
                 self.items_table.setFocus()
                 self.items_table.keyPressEvent(event)
             return
         
         # Handle Home/End
         elif event.key() == Qt.Key.Key_Home:
-            if self.items_table.rowCount() > 0:
+            if self.row_count() > 0:
                 self.items_table.setFocus()
-                self.items_table.setCurrentCell(0, 0)
+                self.set_current_row(0)
             return
         
         elif event.key() == Qt.Key.Key_End:
-            if self.items_table.rowCount() > 0:
+            if self.row_count() > 0:
                 self.items_table.setFocus()
-                self.items_table.setCurrentCell(self.items_table.rowCount() - 1, 0)
+                self.set_current_row(self.row_count() - 1)
             return
         
         # Handle Tab/Backtab - standard focus navigation
         elif event.key() == Qt.Key.Key_Tab:
             if self.search_input.hasFocus():
-                if self.items_table.rowCount() > 0:
+                if self.row_count() > 0:
                     self.items_table.setFocus()
-                    if self.items_table.currentRow() < 0:
-                        self.items_table.setCurrentCell(0, 0)
+                    if self.current_row() < 0:
+                        self.set_current_row(0)
                 else:
                     # Move to next widget in dialog
                     super().keyPressEvent(event)
@@ -1231,18 +1828,18 @@ class ItemSearchDialog(QDialog):
             
             # Handle arrow keys in table
             elif event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down, Qt.Key.Key_Left, Qt.Key.Key_Right):
-                # Call the parent QTableWidget's keyPressEvent to handle navigation
-                QTableWidget.keyPressEvent(self.items_table, event)
+                # Call the parent QTableView's keyPressEvent to handle navigation
+                QTableView.keyPressEvent(self.items_table, event)
                 return
             
             # Handle PageUp/PageDown
             elif event.key() in (Qt.Key.Key_PageUp, Qt.Key.Key_PageDown):
-                QTableWidget.keyPressEvent(self.items_table, event)
+                QTableView.keyPressEvent(self.items_table, event)
                 return
             
             # Handle Home/End
             elif event.key() in (Qt.Key.Key_Home, Qt.Key.Key_End):
-                QTableWidget.keyPressEvent(self.items_table, event)
+                QTableView.keyPressEvent(self.items_table, event)
                 return
             
             # For printable characters, move focus to search box
@@ -1258,7 +1855,7 @@ class ItemSearchDialog(QDialog):
             
             # For all other keys, use default behavior
             else:
-                QTableWidget.keyPressEvent(self.items_table, event)
+                QTableView.keyPressEvent(self.items_table, event)
                 
         except Exception as e:
             print(f"Error in table_keyPressEvent: {e}")
@@ -1270,8 +1867,287 @@ class ItemSearchDialog(QDialog):
         super().showEvent(event)
         self.search_input.setFocus()
 
+# ========== SALE ITEMS ==========
+# SaleItem fields shown on the invoice, in bill row order
+_bill_row_fields = operator.attrgetter('display_name', 'quantity', 'price', 'total_price')
+
+@dataclass(slots=True)
+class SaleItem:
+    """One line of the sale being rung up"""
+    item_id: str
+    display_name: str
+    quantity: int
+    price: float
+    cost: float
+    total_price: float
+    total_cost: float
+    profit: float
+    inventory_type: str
+    database: str
+    available_stock: int
+    
+    @classmethod
+    def from_lookup(cls, item_details):
+        """New line (quantity 1) for an item returned by search_item_by_id"""
+        price = item_details["price"]
+        cost = item_details["cost"]
+        return cls(
+            item_id=item_details["item_id"],
+            display_name=item_details["display_name"],
+            quantity=1,
+            price=price,
+            cost=cost,
+            total_price=price,
+            total_cost=cost,
+            profit=price - cost,
+            inventory_type=item_details["inventory_type"],
+            database=item_details["database"],
+            available_stock=item_details["quantity"]
+        )
+    
+    def to_dict(self):
+        """Plain dict of the fields, for code expecting the old dict rows
+        (e.g. invoice_printer.prepare_bill_data_from_sale)"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+@dataclass(slots=True)
+class CatalogItem:
+    """One stock item as listed by get_all_items for the search dialog"""
+    item_id: str
+    display_name: str
+    quantity: int
+    price: float
+    cost: float
+    inventory_type: str
+    database: str
+    # Lower-cased text the search dialog matches keywords against
+    search: str = field(init=False)
+    
+    def __post_init__(self):
+        self.search = f"{self.item_id} {self.display_name} {self.inventory_type}".lower()
+
+class SaleItemsModel(QAbstractTableModel):
+    """Table model reading straight from the sales window's sale_items list
+    
+    Qty and Price are editable; edits are not applied here but reported
+    through quantity_edited / price_edited, so the window can check stock
+    and recalculate before changing the item.
+    """
+    quantity_edited = pyqtSignal(int, int)
+    price_edited = pyqtSignal(int, float)
+    
+    HEADERS = ("S.No.", "Item ID", "Item Name", "Stock", "Qty", "Price", "Cost", "Total")
+    QTY_COLUMN = 4
+    PRICE_COLUMN = 5
+    TOTAL_COLUMN = 7
+    
+    _CENTER = Qt.AlignmentFlag.AlignCenter
+    _LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+    _RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+    ALIGNMENTS = (_CENTER, _LEFT, _LEFT, _CENTER, _CENTER, _RIGHT, _RIGHT, _RIGHT)
+    # Background of the editable cells (the colour the cell spinboxes had)
+    EDITABLE_BACKGROUND = QColor("#EFECE3")
+    
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self.items = items
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            item = self.items[index.row()]
+            if column == 0:
+                return str(index.row() + 1)
+            if column == 1:
+                return item.item_id
+            if column == 2:
+                return item.display_name
+            if column == 3:
+                return str(item.available_stock)
+            if column == self.QTY_COLUMN:
+                return str(item.quantity)
+            if column == self.PRICE_COLUMN:
+                return f"{item.price:.2f}"
+            if column == 6:
+                return f"{item.cost:.2f}"
+            if column == 7:
+                return f"{item.total_price:.2f}"
+            return None
+        if role == Qt.ItemDataRole.EditRole:
+            item = self.items[index.row()]
+            if column == self.QTY_COLUMN:
+                return item.quantity
+            if column == self.PRICE_COLUMN:
+                return item.price
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.ALIGNMENTS[column]
+        if role == Qt.ItemDataRole.BackgroundRole and column in (self.QTY_COLUMN, self.PRICE_COLUMN):
+            return self.EDITABLE_BACKGROUND
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        if index.column() == self.QTY_COLUMN:
+            self.quantity_edited.emit(index.row(), int(value))
+            return True
+        if index.column() == self.PRICE_COLUMN:
+            self.price_edited.emit(index.row(), float(value))
+            return True
+        return False
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() in (self.QTY_COLUMN, self.PRICE_COLUMN):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+    
+    def append_item(self, item):
+        """Append item to the list and insert its row"""
+        row = len(self.items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items.append(item)
+        self.endInsertRows()
+        return row
+    
+    def remove_item(self, row):
+        """Remove the item at row and renumber the rows below it"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self.items.pop(row)
+        self.endRemoveRows()
+        if row < len(self.items):
+            self.dataChanged.emit(self.index(row, 0), self.index(len(self.items) - 1, 0))
+        return item
+    
+    def clear(self):
+        """Remove all items"""
+        self.beginResetModel()
+        self.items.clear()
+        self.endResetModel()
+    
+    def refresh(self):
+        """Redraw every row after the items were changed in place"""
+        if self.items:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(self.items) - 1, len(self.HEADERS) - 1),
+                [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole]
+            )
+    
+    def total_changed(self, row):
+        """Redraw the Total cell of row"""
+        index = self.index(row, self.TOTAL_COLUMN)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+    
+    def cell_changed(self, row, column):
+        """Redraw one cell; an editor open on it is reset to the new value"""
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+
+class SaleItemEditDelegate(QStyledItemDelegate):
+    """Spinbox editors for the Qty and Price cells, created only while one is edited
+    
+    The editor commits on every value change, so totals follow as the user
+    types. enter_pressed(row, column) is emitted for Enter in an editor.
+    """
+    enter_pressed = pyqtSignal(int, int)
+    
+    def createEditor(self, parent, option, index):
+        column = index.column()
+        if column == SaleItemsModel.QTY_COLUMN:
+            editor = QSpinBox(parent)
+            editor.setRange(1, 10000)
+            editor.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        elif column == SaleItemsModel.PRICE_COLUMN:
+            editor = QDoubleSpinBox(parent)
+            editor.setRange(0.01, 100000.00)
+            editor.setDecimals(2)
+            editor.setAlignment(Qt.AlignmentFlag.AlignRight)
+        else:
+            return super().createEditor(parent, option, index)
+        editor.valueChanged.connect(self.commit_editor)
+        editor.cell = QPersistentModelIndex(index)
+        return editor
+    
+    @pyqtSlot()
+    def commit_editor(self):
+        """Write the sending editor's value to the model"""
+        self.commitData.emit(self.sender())
+    
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        # Leave the text alone while it already shows the model value, so
+        # redraws caused by the editor's own commits don't disturb typing
+        if editor.value() != value:
+            editor.blockSignals(True)
+            editor.setValue(value)
+            editor.blockSignals(False)
+    
+    def eventFilter(self, editor, event):
+        if (event.type() == QEvent.Type.KeyPress
+                and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter)
+                and hasattr(editor, "cell")):
+            row, column = editor.cell.row(), editor.cell.column()
+            self.commitData.emit(editor)
+            self.closeEditor.emit(editor, QAbstractItemDelegate.EndEditHint.NoHint)
+            self.enter_pressed.emit(row, column)
+            return True
+        return super().eventFilter(editor, event)
+
+# ========== STYLESHEET ==========
+SALES_QSS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sales.qss")
+
+
+@functools.lru_cache(maxsize=None)
+def sales_stylesheet():
+    """Contents of sales.qss, read once per process"""
+    try:
+        with open(SALES_QSS_FILE, encoding="utf-8") as f:
+            return f.read()
+    except OSError as e:
+        log.warning("Error loading stylesheet %s: %s", SALES_QSS_FILE, e)
+        return ""
+
+
 # ========== ENHANCED SALES WINDOW ==========
 class EnhancedSalesWindow(QMainWindow):
+    # (profit label, profit percent label) styles keyed by profit >= 0
+    PROFIT_STYLES = {
+        True: ("font-weight: bold; color: #27ae60; font-size: 12px;", "font-weight: bold; color: #27ae60;"),
+        False: ("font-weight: bold; color: #e74c3c; font-size: 12px;", "font-weight: bold; color: #e74c3c;"),
+    }
+    
+    # Window shortcuts: (action text, key sequence, handler method name)
+    SHORTCUTS = (
+        ("Item Search", "F1", "show_item_search"),
+        ("New Bill", "F2", "new_bill"),
+        ("Print Invoice", "F9", "print_invoice"),
+        ("Preview Invoice", "F8", "preview_invoice"),
+        ("Save PDF", "F7", "save_pdf_invoice"),
+        ("Save Sale", "Ctrl+S", "save_sale"),
+        ("Remove Item", "Delete", "remove_selected_item"),
+        ("Clear Sale", "Ctrl+C", "clear_sale"),
+        ("Focus Item ID", "Ctrl+I", "focus_item_id"),
+        ("Toggle Cost/Profit", "Ctrl+H", "toggle_cost_profit"),
+        # Table navigation
+        ("Focus Quantity", "Ctrl+Q", "focus_on_current_quantity"),
+        ("Focus Price", "Ctrl+P", "focus_on_current_price"),
+    )
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.sale_items = []
@@ -1279,11 +2155,22 @@ class EnhancedSalesWindow(QMainWindow):
         self.bill_number = "00001"
         self.cost_visible = True
         self.profit_visible = True
+        self.profit_positive = None
+        self.invoice_action_running = False
         self.is_closing = False
+        self.datetime_date = None
+        self.datetime_date_text = ""
         
         self.db_manager = EnhancedDatabaseManager()
         self.load_bill_number()
         
+        # calculate_totals only schedules a recalculation; a burst of edits
+        # (held arrow key, wheel) is refreshed once per event-loop turn
+        self._totals_timer = QTimer(self)
+        self._totals_timer.setSingleShot(True)
+        self._totals_timer.setInterval(0)
+        self._totals_timer.timeout.connect(self.refresh_totals)
+        
         self.setup_ui()
         self.setup_shortcuts()
         self.start_timer()
@@ -1310,6 +2197,10 @@ class EnhancedSalesWindow(QMainWindow):
     
     def setup_ui(self):
         central_widget = QWidget()
+        # Table, editor and action button styles; set before the children
+        # are created so each is polished once. On the central widget, so
+        # they follow it when EnhancedSalesWidget embeds it in the dashboard
+        central_widget.setStyleSheet(sales_stylesheet())
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
         layout.setSpacing(3)
@@ -1421,16 +2312,22 @@ class EnhancedSalesWindow(QMainWindow):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(1, 1, 1, 1)
         
-        self.sales_table = QTableWidget()
+        # 8 columns (removed profit column from display), read from sale_items
+        self.sales_model = SaleItemsModel(self.sale_items, self)
+        self.sales_table = QTableView()
+        self.sales_table.setObjectName("salesTable")
+        self.sales_table.setModel(self.sales_model)
+        self.sales_model.quantity_edited.connect(self.update_item_quantity)
+        self.sales_model.price_edited.connect(self.update_item_price)
         
-        # 8 columns (removed profit column from display)
-        self.sales_table.setColumnCount(8)
-        self.sales_table.setHorizontalHeaderLabels([
-            "S.No.", "Item ID", "Item Name", "Stock", "Qty", "Price", "Cost", "Total"
-        ])
+        # Qty/Price spinboxes exist only while a cell is being edited
+        self.sales_delegate = SaleItemEditDelegate(self.sales_table)
+        self.sales_delegate.enter_pressed.connect(self.handle_cell_enter)
+        self.sales_table.setItemDelegate(self.sales_delegate)
         
-        # HIDE VERTICAL HEADER
+        # HIDE VERTICAL HEADER (fixed row heights, no per-row size computation)
         self.sales_table.verticalHeader().setVisible(False)
+        self.sales_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
         # SET CUSTOM COLUMN WIDTHS - FIXED VALUES
         header = self.sales_table.horizontalHeader()
@@ -1454,35 +2351,12 @@ class EnhancedSalesWindow(QMainWindow):
         # Set alternating row colors with specific colors
         self.sales_table.setAlternatingRowColors(True)
         
-        # Apply stylesheet for better selection and alternating colors
-        table_style = """
-            QTableWidget {
-                alternate-background-color: #f8f9fa;
-                background-color: white;
-                gridline-color: #e0e0e0;
-                border: 1px solid #d0d0d0;
-            }
-            QTableWidget::item {
-                padding: 3px;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            QHeaderView::section {
-                background-color: #2c3e50;
-                color: white;
-                padding: 5px;
-                border: 1px solid #34495e;
-                font-weight: bold;
-            }
-        """
-        self.sales_table.setStyleSheet(table_style)
-        
         # Selection behavior
-        self.sales_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.sales_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.sales_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.sales_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.sales_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.sales_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.SelectedClicked
+        )
         
         table_layout.addWidget(self.sales_table)
         
@@ -1609,26 +2483,6 @@ class EnhancedSalesWindow(QMainWindow):
         buttons_grid = QGridLayout()
         buttons_grid.setSpacing(3)
         
-        btn_style = """
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 11px;
-                min-height: 28px;
-                min-width: 90px;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #1c6ca0;
-            }
-        """
-        
         # UPDATED BUTTONS - Using EnhancedIntegratedPrintingSystem
         buttons = [
             ("Print Invoice (F9)", self.print_invoice, 0, 0),
@@ -1649,18 +2503,18 @@ class EnhancedSalesWindow(QMainWindow):
                 text, handler, row, col, rowspan, colspan = btn_info
                 
             btn = QPushButton(text)
-            btn.setStyleSheet(btn_style)
+            btn.setObjectName("actionButton")
             btn.clicked.connect(handler)
             
-            # Style specific buttons
+            # Colour specific buttons (see sales.qss)
             if "New Bill" in text:
-                btn.setStyleSheet(btn_style.replace("#3498db", "#27ae60"))
+                btn.setProperty("role", "newBill")
             elif "Clear Sale" in text:
-                btn.setStyleSheet(btn_style.replace("#3498db", "#e67e22"))
+                btn.setProperty("role", "clearSale")
             elif "Close" in text:
-                btn.setStyleSheet(btn_style.replace("#3498db", "#e74c3c"))
+                btn.setProperty("role", "close")
             elif "Preview" in text or "Save PDF" in text:
-                btn.setStyleSheet(btn_style.replace("#3498db", "#9b59b6"))
+                btn.setProperty("role", "document")
                 
             buttons_grid.addWidget(btn, row, col, rowspan, colspan)
         
@@ -1672,6 +2526,7 @@ class EnhancedSalesWindow(QMainWindow):
         
         return summary_frame
 
+    @pyqtSlot(str)
     def on_return_fee_type_changed(self, fee_type):
         """Handle return fee type change"""
         if fee_type == "Per Page":
@@ -1711,184 +2566,27 @@ class EnhancedSalesWindow(QMainWindow):
         self.status_bar.addPermanentWidget(shortcut_label)
     
     def setup_shortcuts(self):
-        search_action = QAction("Item Search", self)
-        search_action.setShortcut(QKeySequence("F1"))
-        search_action.triggered.connect(self.show_item_search)
-        self.addAction(search_action)
-        
-        new_bill_action = QAction("New Bill", self)
-        new_bill_action.setShortcut(QKeySequence("F2"))
-        new_bill_action.triggered.connect(self.new_bill)
-        self.addAction(new_bill_action)
-        
-        # Print invoice shortcut
-        print_action = QAction("Print Invoice", self)
-        print_action.setShortcut(QKeySequence("F9"))
-        print_action.triggered.connect(self.print_invoice)  # Changed from print_professional_invoice
-        self.addAction(print_action)
-        
-        # Preview invoice shortcut
-        preview_action = QAction("Preview Invoice", self)
-        preview_action.setShortcut(QKeySequence("F8"))
-        preview_action.triggered.connect(self.preview_invoice)
-        self.addAction(preview_action)
-        
-        # Save PDF shortcut
-        pdf_action = QAction("Save PDF", self)
-        pdf_action.setShortcut(QKeySequence("F7"))
-        pdf_action.triggered.connect(self.save_pdf_invoice)
-        self.addAction(pdf_action)
-        
-        save_action = QAction("Save Sale", self)
-        save_action.setShortcut(QKeySequence("Ctrl+S"))
-        save_action.triggered.connect(self.save_sale)
-        self.addAction(save_action)
-        
-        remove_action = QAction("Remove Item", self)
-        remove_action.setShortcut(QKeySequence("Delete"))
-        remove_action.triggered.connect(self.remove_selected_item)
-        self.addAction(remove_action)
-        
-        clear_sale_action = QAction("Clear Sale", self)
-        clear_sale_action.setShortcut(QKeySequence("Ctrl+C"))
-        clear_sale_action.triggered.connect(self.clear_sale)
-        self.addAction(clear_sale_action)
-        
-        focus_item_action = QAction("Focus Item ID", self)
-        focus_item_action.setShortcut(QKeySequence("Ctrl+I"))
-        focus_item_action.triggered.connect(lambda: self.item_id_input.setFocus())
-        self.addAction(focus_item_action)
-        
-        toggle_cost_profit_action = QAction("Toggle Cost/Profit", self)
-        toggle_cost_profit_action.setShortcut(QKeySequence("Ctrl+H"))
-        toggle_cost_profit_action.triggered.connect(self.toggle_cost_profit)
-        self.addAction(toggle_cost_profit_action)
-        
-        # Table navigation shortcuts
-        quantity_focus_action = QAction("Focus Quantity", self)
-        quantity_focus_action.setShortcut(QKeySequence("Ctrl+Q"))
-        quantity_focus_action.triggered.connect(self.focus_on_current_quantity)
-        self.addAction(quantity_focus_action)
-        
-        price_focus_action = QAction("Focus Price", self)
-        price_focus_action.setShortcut(QKeySequence("Ctrl+P"))
-        price_focus_action.triggered.connect(self.focus_on_current_price)
-        self.addAction(price_focus_action)
+        actions = []
+        for text, key, handler in self.SHORTCUTS:
+            action = QAction(text, self)
+            action.setShortcut(QKeySequence(key))
+            action.triggered.connect(getattr(self, handler))
+            actions.append(action)
+        self.addActions(actions)
+    
+    @pyqtSlot()
+    def focus_item_id(self):
+        """Move focus to the Item ID input"""
+        self.item_id_input.setFocus()
 
     def update_sale_items_table(self):
-        """UPDATE TABLE WITH PROPER ALIGNMENT"""
-        self.sales_table.setRowCount(len(self.sale_items))
-        total = 0
-        
-        # Define spinbox styles
-        spinbox_style = """
-            QSpinBox, QDoubleSpinBox {
-                border: 1px solid #d0d0d0;
-                border-radius: 2px;
-                padding: 2px;
-                background-color: #EFECE3;
-                selection-background-color: #3498db;
-            }
-            QSpinBox:focus, QDoubleSpinBox:focus {
-                border: 1px solid #3498db;
-            }
-            QSpinBox::up-button, QSpinBox::down-button,
-            QDoubleSpinBox::up-button, QDoubleSpinBox::down-button {
-                width: 0px;
-                height: 0px;
-                border: none;
-            }
-            QSpinBox::up-arrow, QSpinBox::down-arrow,
-            QDoubleSpinBox::up-arrow, QDoubleSpinBox::down-arrow {
-                width: 0px;
-                height: 0px;
-            }
-        """
+        """Recalculate every row and redraw the whole table"""
+        for item in self.sale_items:
+            item.total_price = item.quantity * item.price
+            item.total_cost = item.cost * item.quantity
+            item.profit = (item.price - item.cost) * item.quantity
         
-        for row, item in enumerate(self.sale_items):
-            # Column 0: Serial Number (S.No.)
-            sno_item = QTableWidgetItem(str(row + 1))
-            sno_item.setFlags(sno_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            sno_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.sales_table.setItem(row, 0, sno_item)
-            
-            # Column 1: Item ID
-            item_id_item = QTableWidgetItem(item['item_id'])
-            item_id_item.setFlags(item_id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            item_id_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-            self.sales_table.setItem(row, 1, item_id_item)
-            
-            # Column 2: Item Name
-            name_item = QTableWidgetItem(item['display_name'])
-            name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            name_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-            self.sales_table.setItem(row, 2, name_item)
-            
-            # Column 3: Stock
-            stock_item = QTableWidgetItem(str(item['available_stock']))
-            stock_item.setFlags(stock_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            stock_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.sales_table.setItem(row, 3, stock_item)
-            
-            # Column 4: Quantity
-            quantity_spin = QSpinBox()
-            quantity_spin.setRange(1, 10000)
-            quantity_spin.setValue(item['quantity'])
-            quantity_spin.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-            quantity_spin.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            quantity_spin.setStyleSheet(spinbox_style)
-            
-            # Connect Enter key using lambda with default argument
-            quantity_spin.lineEdit().returnPressed.connect(
-                lambda checked=False, r=row: self.handle_quantity_enter(r)
-            )
-            
-            # Connect value change using lambda with default argument
-            quantity_spin.valueChanged.connect(
-                lambda value, r=row: self.update_item_quantity(r, value)
-            )
-            
-            self.sales_table.setCellWidget(row, 4, quantity_spin)
-            
-            # Column 5: Price
-            price_spin = QDoubleSpinBox()
-            price_spin.setRange(0.01, 100000.00)
-            price_spin.setDecimals(2)
-            price_spin.setValue(item['price'])
-            price_spin.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-            price_spin.setAlignment(Qt.AlignmentFlag.AlignRight)
-            price_spin.setStyleSheet(spinbox_style)
-            
-            # Connect Enter key using lambda with default argument
-            price_spin.lineEdit().returnPressed.connect(
-                lambda checked=False, r=row: self.handle_price_enter(r)
-            )
-            
-            # Connect value change using lambda with default argument
-            price_spin.valueChanged.connect(
-                lambda value, r=row: self.update_item_price(r, value)
-            )
-            
-            self.sales_table.setCellWidget(row, 5, price_spin)
-            
-            # Column 6: Cost
-            cost_item = QTableWidgetItem(f"{item['cost']:.2f}")
-            cost_item.setFlags(cost_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            cost_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.sales_table.setItem(row, 6, cost_item)
-            
-            # Column 7: Total
-            item_total = item['quantity'] * item['price']
-            item['total_price'] = item_total
-            item['total_cost'] = item['cost'] * item['quantity']
-            item['profit'] = (item['price'] - item['cost']) * item['quantity']
-            
-            total_item = QTableWidgetItem(f"{item_total:.2f}")
-            total_item.setFlags(total_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            total_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.sales_table.setItem(row, 7, total_item)
-            
-            total += item_total
+        self.sales_model.refresh()
         
         # Clear selection after updating table
         self.sales_table.clearSelection()
@@ -1896,100 +2594,109 @@ class EnhancedSalesWindow(QMainWindow):
         # Update summary
         self.calculate_totals()
         self.update_items_count()
+    
+    def append_sale_item(self, item):
+        """Add item to sale_items and insert only its row into the table"""
+        row = self.sales_model.append_item(item)
+        
+        self.sales_table.clearSelection()
+        self.calculate_totals()
+        self.update_items_count()
+        return row
+    
+    def edit_cell(self, row, column):
+        """Make the given sales table cell current and open its editor"""
+        if row >= self.sales_model.rowCount():
+            return
+        index = self.sales_model.index(row, column)
+        self.sales_table.setCurrentIndex(index)
+        self.sales_table.setFocus()
+        self.sales_table.edit(index)
+        editor = self.sales_table.indexWidget(index)
+        if editor:
+            editor.lineEdit().selectAll()
+    
+    def set_current_cell(self, row, column):
+        """Make the given sales table cell current"""
+        self.sales_table.setCurrentIndex(self.sales_model.index(row, column))
 
-    def handle_quantity_enter(self, row):
-        """Handle Enter key in quantity spinbox"""
-        spin = self.sales_table.cellWidget(row, 4)
-        if spin:
-            self.update_item_quantity(row, spin.value())
+    @pyqtSlot(int, int)
+    def handle_cell_enter(self, row, column):
+        """Handle Enter key in a quantity or price editor"""
+        if column == SaleItemsModel.QTY_COLUMN:
             self.focus_on_price_cell(row)
-
-    def handle_price_enter(self, row):
-        """Handle Enter key in price spinbox"""
-        spin = self.sales_table.cellWidget(row, 5)
-        if spin:
-            self.update_item_price(row, spin.value())
+        else:
             self.item_id_input.setFocus()
 
-    def focus_on_price_cell(self, row):
-        """Focus on price spinbox for given row"""
-        if row < self.sales_table.rowCount():
-            price_widget = self.sales_table.cellWidget(row, 5)
-            if price_widget:
-                price_widget.lineEdit().setFocus()
-                price_widget.lineEdit().selectAll()
-
+    @pyqtSlot(int, int)
     def update_item_quantity(self, row, quantity):
         """Update quantity with validation"""
         if row < len(self.sale_items):
+            item = self.sale_items[row]
             # Stock validation
-            if quantity > self.sale_items[row]['available_stock']:
+            if quantity > item.available_stock:
                 QMessageBox.warning(self, "Stock Error", 
-                                  f"Only {self.sale_items[row]['available_stock']} items available!")
+                                  f"Only {item.available_stock} items available!")
                 # Reset to max available
-                quantity = self.sale_items[row]['available_stock']
+                quantity = item.available_stock
             
-            self.sale_items[row]['quantity'] = quantity
+            item.quantity = quantity
             
             # Auto-calculate total price for this item
-            price = self.sale_items[row]['price']
-            self.sale_items[row]['total_price'] = quantity * price
-            self.sale_items[row]['total_cost'] = self.sale_items[row]['cost'] * quantity
-            self.sale_items[row]['profit'] = (price - self.sale_items[row]['cost']) * quantity
+            price = item.price
+            item.total_price = quantity * price
+            item.total_cost = item.cost * quantity
+            item.profit = (price - item.cost) * quantity
             
-            # Update the total cell
-            if row < self.sales_table.rowCount():
-                total_item = QTableWidgetItem(f"{quantity * price:.2f}")
-                total_item.setFlags(total_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                total_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.sales_table.setItem(row, 7, total_item)
+            # Update the quantity and total cells only
+            self.sales_model.cell_changed(row, SaleItemsModel.QTY_COLUMN)
+            self.sales_model.total_changed(row)
             
             # Update totals
             self.calculate_totals()
 
+    @pyqtSlot(int, float)
     def update_item_price(self, row, price):
         """Update price with auto-recalculation"""
         if row < len(self.sale_items):
-            self.sale_items[row]['price'] = price
+            item = self.sale_items[row]
+            item.price = price
             
             # Auto-calculate total price for this item
-            quantity = self.sale_items[row]['quantity']
-            self.sale_items[row]['total_price'] = quantity * price
-            self.sale_items[row]['profit'] = (price - self.sale_items[row]['cost']) * quantity
+            quantity = item.quantity
+            item.total_price = quantity * price
+            item.profit = (price - item.cost) * quantity
             
-            # Update the total cell
-            if row < self.sales_table.rowCount():
-                total_item = QTableWidgetItem(f"{quantity * price:.2f}")
-                total_item.setFlags(total_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                total_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                self.sales_table.setItem(row, 7, total_item)
+            # Update the price and total cells only
+            self.sales_model.cell_changed(row, SaleItemsModel.PRICE_COLUMN)
+            self.sales_model.total_changed(row)
             
             # Update totals
             self.calculate_totals()
 
+    @pyqtSlot()
     def focus_on_current_quantity(self):
         """Focus on quantity of currently selected row"""
-        current_row = self.sales_table.currentRow()
+        current_row = self.sales_table.currentIndex().row()
         if current_row >= 0:
-            quantity_widget = self.sales_table.cellWidget(current_row, 4)
-            if quantity_widget:
-                quantity_widget.lineEdit().setFocus()
-                quantity_widget.lineEdit().selectAll()
+            self.focus_on_quantity_cell(current_row)
 
+    @pyqtSlot()
     def focus_on_current_price(self):
         """Focus on price of currently selected row"""
-        current_row = self.sales_table.currentRow()
+        current_row = self.sales_table.currentIndex().row()
         if current_row >= 0:
-            price_widget = self.sales_table.cellWidget(current_row, 5)
-            if price_widget:
-                price_widget.lineEdit().setFocus()
-                price_widget.lineEdit().selectAll()
+            self.focus_on_price_cell(current_row)
     
+    @pyqtSlot()
     def update_datetime(self):
         """Update datetime label"""
-        # Simply update the datetime label with current time
-        current_datetime = datetime.now().strftime("%d/%m/%Y %I:%M:%S %p")
-        self.datetime_label.setText(current_datetime)
+        now = datetime.now()
+        # The date part only changes at midnight, so format it once per day
+        if now.date() != self.datetime_date:
+            self.datetime_date = now.date()
+            self.datetime_date_text = now.strftime("%d/%m/%Y ")
+        self.datetime_label.setText(self.datetime_date_text + now.strftime("%I:%M:%S %p"))
     
     def start_timer(self):
         """Start timer for datetime updates"""
@@ -1997,6 +2704,19 @@ class EnhancedSalesWindow(QMainWindow):
         self.timer.timeout.connect(self.update_datetime)  # Connect to self.update_datetime
         self.timer.start(1000)
     
+    def showEvent(self, event):
+        """Resume the clock, catching up on the time spent hidden"""
+        super().showEvent(event)
+        if not self.timer.isActive():
+            self.update_datetime()
+            self.timer.start(1000)
+    
+    def hideEvent(self, event):
+        """Stop the clock while the window is hidden or minimized"""
+        super().hideEvent(event)
+        self.timer.stop()
+    
+    @pyqtSlot()
     def show_item_search(self):
         if not self.db_manager.connections:
             QMessageBox.warning(self, "Database Error", "No databases connected")
@@ -2012,6 +2732,7 @@ class EnhancedSalesWindow(QMainWindow):
             self.item_id_input.setFocus()
             self.item_id_input.selectAll()
     
+    @pyqtSlot(str)
     def on_item_selected_from_search(self, item_id):
         """Handle item selection from search dialog"""
         # Set the item ID input
@@ -2027,31 +2748,28 @@ class EnhancedSalesWindow(QMainWindow):
         if item_details:
             # Check if item already exists in sale_items list
             for row, item in enumerate(self.sale_items):
-                if item['item_id'] == item_id:
+                if item.item_id == item_id:
                     # Increment quantity
-                    quantity_widget = self.sales_table.cellWidget(row, 4)
-                    if quantity_widget:
-                        current_qty = quantity_widget.value()
-                        new_qty = current_qty + 1
-                        
-                        # Check stock
-                        if new_qty > self.sale_items[row]['available_stock']:
-                            QMessageBox.warning(self, "Stock Limit", 
-                                              f"Only {self.sale_items[row]['available_stock']} items available!")
-                            quantity_widget.setValue(self.sale_items[row]['available_stock'])
-                            # Focus on this row's quantity
-                            self.sales_table.setCurrentCell(row, 4)
-                            self.focus_on_quantity_cell(row)
-                            return
-                        
-                        quantity_widget.setValue(new_qty)
-                        self.update_item_quantity(row, new_qty)
-                        
-                        # Clear selection and focus on this row
-                        self.sales_table.clearSelection()
-                        self.sales_table.setCurrentCell(row, 4)
+                    current_qty = self.sale_items[row].quantity
+                    new_qty = current_qty + 1
+                    
+                    # Check stock
+                    if new_qty > self.sale_items[row].available_stock:
+                        QMessageBox.warning(self, "Stock Limit", 
+                                          f"Only {self.sale_items[row].available_stock} items available!")
+                        self.update_item_quantity(row, self.sale_items[row].available_stock)
+                        # Focus on this row's quantity
+                        self.set_current_cell(row, 4)
                         self.focus_on_quantity_cell(row)
-                        
+                        return
+                    
+                    self.update_item_quantity(row, new_qty)
+                    
+                    # Clear selection and focus on this row
+                    self.sales_table.clearSelection()
+                    self.set_current_cell(row, 4)
+                    self.focus_on_quantity_cell(row)
+                    
                     self.status_label.setText(f"Incremented {item_id} quantity to {new_qty}")
                     # Clear the item ID input
                     self.item_id_input.clear()
@@ -2066,26 +2784,11 @@ class EnhancedSalesWindow(QMainWindow):
                 return
             
             # Add new item to sale_items list
-            self.sale_items.append({
-                "item_id": item_details["item_id"],
-                "display_name": item_details["display_name"],
-                "quantity": 1,
-                "price": item_details["price"],
-                "cost": item_details["cost"],
-                "total_price": item_details["price"],
-                "total_cost": item_details["cost"],
-                "profit": item_details["price"] - item_details["cost"],
-                "inventory_type": item_details["inventory_type"],
-                "database": item_details["database"],
-                "available_stock": item_details["quantity"]
-            })
-            
-            # Update table
-            self.update_sale_items_table()
+            self.append_sale_item(SaleItem.from_lookup(item_details))
             
             # Set current row to the new item and focus on quantity
             row = len(self.sale_items) - 1
-            self.sales_table.setCurrentCell(row, 4)
+            self.set_current_cell(row, 4)
             self.focus_on_quantity_cell(row)
             
             self.status_label.setText(f"Added {item_details['display_name']}")
@@ -2103,31 +2806,28 @@ class EnhancedSalesWindow(QMainWindow):
         
         # Check if item already exists in sale_items list
         for row, item in enumerate(self.sale_items):
-            if item['item_id'] == item_id:
-                # Get quantity widget and increment
-                quantity_widget = self.sales_table.cellWidget(row, 4)
-                if quantity_widget:
-                    current_qty = quantity_widget.value()
-                    new_qty = current_qty + 1
-                    
-                    # Check stock
-                    if new_qty > self.sale_items[row]['available_stock']:
-                        QMessageBox.warning(self, "Stock Limit", 
-                                          f"Only {self.sale_items[row]['available_stock']} items available!")
-                        quantity_widget.setValue(self.sale_items[row]['available_stock'])
-                        # Focus on this row's quantity
-                        self.sales_table.setCurrentCell(row, 4)
-                        self.focus_on_quantity_cell(row)
-                        return
-                    
-                    quantity_widget.setValue(new_qty)
-                    self.update_item_quantity(row, new_qty)
-                    
-                    # Clear selection and focus on this row
-                    self.sales_table.clearSelection()
-                    self.sales_table.setCurrentCell(row, 4)
+            if item.item_id == item_id:
+                # Increment quantity
+                current_qty = self.sale_items[row].quantity
+                new_qty = current_qty + 1
+                
+                # Check stock
+                if new_qty > self.sale_items[row].available_stock:
+                    QMessageBox.warning(self, "Stock Limit", 
+                                      f"Only {self.sale_items[row].available_stock} items available!")
+                    self.update_item_quantity(row, self.sale_items[row].available_stock)
+                    # Focus on this row's quantity
+                    self.set_current_cell(row, 4)
                     self.focus_on_quantity_cell(row)
-                    
+                    return
+                
+                self.update_item_quantity(row, new_qty)
+                
+                # Clear selection and focus on this row
+                self.sales_table.clearSelection()
+                self.set_current_cell(row, 4)
+                self.focus_on_quantity_cell(row)
+                
                 self.status_label.setText(f"Incremented {item_id} quantity to {new_qty}")
                 # Clear the item ID input
                 self.item_id_input.clear()
@@ -2158,28 +2858,14 @@ class EnhancedSalesWindow(QMainWindow):
     def add_item_to_table_from_popup(self, item_details, item_id):
         """Add item to table from pop-up (with proper navigation)"""
         # Add new item to sale_items list
-        self.sale_items.append({
-            "item_id": item_details["item_id"],
-            "display_name": item_details["display_name"],
-            "quantity": 1,
-            "price": item_details["price"],
-            "cost": item_details["cost"],
-            "total_price": item_details["price"],
-            "total_cost": item_details["cost"],
-            "profit": item_details["price"] - item_details["cost"],
-            "inventory_type": item_details["inventory_type"],
-            "database": item_details["database"],
-            "available_stock": item_details["quantity"]
-        })
-        
-        # Update table
-        self.update_sale_items_table()
+        self.append_sale_item(SaleItem.from_lookup(item_details))
         
         # Set current row to the new item and focus on quantity
         row = len(self.sale_items) - 1
-        self.sales_table.setCurrentCell(row, 4)
+        self.set_current_cell(row, 4)
         self.focus_on_quantity_cell(row)
 
+    @pyqtSlot()
     def add_item_by_id(self):
         item_id = self.item_id_input.text().strip().upper()
         
@@ -2189,28 +2875,25 @@ class EnhancedSalesWindow(QMainWindow):
         
         # Check if item already exists in sale_items list
         for row, item in enumerate(self.sale_items):
-            if item['item_id'] == item_id:
-                # Get quantity widget and increment
-                quantity_widget = self.sales_table.cellWidget(row, 4)
-                if quantity_widget:
-                    current_qty = quantity_widget.value()
-                    new_qty = current_qty + 1
-                    
-                    # Check stock
-                    if new_qty > self.sale_items[row]['available_stock']:
-                        QMessageBox.warning(self, "Stock Limit", 
-                                          f"Only {self.sale_items[row]['available_stock']} items available!")
-                        quantity_widget.setValue(self.sale_items[row]['available_stock'])
-                        return
-                    
-                    quantity_widget.setValue(new_qty)
-                    self.update_item_quantity(row, new_qty)
-                    
-                    # Clear selection and focus on this row
-                    self.sales_table.clearSelection()
-                    self.sales_table.setCurrentCell(row, 4)
-                    self.focus_on_quantity_cell(row)
-                    
+            if item.item_id == item_id:
+                # Increment quantity
+                current_qty = self.sale_items[row].quantity
+                new_qty = current_qty + 1
+                
+                # Check stock
+                if new_qty > self.sale_items[row].available_stock:
+                    QMessageBox.warning(self, "Stock Limit", 
+                                      f"Only {self.sale_items[row].available_stock} items available!")
+                    self.update_item_quantity(row, self.sale_items[row].available_stock)
+                    return
+                
+                self.update_item_quantity(row, new_qty)
+                
+                # Clear selection and focus on this row
+                self.sales_table.clearSelection()
+                self.set_current_cell(row, 4)
+                self.focus_on_quantity_cell(row)
+                
                 self.status_label.setText(f"Incremented {item_id} quantity to {new_qty}")
                 self.item_id_input.clear()
                 return
@@ -2238,55 +2921,33 @@ class EnhancedSalesWindow(QMainWindow):
     def add_item_to_table(self, item_details):
         """Add item to sales table"""
         # Add new item to sale_items list
-        self.sale_items.append({
-            "item_id": item_details["item_id"],
-            "display_name": item_details["display_name"],
-            "quantity": 1,
-            "price": item_details["price"],
-            "cost": item_details["cost"],
-            "total_price": item_details["price"],
-            "total_cost": item_details["cost"],
-            "profit": item_details["price"] - item_details["cost"],
-            "inventory_type": item_details["inventory_type"],
-            "database": item_details["database"],
-            "available_stock": item_details["quantity"]
-        })
-        
-        # Update table
-        self.update_sale_items_table()
+        self.append_sale_item(SaleItem.from_lookup(item_details))
         
         # Clear any existing selection
         self.sales_table.clearSelection()
         
         # Set current row to the new item and select it
         row = len(self.sale_items) - 1
-        self.sales_table.setCurrentCell(row, 4)  # Focus on quantity column
+        self.set_current_cell(row, 4)  # Focus on quantity column
         
         # Focus on the quantity cell for the new item
         self.focus_on_quantity_cell(row)
 
     def focus_on_quantity_cell(self, row):
-        """Focus on quantity spinbox for given row"""
-        if row < self.sales_table.rowCount():
-            quantity_widget = self.sales_table.cellWidget(row, 4)
-            if quantity_widget:
-                quantity_widget.lineEdit().setFocus()
-                quantity_widget.lineEdit().selectAll()
+        """Open the quantity editor for given row"""
+        self.edit_cell(row, SaleItemsModel.QTY_COLUMN)
 
     def focus_on_price_cell(self, row):
-        """Focus on price spinbox for given row"""
-        if row < self.sales_table.rowCount():
-            price_widget = self.sales_table.cellWidget(row, 5)
-            if price_widget:
-                price_widget.lineEdit().setFocus()
-                price_widget.lineEdit().selectAll()
+        """Open the price editor for given row"""
+        self.edit_cell(row, SaleItemsModel.PRICE_COLUMN)
     
+    @pyqtSlot()
     def remove_selected_item(self):
-        current_row = self.sales_table.currentRow()
+        current_row = self.sales_table.currentIndex().row()
         if current_row >= 0 and current_row < len(self.sale_items):
-            item_name = self.sale_items[current_row]['display_name']
-            self.sale_items.pop(current_row)
-            self.update_sale_items_table()
+            item_name = self.sales_model.remove_item(current_row).display_name
+            self.calculate_totals()
+            self.update_items_count()
             self.status_label.setText(f"Removed: {item_name}")
             self.item_id_input.setFocus()
 
@@ -2311,12 +2972,17 @@ class EnhancedSalesWindow(QMainWindow):
         
         return False
 
+    @pyqtSlot()
+    @_exclusive_invoice_action
     def save_sale(self):
         """Save sale with verification"""
         if not self.sale_items:
             QMessageBox.warning(self, "No Items", "No items to save!")
             return
         
+        # The confirmation shows the grand total label
+        self.flush_totals()
+        
         # Ask for confirmation
         reply = QMessageBox.question(
             self, 
@@ -2330,8 +2996,8 @@ class EnhancedSalesWindow(QMainWindow):
             return
         
         # Calculate totals
-        subtotal = sum(item['total_price'] for item in self.sale_items)
-        total_cost = sum(item['total_cost'] for item in self.sale_items)
+        subtotal = sum(item.total_price for item in self.sale_items)
+        total_cost = sum(item.total_cost for item in self.sale_items)
         
         # Calculate discount
         if self.discount_type.currentText() == "Amount":
@@ -2409,14 +3075,20 @@ class EnhancedSalesWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Error saving sale: {str(e)}")
     
+    @pyqtSlot()
+    @_exclusive_invoice_action
     def print_invoice(self):
         """Print professional invoice using EnhancedIntegratedPrintingSystem"""
         return EnhancedIntegratedPrintingSystem.print_invoice(self)
 
+    @pyqtSlot()
+    @_exclusive_invoice_action
     def preview_invoice(self):
         """Preview invoice using EnhancedIntegratedPrintingSystem"""
         return EnhancedIntegratedPrintingSystem.preview_invoice(self)
     
+    @pyqtSlot()
+    @_exclusive_invoice_action
     def save_pdf_invoice(self):
         """Save invoice as PDF using EnhancedIntegratedPrintingSystem"""
         if not self.sale_items:
@@ -2439,7 +3111,7 @@ class EnhancedSalesWindow(QMainWindow):
                 # You might need to import and use it properly
                 try:
                     if PRINT_MODULE_AVAILABLE:
-                        generator = invoice_printer.InvoiceGenerator()
+                        generator = EnhancedIntegratedPrintingSystem.generator()
                         pdf_path = generator.generate_invoice_pdf(bill_data, file_path)
                         if pdf_path:
                             QMessageBox.information(self, "PDF Saved", 
@@ -2447,6 +3119,7 @@ class EnhancedSalesWindow(QMainWindow):
                 except Exception as e:
                     QMessageBox.critical(self, "PDF Error", f"Could not save PDF: {str(e)}")
     
+    @pyqtSlot()
     def clear_sale(self):
         if not self.sale_items:
             return
@@ -2455,8 +3128,9 @@ class EnhancedSalesWindow(QMainWindow):
                                    "Clear all items from sale?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.sales_table.setRowCount(0)
-            self.sale_items.clear()
+            self.sales_model.clear()
+            # Each bill starts with fresh lookups (stock may be edited elsewhere)
+            self.db_manager.clear_item_cache()
             self.discount_input.setValue(0)
             self.tax_spinbox.setValue(0)
             self.customer_input.setText("WALK-IN CUSTOMER")
@@ -2466,11 +3140,25 @@ class EnhancedSalesWindow(QMainWindow):
             self.item_id_input.setFocus()
             self.load_settings()
     
+    @pyqtSlot()
     def clear_inputs(self):
         self.item_id_input.clear()
         self.item_id_input.setFocus()
     
+    @pyqtSlot()
     def calculate_totals(self):
+        """Schedule a refresh of the summary labels"""
+        self._totals_timer.start()
+    
+    def flush_totals(self):
+        """Apply a refresh still waiting on the timer"""
+        if self._totals_timer.isActive():
+            self._totals_timer.stop()
+            self.refresh_totals()
+    
+    @pyqtSlot()
+    def refresh_totals(self):
+        """Recalculate the sale totals and update the summary labels"""
         if not self.sale_items:
             self.subtotal_label.setText("Rs 0.00")
             self.grand_total_label.setText("Rs 0.00")
@@ -2479,8 +3167,8 @@ class EnhancedSalesWindow(QMainWindow):
             self.profit_percent_label.setText("0.0%")
             return
             
-        subtotal = sum(item['total_price'] for item in self.sale_items)
-        total_cost = sum(item['total_cost'] for item in self.sale_items)
+        subtotal = sum(item.total_price for item in self.sale_items)
+        total_cost = sum(item.total_cost for item in self.sale_items)
         
         discount = 0
         if self.discount_type.currentText() == "Amount":
@@ -2509,13 +3197,16 @@ class EnhancedSalesWindow(QMainWindow):
         self.profit_label.setText(f"Rs{profit:,.2f}")
         self.profit_percent_label.setText(f"{profit_percent:.1f}%")
         
-        if profit >= 0:
-            self.profit_label.setStyleSheet("font-weight: bold; color: #27ae60; font-size: 12px;")
-            self.profit_percent_label.setStyleSheet("font-weight: bold; color: #27ae60;")
-        else:
-            self.profit_label.setStyleSheet("font-weight: bold; color: #e74c3c; font-size: 12px;")
-            self.profit_percent_label.setStyleSheet("font-weight: bold; color: #e74c3c;")
+        # Restyle only when the sign flips; setStyleSheet re-parses and
+        # re-polishes the label even for an identical string
+        profit_positive = profit >= 0
+        if profit_positive != self.profit_positive:
+            self.profit_positive = profit_positive
+            label_style, percent_style = self.PROFIT_STYLES[profit_positive]
+            self.profit_label.setStyleSheet(label_style)
+            self.profit_percent_label.setStyleSheet(percent_style)
     
+    @pyqtSlot(str)
     def on_discount_type_changed(self, discount_type):
         if discount_type == "Percentage":
             self.discount_input.setMaximum(100)
@@ -2525,6 +3216,7 @@ class EnhancedSalesWindow(QMainWindow):
             self.discount_input.setSuffix("")
         self.calculate_totals()
     
+    @pyqtSlot(bool)
     def toggle_profit_section(self, checked):
         self.profit_visible = checked
         for i in range(self.profit_summary.layout().count()):
@@ -2533,11 +3225,13 @@ class EnhancedSalesWindow(QMainWindow):
                 widget.setText("Show Profit" if not checked else "Hide Profit")
                 break
     
+    @pyqtSlot()
     def toggle_profit_section_btn(self):
         self.profit_visible = not self.profit_visible
         self.profit_summary.setChecked(self.profit_visible)
         self.status_label.setText(f"Profit section {'shown' if self.profit_visible else 'hidden'}")
     
+    @pyqtSlot()
     def toggle_cost_profit(self):
         """Toggle cost column and profit summary - Ctrl+H shortcut"""
         self.cost_visible = not self.cost_visible
@@ -2576,7 +3270,7 @@ class EnhancedSalesWindow(QMainWindow):
                 self.print_invoice()  # Changed from print_professional_invoice
             elif event.key() == Qt.Key.Key_Escape:
                 # ESC clears table selection first, then clears input
-                if self.sales_table.selectedItems():
+                if self.sales_table.selectionModel().hasSelection():
                     self.sales_table.clearSelection()
                 else:
                     self.clear_inputs()
@@ -2585,7 +3279,7 @@ class EnhancedSalesWindow(QMainWindow):
                 if self.item_id_input.hasFocus():
                     # Move to first quantity cell if there are items
                     if self.sale_items:
-                        self.sales_table.setCurrentCell(0, 4)
+                        self.set_current_cell(0, 4)
                         self.focus_on_quantity_cell(0)
                     else:
                         super().keyPressEvent(event)
@@ -2626,15 +3320,8 @@ class EnhancedSalesWindow(QMainWindow):
             if row == -1:
                 self.sales_table.clearSelection()
             else:
-                # Get the current selection
-                current_selection = self.sales_table.selectedItems()
-                
                 # Check if this row is already selected
-                is_row_selected = False
-                for item in current_selection:
-                    if item.row() == row:
-                        is_row_selected = True
-                        break
+                is_row_selected = self.sales_table.selectionModel().isRowSelected(row, QModelIndex())
                 
                 # If row is already selected, clear selection
                 if is_row_selected:
@@ -2650,6 +3337,7 @@ class EnhancedSalesWindow(QMainWindow):
         
         super().mousePressEvent(event)
     
+    @pyqtSlot()
     def new_bill(self):
         if self.sale_items:
             reply = QMessageBox.question(self, "New Bill", 
@@ -2792,6 +3480,7 @@ class EnhancedSalesWidget(QWidget):
         event.accept()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     app = QApplication(sys.argv)
     
     window = EnhancedSalesWindow()
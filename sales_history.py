@@ -409,63 +409,7 @@ class SalesHistoryWindow(QWidget):
             sales = cursor.fetchall()
             
             # Update table
-            self.sales_table.setRowCount(len(sales))
-            
-            for row, sale in enumerate(sales):
-                # Format date for display
-                sale_date = sale['sale_date']
-                if len(sale_date) == 10:  # YYYY-MM-DD format
-                    try:
-                        date_obj = datetime.strptime(sale_date, "%Y-%m-%d")
-                        display_date = date_obj.strftime("%d/%m/%Y")
-                    except:
-                        display_date = sale_date
-                else:
-                    display_date = sale_date
-                
-                # Bill number
-                bill_item = QTableWidgetItem(sale['bill_number'])
-                bill_item.setData(Qt.ItemDataRole.UserRole, sale['id'])
-                self.sales_table.setItem(row, 0, bill_item)
-                
-                # Date
-                date_item = QTableWidgetItem(display_date)
-                self.sales_table.setItem(row, 1, date_item)
-                
-                # Time
-                time_item = QTableWidgetItem(sale['sale_time'])
-                self.sales_table.setItem(row, 2, time_item)
-                
-                # Customer
-                customer_item = QTableWidgetItem(sale['customer'])
-                self.sales_table.setItem(row, 3, customer_item)
-                
-                # Items count
-                items_item = QTableWidgetItem(str(sale['total_items']))
-                items_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.sales_table.setItem(row, 4, items_item)
-                
-                # Subtotal - Format without extra decimals
-                subtotal_str = self.format_currency(sale['subtotal'])
-                subtotal_item = QTableWidgetItem(subtotal_str)
-                subtotal_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                self.sales_table.setItem(row, 5, subtotal_item)
-                
-                # Discount - Format without extra decimals
-                discount_str = self.format_currency(sale['discount'])
-                discount_item = QTableWidgetItem(discount_str)
-                discount_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                self.sales_table.setItem(row, 6, discount_item)
-                
-                # Total - Format without extra decimals
-                total_str = self.format_currency(sale['grand_total'])
-                total_item = QTableWidgetItem(total_str)
-                total_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                total_item.setForeground(QColor("#e74c3c"))  # Red color for total
-                font = total_item.font()
-                font.setBold(True)
-                total_item.setFont(font)
-                self.sales_table.setItem(row, 7, total_item)
+            self.populate_sales_table(sales)
             
             self.status_label.setText(f"Loaded {len(sales)} sales records")
             
@@ -474,6 +418,75 @@ class SalesHistoryWindow(QWidget):
             QMessageBox.critical(self, "Database Error", 
                                f"Could not load sales: {str(e)}")
     
+    def populate_sales_table(self, sales):
+        """Show sales in the table, reusing the cell items already there
+        
+        Filtering runs on every keystroke, so rows the table already has just
+        get new text; only added rows get new (formatted) items, and
+        setRowCount drops the rows past the end.
+        """
+        # Fill with updates off so the view repaints once at the end
+        # instead of once per changed cell
+        self.sales_table.setUpdatesEnabled(False)
+        try:
+            self.fill_sales_rows(sales)
+        finally:
+            self.sales_table.setUpdatesEnabled(True)
+    
+    def fill_sales_rows(self, sales):
+        """Write sales into the table rows (see populate_sales_table)"""
+        table = self.sales_table
+        table.setRowCount(len(sales))
+        
+        for row, sale in enumerate(sales):
+            # Format date for display
+            sale_date = sale['sale_date']
+            if len(sale_date) == 10:  # YYYY-MM-DD format
+                try:
+                    date_obj = datetime.strptime(sale_date, "%Y-%m-%d")
+                    display_date = date_obj.strftime("%d/%m/%Y")
+                except:
+                    display_date = sale_date
+            else:
+                display_date = sale_date
+            
+            values = (
+                sale['bill_number'],
+                display_date,
+                sale['sale_time'],
+                sale['customer'],
+                str(sale['total_items']),
+                self.format_currency(sale['subtotal']),
+                self.format_currency(sale['discount']),
+                self.format_currency(sale['grand_total'])
+            )
+            for col, value in enumerate(values):
+                item = table.item(row, col)
+                if item is None:
+                    item = self.new_sales_table_item(col)
+                    table.setItem(row, col, item)
+                item.setText(value)
+            
+            # Sale id behind the bill number
+            table.item(row, 0).setData(Qt.ItemDataRole.UserRole, sale['id'])
+    
+    def new_sales_table_item(self, col):
+        """Empty sales table cell item with its column's formatting"""
+        item = QTableWidgetItem()
+        if col == 4:
+            # Items count
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        elif col in (5, 6, 7):
+            # Right align amounts
+            item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+        if col == 7:
+            # Red, bold total
+            item.setForeground(QColor("#e74c3c"))
+            font = item.font()
+            font.setBold(True)
+            item.setFont(font)
+        return item
+    
     def format_currency(self, value):
         """Format currency value without extra decimals"""
         if value is None:
@@ -587,51 +600,7 @@ class SalesHistoryWindow(QWidget):
             sales = cursor.fetchall()
             
             # Update table
-            self.sales_table.setRowCount(len(sales))
-            
-            for row, sale in enumerate(sales):
-                # Format date
-                sale_date = sale['sale_date']
-                if len(sale_date) == 10:
-                    try:
-                        date_obj = datetime.strptime(sale_date, "%Y-%m-%d")
-                        display_date = date_obj.strftime("%d/%m/%Y")
-                    except:
-                        display_date = sale_date
-                else:
-                    display_date = sale_date
-                
-                # Populate table with formatted currency
-                items = [
-                    sale['bill_number'],
-                    display_date,
-                    sale['sale_time'],
-                    sale['customer'],
-                    str(sale['total_items']),
-                    self.format_currency(sale['subtotal']),
-                    self.format_currency(sale['discount']),
-                    self.format_currency(sale['grand_total'])
-                ]
-                
-                for col, value in enumerate(items):
-                    item = QTableWidgetItem(value)
-                    
-                    # Set ID in first column
-                    if col == 0:
-                        item.setData(Qt.ItemDataRole.UserRole, sale['id'])
-                    
-                    # Right align numeric columns
-                    if col in [5, 6, 7]:
-                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-                    
-                    # Bold and color for total column
-                    if col == 7:
-                        item.setForeground(QColor("#e74c3c"))
-                        font = item.font()
-                        font.setBold(True)
-                        item.setFont(font)
-                    
-                    self.sales_table.setItem(row, col, item)
+            self.populate_sales_table(sales)
             
             # Update status with search info
             search_filters = []
@@ -825,10 +794,8 @@ class SalesHistoryWindow(QWidget):
                 QMessageBox.warning(self, "Print Error", "Could not prepare bill data for printing.")
                 return
             
-            # Create invoice generator using invoice_printer
-            from invoice_printer import InvoiceGenerator
-            
-            generator = InvoiceGenerator()
+            # Shared invoice generator (keeps its configured printer)
+            generator = EnhancedIntegratedPrintingSystem.generator()
             
             # Print the invoice
             success = generator.print_invoice(bill_data, self)
@@ -919,7 +886,7 @@ class SalesHistoryWindow(QWidget):
             # Import and use InvoicePreviewDialog
             from invoice_printer import InvoicePreviewDialog
             
-            dialog = InvoicePreviewDialog(bill_data, self)
+            dialog = InvoicePreviewDialog(bill_data, self, EnhancedIntegratedPrintingSystem.generator())
             dialog.exec()
             
         except Exception as e: